@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+'''
+pytest test suite for the rates history store (rates_history.bin) in utilities module.
+The snapshots are hardcoded for testing purposes.
+'''
+
+import os
+import struct
+from datetime import date, datetime, timezone
+
+import pytest
+from utilities import (
+    RatesHistory,
+    append_rates_snapshot,
+    exchange_rates,
+    exchange_rates_at,
+)
+
+DAY = 86400
+FIRST = 1763769752  # Sat, 22 Nov 2025 00:02:32 UTC
+
+
+def snapshot(days, **rates):
+    return {"time_last_update_unix": FIRST + days * DAY, "rates": {"USD": 1, **rates}}
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / "rates_history.bin")
+    for days, ils in enumerate([3.2, 3.3, 3.4]):
+        assert append_rates_snapshot(snapshot(days, ILS=ils, EUR=0.9), path)
+    return path
+
+
+def test_append(path):
+    # not newer than the last row: skipped
+    assert not append_rates_snapshot(snapshot(2, ILS=9.9, EUR=9.9), path)
+    assert not append_rates_snapshot(snapshot(0, ILS=9.9, EUR=9.9), path)
+
+    with RatesHistory(path) as history:
+        assert len(history) == 3
+        assert history.codes == ["EUR", "ILS", "USD"]
+        assert history.times() == [FIRST, FIRST + DAY, FIRST + 2 * DAY]
+        assert history.series("ILS") == [(FIRST, 3.2), (FIRST + DAY, 3.3), (FIRST + 2 * DAY, 3.4)]
+        assert history.rates_at(FIRST) == {"EUR": 0.9, "ILS": 3.2, "USD": 1.0}
+        assert list(history.rows())[-1] == (FIRST + 2 * DAY, {"EUR": 0.9, "ILS": 3.4, "USD": 1.0})
+
+
+def test_views_outlive_close(path):
+    with RatesHistory(path) as history:
+        times = history.times()
+        series = history.series("EUR")
+    assert times[0] == FIRST and series[0] == (FIRST, 0.9)
+
+
+def test_new_currency_widens_rows(path):
+    size = os.path.getsize(path)
+    assert append_rates_snapshot(snapshot(3, ILS=3.5, GBP=0.8), path)
+    assert os.path.getsize(path) > size + 8 * 4  # header slot + wider rows
+
+    with RatesHistory(path) as history:
+        assert history.codes == ["EUR", "ILS", "USD", "GBP"]
+        assert len(history) == 4
+        assert history.rates_at(FIRST) == {"EUR": 0.9, "ILS": 3.2, "USD": 1.0}  # no GBP rate yet
+        assert history.rates_at(FIRST + 3 * DAY) == {"ILS": 3.5, "USD": 1.0, "GBP": 0.8}  # no EUR in that snapshot
+
+
+@pytest.mark.parametrize("when, ils", [
+    (FIRST + DAY, 3.3),                                                 # exact hit
+    (FIRST + DAY + 3600, 3.3),                                          # between rows
+    (FIRST + DAY - 1, 3.2),
+    (FIRST + 100 * DAY, 3.4),                                           # after the last row: the last one
+    ("2025-11-23", 3.3),                                                # a whole day: that day's snapshot
+    (date(2025, 11, 24), 3.4),
+    (datetime(2025, 11, 23, 12, 0, tzinfo=timezone.utc), 3.3),
+    (datetime(2025, 11, 23, 0, 0), 3.2),                                # naive: UTC
+])
+def test_rates_at(path, when, ils):
+    with RatesHistory(path) as history:
+        assert history.rates_at(when)["ILS"] == ils
+        assert history.index_at(when) == [3.2, 3.3, 3.4].index(ils)
+
+
+@pytest.mark.parametrize("when", [FIRST - 1, FIRST - 10 * DAY, "2025-11-21", date(2025, 1, 1)])
+def test_before_the_history(path, when):
+    # no rates known yet for that day: not the first snapshot's rates
+    with RatesHistory(path) as history:
+        with pytest.raises(LookupError, match="No rates before 2025-11-22"):
+            history.rates_at(when)
+    with pytest.raises(LookupError):
+        exchange_rates_at(when, 100, "EUR", "ILS", path)
+
+
+def test_torn_last_row(path):
+    with open(path, "ab") as f:
+        f.write(struct.pack("<2d", FIRST + 3 * DAY, 1.0))  # an interrupted append
+    with RatesHistory(path) as history:
+        assert len(history) == 3
+        assert history.rates_at(FIRST + 10 * DAY)["ILS"] == 3.4
+
+    # the next append drops the torn row and stays aligned
+    assert append_rates_snapshot(snapshot(3, ILS=3.6, EUR=0.9), path)
+    with RatesHistory(path) as history:
+        assert history.series("ILS")[-2:] == [(FIRST + 2 * DAY, 3.4), (FIRST + 3 * DAY, 3.6)]
+
+
+def test_empty_or_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        RatesHistory(str(tmp_path / "missing.bin"))
+
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    with RatesHistory(str(empty)) as history:
+        assert len(history) == 0 and history.times() == []
+        with pytest.raises(LookupError):
+            history.rates_at("2025-11-22")
+
+    # an empty file becomes a history on the first append
+    assert append_rates_snapshot(snapshot(0, ILS=3.2), str(empty))
+    with RatesHistory(str(empty)) as history:
+        assert history.rates_at("2025-11-22") == {"ILS": 3.2, "USD": 1.0}
+
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"not a history file")
+    with pytest.raises(ValueError):
+        RatesHistory(str(other))
+
+
+@pytest.mark.parametrize("when, index", [("2025-11-22", 0), ("2025-11-23", 1), ("2030-01-01", 2)])
+def test_exchange_rates_at(path, when, index):
+    rates = snapshot(index, ILS=[3.2, 3.3, 3.4][index], EUR=0.9)["rates"]
+    assert exchange_rates_at(when, 100, "EUR", "ILS", path) == pytest.approx(exchange_rates(rates, 100, "EUR", "ILS"))
+    with pytest.raises(ValueError):
+        exchange_rates_at(when, 100, "EUR", "XXX", path)
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
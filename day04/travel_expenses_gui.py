@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 import tkinter as tk
 from tkinter import ttk, messagebox
-from utilities import exchange_rates, get_currency_rates
+from datetime import date
+from utilities import RATES_HISTORY_FILE, exchange_rates, exchange_rates_at, get_currency_rates
 
 DEFAULT_CURRENCY = 'ILS'
 
@@ -9,7 +10,7 @@ class ExpenseGUI(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Expense Converter")
-        self.geometry("680x460")
+        self.geometry("760x460")
         self.resizable(False, False)
 
         self.rates = {}
@@ -47,12 +48,15 @@ class ExpenseGUI(tk.Tk):
         self.currency_combo.grid(row=0, column=5)
 
         ttk.Button(frm, text="+", width=8, command=self.add_expense).grid(row=0, column=6, padx=(16, 0))
-        self.msg_var = tk.StringVar(value="")
-        self.msg_label = ttk.Label(frm, textvariable=self.msg_var, foreground="#cc0000").grid(row=1, column=0, columnspan=5, sticky="w")
+
+        ttk.Label(frm, text="Date").grid(row=1, column=4, padx=(0, 8))
+        self.date_var = tk.StringVar()  # optional YYYY-MM-DD: convert at the rates of that day
+        self.date_entry = ttk.Entry(frm, textvariable=self.date_var, width=12)
+        self.date_entry.grid(row=1, column=5)
 
         ttk.Button(frm, text="del", width=8, command=self.remove_selected).grid(row=1, column=6, padx=(16, 0))
         self.msg_var = tk.StringVar(value="")
-        self.msg_label = ttk.Label(frm, textvariable=self.msg_var, foreground="#cc0000").grid(row=1, column=0, columnspan=5, sticky="w")
+        self.msg_label = ttk.Label(frm, textvariable=self.msg_var, foreground="#cc0000").grid(row=1, column=0, columnspan=4, sticky="w")
 
     def _build_table(self):
         frm = ttk.Frame(self, padding=(12, 12, 12, 12))
@@ -60,14 +64,16 @@ class ExpenseGUI(tk.Tk):
         self.grid_rowconfigure(2, weight=1)
         self.grid_columnconfigure(0, weight=1)
 
-        columns = ("title", "amount", "currency", "converted")
+        columns = ("title", "date", "amount", "currency", "converted")
         self.tree = ttk.Treeview(frm, columns=columns, show="headings", height=12)
         self.tree.heading("title", text="Title")
+        self.tree.heading("date", text="Date")
         self.tree.heading("amount", text="Amount")
         self.tree.heading("currency", text="Currency")
         self.tree.heading("converted", text=f"In {self.your_currency}")
 
-        self.tree.column("title", width=240, anchor="w")
+        self.tree.column("title", width=220, anchor="w")
+        self.tree.column("date", width=100, anchor="center")
         self.tree.column("amount", width=100, anchor="e")
         self.tree.column("currency", width=100, anchor="center")
         self.tree.column("converted", width=140, anchor="e")
@@ -137,6 +143,7 @@ class ExpenseGUI(tk.Tk):
         amount_str = self.amount_var.get().strip()
         currency = self.currency_var.get().strip()
         target_currency = self.your_currency.get().strip()
+        day = self.date_var.get().strip()
 
         if not title:
             self.msg_var.set("Title is required.")
@@ -151,10 +158,21 @@ class ExpenseGUI(tk.Tk):
             self.currency_combo.focus_set()
             return
 
+        if day:
+            try:
+                date.fromisoformat(day)
+            except ValueError:
+                self.msg_var.set("Date must be YYYY-MM-DD.")
+                self.date_entry.focus_set()
+                return
+
         try:
-            converted = exchange_rates(self.rates, amount_str, currency, target_currency)
-        except ValueError as ve:
-            self.msg_var.set(str(ve))
+            converted = self._convert(amount_str, currency, target_currency, day)
+        except FileNotFoundError:
+            self.msg_var.set(f"No rates history yet ({RATES_HISTORY_FILE}): refresh the rates first.")
+            return
+        except (ValueError, LookupError) as e:
+            self.msg_var.set(str(e))
             return
         except Exception as e:
             self.msg_var.set("Conversion failed.")
@@ -164,15 +182,22 @@ class ExpenseGUI(tk.Tk):
         amount = float(amount_str)
         self.expenses.append({
             "title": title,
+            "date": day,
             "amount": amount,
             "currency": currency,
             "converted": converted
         })
 
-        self.tree.insert("", "end", values=(title, f"{amount:.2f}", currency, f"{converted:.2f}"))
+        self.tree.insert("", "end", values=(title, day, f"{amount:.2f}", currency, f"{converted:.2f}"))
         self.msg_var.set("Added.")
         self._clear_inputs()
 
+    def _convert(self, amount, currency, target, day):
+        # dated expenses: at the rates of their own day (rates history), the others at the current rates
+        if day:
+            return exchange_rates_at(day, amount, currency, target)
+        return exchange_rates(self.rates, amount, currency, target)
+
     def _clear_inputs(self):
         self.title_var.set("")
         self.amount_var.set("")
@@ -188,16 +213,20 @@ class ExpenseGUI(tk.Tk):
             return
         target = self.your_currency.get()
         children = list(self.tree.get_children())
+        failed = []
         for i, exp in enumerate(self.expenses):
             try:
-                converted = exchange_rates(self.rates, exp["amount"], exp["currency"], target)
-            except Exception:
+                converted = self._convert(exp["amount"], exp["currency"], target, exp["date"])
+            except Exception as e:
                 converted = 0.0
+                failed.append(f"{exp['title']}: {e}")
             exp["converted"] = converted
             if i < len(children):
                 self.tree.item(children[i], values=(
-                    exp["title"], f"{exp['amount']:.2f}", exp["currency"], f"{converted:.2f}"
+                    exp["title"], exp["date"], f"{exp['amount']:.2f}", exp["currency"], f"{converted:.2f}"
                 ))
+        if failed:
+            self.msg_var.set("Not converted (counted as 0): " + "; ".join(failed))
         self.sum_expenses()
 
     def remove_selected(self):
@@ -208,7 +237,7 @@ class ExpenseGUI(tk.Tk):
         for item_id in sel:
             vals = self.tree.item(item_id, "values")
             for i, exp in enumerate(self.expenses):
-                if (exp["title"], f"{exp['amount']:.2f}", exp["currency"], f"{exp['converted']:.2f}") == tuple(vals):
+                if (exp["title"], exp["date"], f"{exp['amount']:.2f}", exp["currency"], f"{exp['converted']:.2f}") == tuple(vals):
                     to_remove.append(i)
                     break
             self.tree.delete(item_id)
@@ -1,6 +1,19 @@
 import os
 import json
+import math
+import mmap
+import struct
+import bisect
 import urllib.request
+from datetime import date, datetime, timezone
+
+# Append-only history of the daily rates: a fixed-width binary file, read through mmap.
+#   header: magic (8 bytes), number of currencies (uint64), then one 8-byte slot per currency code
+#   rows:   unix time of the snapshot, then one rate per currency (all float64, NaN = no rate)
+# Rows are in time order, so "rates at date X" is a binary search over the time column,
+# and a time series is a strided view of one column. No JSON is parsed.
+RATES_HISTORY_FILE = 'rates_history.bin'
+_MAGIC = b'RATES01\0'
 
 def exchange_rates(rates, amount, from_currency, to_currency):
     try:
@@ -16,11 +29,155 @@ def exchange_rates(rates, amount, from_currency, to_currency):
 def get_currency_rates(refresh = False):
     if os.path.exists('rates_cache.json') and not refresh:
         with open('rates_cache.json', 'r') as f:
-            return json.load(f)
+            data = json.load(f)
+        if not os.path.exists(RATES_HISTORY_FILE):
+            append_rates_snapshot(data)  # start the history with the cached snapshot
+        return data
     else:
         api_url = 'https://open.er-api.com/v6/latest/USD'
         data = json.loads(urllib.request.urlopen(api_url).read())
         with open('rates_cache.json', 'w') as f:
             json.dump(data, f)
+        append_rates_snapshot(data)
             
-    return data
\ No newline at end of file
+    return data
+
+def append_rates_snapshot(data, path = RATES_HISTORY_FILE):
+    '''
+    Appends one API response (time_last_update_unix + rates) as a row of the history.
+    A snapshot that is not newer than the last row is skipped. Returns True if appended.
+    '''
+    when = float(data['time_last_update_unix'])
+    rates = data['rates']
+
+    codes = []
+    if os.path.exists(path) and os.path.getsize(path):
+        with RatesHistory(path) as history:
+            if len(history) and history.times()[-1] >= when:
+                return False
+            codes = history.codes
+            end = history._end
+        if os.path.getsize(path) > end:
+            os.truncate(path, end)  # drop a torn last row, so the new row stays aligned
+        new_codes = sorted(code for code in rates if code not in codes)
+        if new_codes:
+            # new currencies: rewrite the file once with the wider row (NaN for the old rows)
+            _rewrite_history(path, codes + new_codes)
+            codes = codes + new_codes
+    else:
+        codes = sorted(rates)
+        _rewrite_history(path, codes)
+
+    row = [when] + [float(rates.get(code, math.nan)) for code in codes]
+    with open(path, 'ab') as f:
+        f.write(struct.pack(f'<{len(row)}d', *row))
+    return True
+
+def _rewrite_history(path, codes):
+    rows = []
+    if os.path.exists(path):
+        with RatesHistory(path) as history:
+            rows = [[t] + [rates.get(code, math.nan) for code in codes] for t, rates in history.rows()]
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_MAGIC + struct.pack('<Q', len(codes)))
+        f.write(b''.join(code.encode('ascii')[:8].ljust(8, b'\0') for code in codes))
+        for row in rows:
+            f.write(struct.pack(f'<{len(row)}d', *row))
+    os.replace(tmp_path, path)
+
+def _to_unix(when):
+    if isinstance(when, datetime):
+        return (when if when.tzinfo else when.replace(tzinfo=timezone.utc)).timestamp()
+    if isinstance(when, date):
+        # a whole day: the last snapshot published on or before that day
+        return datetime(when.year, when.month, when.day, 23, 59, 59, tzinfo=timezone.utc).timestamp()
+    if isinstance(when, str):
+        return _to_unix(date.fromisoformat(when))
+    return float(when)
+
+class RatesHistory:
+    '''
+    Read-only view of the rates history file (memory-mapped):
+
+        with RatesHistory() as history:
+            history.rates_at('2025-11-22')       -> {'USD': 1.0, 'ILS': 3.27, ...}
+            history.series('ILS')                -> [(unix_time, rate), ...]
+    '''
+    def __init__(self, path = RATES_HISTORY_FILE):
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        if not size:
+            n = 0  # an empty file is an empty history
+        elif size < 16 or self._mm[:8] != _MAGIC:
+            self.close()
+            raise ValueError(f'{path} is not a rates history file.')
+        else:
+            (n,) = struct.unpack_from('<Q', self._mm, 8)
+        header_size = 16 + 8 * n
+        self.codes = [self._mm[16 + 8 * i: 24 + 8 * i].rstrip(b'\0').decode('ascii') for i in range(n)]
+        self._column = {code: i + 1 for i, code in enumerate(self.codes)}
+        self._width = n + 1
+        # whole rows only (a torn last write is ignored)
+        self._rows = max(len(self._mm) - header_size, 0) // (8 * self._width)
+        self._end = header_size + 8 * self._width * self._rows
+        self._values = memoryview(self._mm)[header_size: self._end].cast('d')
+
+    def __len__(self):
+        return self._rows
+
+    # Everything returned is a copy: no view of the mapping outlives close()
+    def times(self):
+        return self._values[0::self._width].tolist()
+
+    def _row_rates(self, i):
+        row = self._values[i * self._width: (i + 1) * self._width].tolist()
+        return {code: row[j] for code, j in self._column.items() if not math.isnan(row[j])}
+
+    def rows(self):
+        for i in range(self._rows):
+            yield self._values[i * self._width], self._row_rates(i)
+
+    def index_at(self, when):
+        '''
+        Row of the last snapshot at or before when (a date, 'YYYY-MM-DD', datetime or unix time).
+        LookupError if the history is empty or starts after when (no rates known for that day).
+        '''
+        if not self._rows:
+            raise LookupError('The rates history is empty.')
+        with self._values[0::self._width] as times:
+            i = bisect.bisect_right(times, _to_unix(when)) - 1
+            first = times[0]
+        if i < 0:
+            since = datetime.fromtimestamp(first, timezone.utc).date()
+            raise LookupError(f'No rates before {since.isoformat()} in the rates history.')
+        return i
+
+    def rates_at(self, when):
+        return self._row_rates(self.index_at(when))
+
+    def series(self, code):
+        return list(zip(self.times(), self._values[self._column[code]::self._width].tolist()))
+
+    def close(self):
+        if hasattr(self, '_values'):
+            self._values.release()
+        if isinstance(self._mm, mmap.mmap):
+            try:
+                self._mm.close()
+            except BufferError:
+                pass  # a view is still exported: the mapping is freed with the last view
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def exchange_rates_at(when, amount, from_currency, to_currency, path = RATES_HISTORY_FILE):
+    with RatesHistory(path) as history:
+        rates = history.rates_at(when)
+    return exchange_rates(rates, amount, from_currency, to_currency)
@@ -1,18 +1,59 @@
 from utilities import (
+    HTTP_CACHE,
+    README_CACHE,
+    RESOLVED_TITLE_CACHE,
     fetch_text,
     parse_readme,
-    build_subjects_text_from_github_api,
+    sync_issue_store,
+    issues_from_store,
     parse_subjects,
+    build_deadline_epochs,
     add_deadline_deltas,
+    timestamp_cache_info,
+    aggregate_submissions,
     make_submissions_status_table,
     print_per_assignment_summary,
+    make_deadline_window_table,
+    DEADLINE_WINDOW_HOURS,
     plot_on_time_distributions,
     plot_subject_format_popularity,
+    on_time_figure_specs,
+    format_popularity_figure_spec,
+    render_figures,
     make_student_habits_table,
+    export_report,
+    EXPORT_FORMATS,
+    RunTrace,
+    watch_report,
 )
+import argparse
 import pandas as pd
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="WIS Python Course assignment submission report")
+    parser.add_argument("--plots-dir", metavar="DIR",
+                        help="headless mode: write the plots to DIR instead of showing them")
+    parser.add_argument("--plot-format", action="append", choices=["png", "svg", "pdf"],
+                        help="file format of the written plots (repeatable, default: png)")
+    parser.add_argument("--export", metavar="DIR",
+                        help="also write the tables and the raw submissions to DIR (machine-readable)")
+    parser.add_argument("--export-format", action="append", choices=EXPORT_FORMATS,
+                        help="export file format (repeatable, default: csv and json)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write a JSON trace of the run (stage timings, HTTP / cache / regex counters) to FILE")
+    parser.add_argument("--profile", action="store_true",
+                        help="with --trace: also run cProfile (top functions in the trace, raw stats in FILE.prof)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="with --trace: also run tracemalloc (peak memory per stage, top allocation sites)")
+    parser.add_argument("--near-deadline", type=float, action="append", metavar="HOURS",
+                        help="windows of the 'close to the deadline' table, in hours (repeatable, default: 1, 6, 24)")
+    parser.add_argument("--watch", type=float, metavar="SECONDS",
+                        help="keep running: poll for new / changed issues every SECONDS and rewrite the tables "
+                             "(to the --export DIR, default: live_report) after each change")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     github_user = "Code-Maven"
     github_repo = "wis-python-course-2025-10"
     branch = "main"
@@ -22,53 +63,176 @@ def main():
     print(f"Repository: {github_user}/{github_repo} (branch: {branch})")
     print("=" * 80)
 
+    trace = RunTrace(profile=args.profile, trace_memory=args.trace_memory).start()
+
+    # Bodies + ETags from the previous run; unchanged resources are answered with 304
+    with trace.stage("load_caches"):
+        http_cache_path = "http_cache.json"
+        HTTP_CACHE.load(http_cache_path)
+        readme_cache_path = "readme_cache.json"  # parsed roster + deadlines, by README content hash
+        README_CACHE.load(readme_cache_path)
+        resolved_titles_path = "resolved_titles.json"  # titles matched to a roster name by the fuzzy fallback
+        RESOLVED_TITLE_CACHE.load(resolved_titles_path)
+
     # --- Load README (roster + deadlines) ---
-    readme_url = f"https://raw.githubusercontent.com/{github_user}/{github_repo}/{branch}/README.md"
-    readme_text = fetch_text(readme_url)
-    roster, deadlines = parse_readme(readme_text)
+    with trace.stage("fetch_readme"):
+        readme_url = f"https://raw.githubusercontent.com/{github_user}/{github_repo}/{branch}/README.md"
+        readme_text = fetch_text(readme_url)
+    with trace.stage("parse_readme"):
+        roster, deadlines = parse_readme(readme_text)
 
     assignment_names = sorted(deadlines.keys(), key=lambda s: int(s[3:]) if s.lower().startswith("day") else s)
 
     print(f"  Students found: {len(roster)}")
     print(f"  Assignments found: {len(assignment_names)}")
 
+    if args.watch:
+        # the trace (and profile) covers the whole watch, written when it stops
+        try:
+            with trace.stage("watch"):
+                return watch(args, github_user, github_repo, roster, deadlines, http_cache_path, trace)
+        finally:
+            save_trace(trace, args)
+
     # --- Build subjects text from GitHub API ---
     # subjects_url = f"https://raw.githubusercontent.com/{github_user}/{github_repo}/{branch}/day09/subjects.txt"
     # subjects_text = fetch_text(subjects_url)
-    subjects_text = build_subjects_text_from_github_api(github_user, github_repo)
+    # subjects_text = build_subjects_text_from_github_api(github_user, github_repo, concurrent=True)
+    # Incremental: only issues updated since the last run are downloaded and merged into the local store
+    with trace.stage("sync_issues"):
+        store_path = f"issues_{github_user}_{github_repo}.jsonl"
+        issues = sync_issue_store(github_user, github_repo, store_path, concurrent=True)
+        subject_issues = issues_from_store(issues)
+    trace.count("issues", len(subject_issues))
+
+    with trace.stage("save_caches"):
+        HTTP_CACHE.save(http_cache_path)
+        README_CACHE.save(readme_cache_path)
+    stats = HTTP_CACHE.stats()
+    print(f"  HTTP cache: {stats['hits']} hits (304), {stats['misses']} misses")
 
     # --- Parse submissions + add deltas ---
-    submissions = parse_subjects(subjects_text, roster, assignment_names)
-    submissions = add_deadline_deltas(submissions, deadlines)
+    with trace.stage("parse_subjects"):
+        submissions = parse_subjects(subject_issues, roster, assignment_names)
+    RESOLVED_TITLE_CACHE.save(resolved_titles_path)
+    with trace.stage("deadline_deltas"):
+        deadline_epochs = build_deadline_epochs(deadlines)  # parsed once, shared by every stage
+        submissions = add_deadline_deltas(submissions, deadlines, delta_key=None, deadline_epochs=deadline_epochs)
 
     unknown_students = submissions.get("UNKNOWN", {})
     if unknown_students:
         print(f"  WARNING: {len(unknown_students)} issues could not be matched to a student (stored under 'UNKNOWN').")
 
+    # --- One pass over all submissions for every table and plot ---
+    with trace.stage("aggregate"):
+        aggregates = aggregate_submissions(submissions, roster, assignment_names)
+
     # --- Build and print table ---
-    header, rows = make_submissions_status_table(roster, assignment_names, submissions)
-    df = pd.DataFrame(rows, columns=header)
-    print("\nStatus Table (On-time / Late / Missing)\n")
-    print(df.to_markdown(index=False))
+    with trace.stage("status_table"):
+        status_table = make_submissions_status_table(roster, assignment_names, submissions, aggregates=aggregates)
+        header, rows = status_table
+        df = pd.DataFrame(rows, columns=header)
+        print("\nStatus Table (On-time / Late / Missing)\n")
+        print(df.to_markdown(index=False))
 
     # --- Per-assignment summary ---
     print("\nPer-assignment Summary")
     print("-" * 80)
 
-    assignment_summary = print_per_assignment_summary(roster, assignment_names, submissions)
-    for a in assignment_names:
-        on_time, late, missing, unchecked = assignment_summary[a]
-        print(f"{a}: {on_time} on-time, {late} late, {missing} missing ({unchecked} unchecked issues).")
-    
+    with trace.stage("assignment_summary"):
+        assignment_summary = print_per_assignment_summary(roster, assignment_names, submissions, aggregates=aggregates)
+        for a in assignment_names:
+            on_time, late, missing, unchecked = assignment_summary[a]
+            print(f"{a}: {on_time} on-time, {late} late, {missing} missing ({unchecked} unchecked issues).")
+
+    # --- Submissions close to the deadline (binary searches on the sorted deltas) ---
+    with trace.stage("deadline_windows"):
+        header, rows = make_deadline_window_table(
+            roster, assignment_names, submissions,
+            hours=args.near_deadline or DEADLINE_WINDOW_HOURS, aggregates=aggregates,
+        )
+        print("\nSubmissions Close to the Deadline (latest submission per student)\n")
+        print(pd.DataFrame(rows, columns=header).to_markdown(index=False))
+
     # --- Plots ---
-    plot_on_time_distributions(submissions)
-    plot_subject_format_popularity(submissions, assignment_names=list(deadlines.keys()))
+    with trace.stage("plots"):
+        if args.plots_dir:
+            # Headless: all figures rendered in parallel, written as files
+            specs = on_time_figure_specs(aggregates)
+            format_spec = format_popularity_figure_spec(aggregates, list(deadlines.keys()))
+            if format_spec is not None:
+                specs.append(format_spec)
+            paths = render_figures(specs, args.plots_dir, args.plot_format or ["png"])
+            print(f"\nPlots written: {', '.join(paths)}")
+        else:
+            plot_on_time_distributions(submissions, aggregates=aggregates)
+            plot_subject_format_popularity(submissions, assignment_names=list(deadlines.keys()), aggregates=aggregates)
 
     # --- Student habits table ---
-    header, rows = make_student_habits_table(roster, submissions)
-    df = pd.DataFrame(rows, columns=header)
-    print("\nStudent Submission Habits (Average Submission Time (before deadline) and Formats Used)\n")
-    print(df.to_markdown(index=False))
+    with trace.stage("habits_table"):
+        habits_table = make_student_habits_table(roster, submissions, aggregates=aggregates)
+        header, rows = habits_table
+        df = pd.DataFrame(rows, columns=header)
+        print("\nStudent Submission Habits (Average Submission Time (before deadline) and Formats Used)\n")
+        print(df.to_markdown(index=False))
+
+    # --- Machine-readable export ---
+    if args.export:
+        with trace.stage("export"):
+            paths = export_report(
+                args.export,
+                status_table=status_table,
+                summary=assignment_summary,
+                habits_table=habits_table,
+                submissions=submissions,
+                formats=args.export_format or ["csv", "json"],
+            )
+        print(f"\nExported: {', '.join(paths)}")
+
+    ts = timestamp_cache_info()
+    print(f"\nTimestamp cache: {ts['hits']} hits, {ts['misses']} misses ({ts['hit_rate']:.0%} hit rate)")
+
+    save_trace(trace, args)
+
+def save_trace(trace, args):
+    trace.stop()
+    if args.trace:
+        trace.save(args.trace)
+        print(f"Trace written to {args.trace}")
+
+def watch(args, github_user, github_repo, roster, deadlines, http_cache_path, trace):
+    output_dir = args.export or "live_report"
+    print(f"\nWatching {github_user}/{github_repo} every {args.watch:g}s, tables in {output_dir}/ (Ctrl-C to stop)")
+
+    # the caches are only written again when a tick changed something (the HTTP cache can be large)
+    saved = {"http": None, "titles": None}
+
+    def on_tick(tick):
+        trace.count("watch_ticks")
+        trace.count("watch_changed_issues", tick["changed_issues"])
+        http_state = (HTTP_CACHE.misses, len(HTTP_CACHE))  # a miss = a new / changed body was stored
+        if tick["changed_issues"] or http_state != saved["http"]:
+            HTTP_CACHE.save(http_cache_path)
+            saved["http"] = http_state
+        if RESOLVED_TITLE_CACHE.misses != saved["titles"]:
+            RESOLVED_TITLE_CACHE.save("resolved_titles.json")
+            saved["titles"] = RESOLVED_TITLE_CACHE.misses
+        if tick["error"]:
+            print(f"  tick {tick['tick']}: polling failed ({tick['error']}), retrying")
+        if tick["cells"] or tick["tick"] == 0:
+            print(f"  tick {tick['tick']}: {tick['changed_issues']} new/changed issues, "
+                  f"{tick['cells']} cells updated in {tick['compute_s'] * 1000:.0f} ms")
+
+    try:
+        watch_report(
+            github_user, github_repo, roster, deadlines, output_dir,
+            store_path=f"issues_{github_user}_{github_repo}.jsonl",
+            interval=args.watch,
+            formats=args.export_format or ["csv"],
+            on_tick=on_tick,
+        )
+    except KeyboardInterrupt:
+        print("\nStopped.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,61 @@
+from utilities import (
+    HTTP_CACHE,
+    README_CACHE,
+    parse_course_repo,
+    run_batch_report,
+    COURSE_SUMMARY_COLUMNS,
+)
+import argparse
+import pandas as pd
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Assignment submission reports for many course repositories")
+    parser.add_argument("repos", nargs="*", metavar="USER/REPO[@BRANCH]", help="course repositories")
+    parser.add_argument("--repos-file", metavar="FILE",
+                        help="file with one USER/REPO[@BRANCH] per line (# starts a comment)")
+    parser.add_argument("--output-dir", default="reports", metavar="DIR",
+                        help="per-course reports and the combined summary (default: reports)")
+    parser.add_argument("--fetch-workers", type=int, default=4, help="concurrent course downloads (default: 4)")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="processes parsing the courses (default: one per CPU)")
+    parser.add_argument("--plot-format", action="append", choices=["png", "svg", "pdf"],
+                        help="also write the plots of each course in this format (repeatable)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    specs = list(args.repos)
+    if args.repos_file:
+        with open(args.repos_file, encoding="utf-8") as f:
+            specs += [line.split("#")[0].strip() for line in f if line.split("#")[0].strip()]
+    if not specs:
+        specs = ["Code-Maven/wis-python-course-2025-10@main"]
+    repos = [parse_course_repo(spec) for spec in specs]
+
+    print("=" * 80)
+    print(f"WIS Python Course — Assignment Submission Reports for {len(repos)} course(s)")
+    print("=" * 80)
+
+    http_cache_path = "http_cache.json"
+    HTTP_CACHE.load(http_cache_path)
+    readme_cache_path = "readme_cache.json"  # parsed roster + deadlines, by README content hash
+    README_CACHE.load(readme_cache_path)
+
+    rows = run_batch_report(
+        repos,
+        args.output_dir,
+        fetch_workers=args.fetch_workers,
+        parse_workers=args.parse_workers,
+        plot_formats=args.plot_format,
+    )
+
+    HTTP_CACHE.save(http_cache_path)
+    README_CACHE.save(readme_cache_path)
+
+    print("\nCross-course Summary\n")
+    print(pd.DataFrame(rows, columns=COURSE_SUMMARY_COLUMNS).to_markdown(index=False))
+    print(f"\nReports written to {args.output_dir}/")
+
+if __name__ == "__main__":
+    main()
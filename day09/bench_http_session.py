@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+'''
+Benchmark: one urlopen() connection per page vs. the keep-alive HTTPSession.
+
+A local stub server serves paginated JSON. Every NEW connection pays HANDSHAKE seconds
+(standing in for the TCP + TLS handshake to api.github.com), every request pays LATENCY.
+
+Run:
+    python bench_http_session.py
+'''
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.request import Request, urlopen
+
+from utilities import HTTPSession
+
+PAGES = 30
+HANDSHAKE = 0.03
+LATENCY = 0.005
+BODY = json.dumps([{"number": n, "title": f"Day01 by Student {n}"} for n in range(100)]).encode("utf-8")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body are separate writes
+
+    def setup(self):
+        time.sleep(HANDSHAKE)
+        super().setup()
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def fetch_with_urlopen(urls):
+    for url in urls:
+        with urlopen(Request(url)) as resp:
+            resp.read()
+
+
+def fetch_with_session(urls):
+    session = HTTPSession()
+    for url in urls:
+        session.get(url)
+    session.close()
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_port}/issues?page={p}" for p in range(1, PAGES + 1)]
+
+    print(f"{PAGES} pages, handshake {HANDSHAKE * 1000:.0f} ms, latency {LATENCY * 1000:.0f} ms")
+    results = {}
+    for name, func in [("urlopen", fetch_with_urlopen), ("HTTPSession", fetch_with_session)]:
+        start = time.perf_counter()
+        func(urls)
+        results[name] = time.perf_counter() - start
+        print(f"  {name:12s} {results[name]:.3f} s")
+    print(f"  speedup: {results['urlopen'] / results['HTTPSession']:.1f}x")
+
+    server.shutdown()
+    server.server_close()
+
+if __name__ == "__main__":
+    main()
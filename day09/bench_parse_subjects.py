@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+'''
+Benchmark: parse_subjects with the python backend vs. the vectorized pandas backend,
+on synthetic issues (10k, 100k and 1M by default).
+
+Run:
+    python bench_parse_subjects.py
+    python bench_parse_subjects.py 10000 50000
+'''
+
+import random
+import sys
+import time
+
+from utilities import Issue, parse_subjects, parse_subjects_frame
+
+SIZES = [10_000, 100_000, 1_000_000]
+N_STUDENTS = 60
+N_ASSIGNMENTS = 12
+SEED = 0
+
+FORMATS = [
+    "Day{d:02d} by {n}", "Day {d} - {n}", "day{d}: {n}", "Day{d:02d} {n}", "Assignment (day {d}): {n}",
+    "Assignment {d} - {n}", "Assignment {d} by {n}", "{n} - day {d}", "Final project proposal by {n}", "{n}",
+]
+
+
+def make_issues(n, rnd):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    word = lambda: "".join(rnd.choice(letters) for _ in range(rnd.randint(3, 8))).title()
+    roster = [f"{word()} {word()}" for _ in range(N_STUDENTS)]
+    assignments = [f"Day{d:02d}" for d in range(1, N_ASSIGNMENTS + 1)]
+
+    issues = []
+    for number in range(1, n + 1):
+        name = rnd.choice(roster) if rnd.random() < 0.95 else word()
+        title = rnd.choice(FORMATS).format(d=rnd.randint(1, N_ASSIGNMENTS), n=name)
+        if rnd.random() < 0.5:
+            title += f" (attempt {rnd.randint(1, 10_000)})"  # keeps most titles unique
+        created = f"2025-{rnd.randint(10, 12)}-{rnd.randint(1, 28):02d}T{rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}:00Z"
+        issues.append(Issue(number, rnd.choice(["OPEN", "CLOSED"]), title, created))
+    return roster, assignments, issues
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or SIZES
+    rnd = random.Random(SEED)
+
+    print(f"{'issues':>10} {'python':>10} {'pandas':>10} {'frame only':>11}")
+    for n in sizes:
+        roster, assignments, issues = make_issues(n, rnd)
+        _python, t_python = timed(parse_subjects, issues, roster, assignments)
+        _pandas, t_pandas = timed(parse_subjects, issues, roster, assignments, backend="pandas")
+        _frame, t_frame = timed(parse_subjects_frame, issues, roster, assignments)
+        print(f"{n:>10} {t_python:>9.2f}s {t_pandas:>9.2f}s {t_frame:>10.2f}s")
+
+if __name__ == "__main__":
+    main()
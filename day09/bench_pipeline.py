@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+
+'''
+pytest-benchmark suite for the day09 pipeline, offline: a synthetic course served by the
+local GitHub stand-in (mock_github). Covers the fetch, parse_subjects, add_deadline_deltas,
+the aggregation and the table builders.
+
+Not part of the regular test run (the file name does not start with test_). Run:
+    python -m pytest bench_pipeline.py
+    BENCH_ISSUES=50000 python -m pytest bench_pipeline.py --benchmark-group-by=group
+    python -m pytest bench_pipeline.py --benchmark-autosave   # then --benchmark-compare
+'''
+
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from mock_github import MockGitHub, make_synthetic_course
+from utilities import (
+    HTTP_CACHE,
+    Issue,
+    iter_issues,
+    parse_readme,
+    parse_subjects,
+    build_deadline_epochs,
+    add_deadline_deltas,
+    aggregate_submissions,
+    make_submissions_status_table,
+    print_per_assignment_summary,
+    make_student_habits_table,
+)
+
+N_STUDENTS = int(os.environ.get("BENCH_STUDENTS", 60))
+N_ASSIGNMENTS = int(os.environ.get("BENCH_ASSIGNMENTS", 12))
+N_ISSUES = int(os.environ.get("BENCH_ISSUES", 5000))
+LATENCY = float(os.environ.get("BENCH_LATENCY", 0.02))
+
+
+@pytest.fixture(scope="module")
+def course():
+    return make_synthetic_course(N_STUDENTS, N_ASSIGNMENTS, N_ISSUES)
+
+
+@pytest.fixture(scope="module")
+def server(course):
+    with MockGitHub(course, latency=LATENCY) as gh:
+        yield gh
+
+
+@pytest.fixture(scope="module")
+def parsed(course):
+    roster, deadlines = parse_readme(course.readme, cache=None)
+    issues = [
+        Issue(i["number"], i["state"].upper(), i["title"], i["created_at"])
+        for i in course.issues if "pull_request" not in i
+    ]
+    return roster, deadlines, sorted(deadlines), issues
+
+
+def fresh_submissions(parsed):
+    roster, deadlines, assignment_names, issues = parsed
+    return parse_subjects(issues, roster, assignment_names)
+
+
+@pytest.mark.benchmark(group="fetch")
+@pytest.mark.parametrize("concurrent", [False, True], ids=["sequential", "concurrent"])
+def test_fetch(benchmark, server, course, concurrent):
+    # Cold cache every round: every page is downloaded
+    issues = benchmark.pedantic(
+        lambda: list(iter_issues("org", "course", concurrent=concurrent, api_base=server.url)),
+        setup=HTTP_CACHE.clear, rounds=3,
+    )
+    assert len(issues) == len([i for i in course.issues if "pull_request" not in i])
+
+
+@pytest.mark.benchmark(group="fetch")
+def test_fetch_revalidated(benchmark, server):
+    list(iter_issues("org", "course", concurrent=True, api_base=server.url))
+    before = server.not_modified
+    benchmark(lambda: list(iter_issues("org", "course", concurrent=True, api_base=server.url)))
+    assert server.not_modified > before
+
+
+@pytest.mark.benchmark(group="parse")
+def test_parse_readme(benchmark, course):
+    roster, _deadlines = benchmark(parse_readme, course.readme, cache=None)
+    assert len(roster) == N_STUDENTS
+
+
+@pytest.mark.benchmark(group="parse")
+@pytest.mark.parametrize("backend", ["python", "pandas"])
+def test_parse_subjects(benchmark, parsed, backend):
+    roster, _deadlines, assignment_names, issues = parsed
+    submissions = benchmark(parse_subjects, issues, roster, assignment_names, backend=backend)
+    assert submissions
+
+
+@pytest.mark.benchmark(group="deltas")
+@pytest.mark.parametrize("delta_key", ["delta_to_deadline", None], ids=["with-strings", "seconds-only"])
+def test_add_deadline_deltas(benchmark, parsed, delta_key):
+    _roster, deadlines, _assignment_names, _issues = parsed
+    epochs = build_deadline_epochs(deadlines)
+    # deltas are added in place: a freshly parsed dict for every round (not timed)
+    benchmark.pedantic(
+        lambda submissions: add_deadline_deltas(submissions, deadlines, delta_key=delta_key, deadline_epochs=epochs),
+        setup=lambda: ((fresh_submissions(parsed),), {}), rounds=10,
+    )
+
+
+@pytest.fixture(scope="module")
+def with_deltas(parsed):
+    _roster, deadlines, _assignment_names, _issues = parsed
+    return add_deadline_deltas(fresh_submissions(parsed), deadlines)
+
+
+@pytest.mark.benchmark(group="tables")
+def test_aggregate_submissions(benchmark, parsed, with_deltas):
+    roster, _deadlines, assignment_names, _issues = parsed
+    agg = benchmark(aggregate_submissions, with_deltas, roster, assignment_names)
+    assert agg.assignment_counts
+
+
+@pytest.mark.benchmark(group="tables")
+@pytest.mark.parametrize("shared", [False, True], ids=["own-pass", "shared-aggregates"])
+def test_table_builders(benchmark, parsed, with_deltas, shared):
+    roster, _deadlines, assignment_names, _issues = parsed
+    agg = aggregate_submissions(with_deltas, roster, assignment_names) if shared else None
+
+    def tables():
+        return (
+            make_submissions_status_table(roster, assignment_names, with_deltas, aggregates=agg),
+            print_per_assignment_summary(roster, assignment_names, with_deltas, aggregates=agg),
+            make_student_habits_table(roster, with_deltas, aggregates=agg),
+        )
+
+    status, _summary, habits = benchmark(tables)
+    assert len(status[1]) == len(habits[1]) == N_STUDENTS
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,156 @@
+'''
+Machine-readable export of the report (CSV / JSON Lines / Parquet).
+'''
+
+import os
+from itertools import islice
+from typing import Dict, List, Tuple, Optional, Any, Iterable, Iterator
+import pandas as pd
+
+# ----------------------------
+# 5) Machine-readable export (CSV / JSON Lines / Parquet)
+# ----------------------------
+
+EXPORT_FORMATS = ("csv", "json", "parquet")
+
+SUBMISSIONS_EXPORT_DTYPES = {
+    "student": "string",
+    "assignment": "string",
+    "issue_id": "Int64",
+    "status": "string",
+    "time": "string",
+    "format": "string",
+    "delta_seconds": "Int64",
+    "is_latest": "bool",
+}
+
+
+def iter_submission_rows(submissions: Dict[str, Dict[str, dict]]) -> Iterator[dict]:
+    """
+    Long format: one row per issue (repeats included), is_latest marks the entry the
+    tables use for its (student, assignment).
+    """
+    for student, per_student in submissions.items():
+        for assignment, entry in per_student.items():
+            for e in entry.get("_all", [entry]):
+                yield {
+                    "student": student,
+                    "assignment": assignment,
+                    "issue_id": e.get("issue_id"),
+                    "status": e.get("status"),
+                    "time": e.get("time"),
+                    "format": e.get("format"),
+                    "delta_seconds": e.get("delta_seconds"),
+                    "is_latest": e is entry,
+                }
+
+
+def iter_submission_frames(submissions: Dict[str, Dict[str, dict]], chunk_size: int = 50_000) -> Iterator[pd.DataFrame]:
+    """
+    The long-format submissions in DataFrames of at most chunk_size rows, all with the
+    same columns and dtypes (SUBMISSIONS_EXPORT_DTYPES). No submissions: one empty frame.
+    """
+    rows = iter_submission_rows(submissions)
+    first = True
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk and not first:
+            return
+        first = False
+        yield pd.DataFrame(chunk, columns=list(SUBMISSIONS_EXPORT_DTYPES)).astype(SUBMISSIONS_EXPORT_DTYPES)
+
+
+def _write_frames(frames: Iterable[pd.DataFrame], path: str, fmt: str) -> int:
+    """
+    Streams the frames to one file, chunk by chunk (CSV: one header, JSON: JSON Lines,
+    Parquet: one row group per chunk). Returns the number of rows written.
+    """
+    # Written to a temporary file first, so readers never see a half-written file
+    tmp_path = path + ".tmp"
+    rows = _write_frames_to(frames, tmp_path, fmt)
+    os.replace(tmp_path, path)
+    return rows
+
+
+def _write_frames_to(frames: Iterable[pd.DataFrame], path: str, fmt: str) -> int:
+    rows = 0
+    if fmt == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export needs pyarrow (pip install pyarrow)") from e
+        writer = None
+        try:
+            for df in frames:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                rows += len(df)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for df in frames:
+            if fmt == "csv":
+                df.to_csv(f, index=False, header=(rows == 0))
+            elif fmt == "json":
+                if len(df):
+                    f.write(df.to_json(orient="records", lines=True, force_ascii=False).rstrip("\n") + "\n")
+            else:
+                raise ValueError(f"Unknown export format {fmt!r} (expected one of {EXPORT_FORMATS})")
+            rows += len(df)
+    return rows
+
+
+def export_report(
+    output_dir: str,
+    *,
+    status_table: Tuple[List[str], List[List[Any]]],
+    summary: Dict[str, Tuple[int, int, int, int]],
+    habits_table: Tuple[List[str], List[List[Any]]],
+    submissions: Optional[Dict[str, Dict[str, dict]]],
+    formats: Iterable[str] = ("csv", "json"),
+    chunk_size: int = 50_000,
+) -> List[str]:
+    """
+    Writes the report tables and the raw long-format submissions to output_dir:
+      status.<fmt>, summary.<fmt>, habits.<fmt>, submissions.<fmt>
+    for each fmt in formats (csv, json = JSON Lines, parquet = needs pyarrow);
+    submissions=None writes the tables only. Files are replaced atomically.
+    The submissions are written in chunks of chunk_size rows, so large histories stream
+    to disk instead of being built as one DataFrame.
+
+    Returns:
+      the written paths
+    """
+    formats = list(formats)
+    unknown = [fmt for fmt in formats if fmt not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown export format(s) {unknown} (expected one of {EXPORT_FORMATS})")
+    os.makedirs(output_dir, exist_ok=True)
+
+    header, rows = status_table
+    status_df = pd.DataFrame(rows, columns=header)
+    summary_df = pd.DataFrame(
+        [[a, *counts] for a, counts in summary.items()],
+        columns=["Assignment", "On-time", "Late", "Missing", "Unchecked"],
+    )
+    header, rows = habits_table
+    habits_df = pd.DataFrame(rows, columns=header)
+    # Sets of formats -> one sorted, "; "-separated string (CSV / Parquet friendly)
+    habits_df["Formats"] = habits_df["Formats"].map(lambda fmts: "; ".join(sorted(fmts)))
+
+    paths = []
+    for fmt in formats:
+        outputs = [("status", [status_df]), ("summary", [summary_df]), ("habits", [habits_df])]
+        if submissions is not None:
+            outputs.append(("submissions", iter_submission_frames(submissions, chunk_size)))
+        for name, frames in outputs:
+            path = os.path.join(output_dir, f"{name}.{fmt}")
+            _write_frames(frames, path, fmt)
+            paths.append(path)
+    return paths
@@ -0,0 +1,756 @@
+'''
+GitHub access for the report: HTTP cache, keep-alive session, issue pages and the local issue store.
+'''
+
+import base64
+import codecs
+import http.client
+import json
+import os
+import re
+import threading
+import time
+import urllib.request
+from urllib.error import HTTPError
+from urllib.parse import urlencode, urlparse, urlunparse, urljoin, parse_qs
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, List, Tuple, Optional, Any, Iterable, Iterator, NamedTuple
+
+# ----------------------------
+# HTTP cache (ETag / Last-Modified revalidation)
+# ----------------------------
+
+class HTTPCache:
+    """
+    LRU cache of HTTP response bodies together with their ETag / Last-Modified validators.
+
+    A cached URL is revalidated with If-None-Match / If-Modified-Since; a 304 answer reuses
+    the stored body (a hit), any other answer downloads the body again (a miss).
+    Bounded by max_entries and max_bytes; least recently used entries are evicted first.
+    """
+
+    KEPT_HEADERS = ("ETag", "Last-Modified", "Link", "Content-Type")
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, url: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def conditional_headers(self, entry: dict) -> Dict[str, str]:
+        headers = {}
+        if entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+    def put(self, url: str, body: bytes, headers) -> None:
+        kept = {k: headers.get(k) for k in self.KEPT_HEADERS if headers.get(k)}
+        if "ETag" not in kept and "Last-Modified" not in kept:
+            return  # nothing to revalidate with
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self._bytes -= len(old["body"])
+            self._entries[url] = {"body": body, "headers": kept}
+            self._bytes += len(body)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _url, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted["body"])
+                self.evictions += 1
+
+    def count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def save(self, path: str) -> None:
+        with self._lock:
+            data = [
+                {"url": url, "headers": e["headers"], "body": e["body"].decode("utf-8")}
+                for url, e in self._entries.items()
+            ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def load(self, path: str) -> None:
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                data = json.load(f)
+            except ValueError:
+                return  # corrupt cache file: start empty
+        for e in data:
+            self.put(e["url"], e["body"].encode("utf-8"), e["headers"])
+
+
+HTTP_CACHE = HTTPCache()
+
+
+# ----------------------------
+# Keep-alive HTTP session
+# ----------------------------
+
+class HTTPSession:
+    """
+    Keep-alive HTTP(S) client built on http.client.
+
+    Keeps one persistent connection per (thread, host), so paginated fetches skip the
+    TCP/TLS handshake after the first page. Retries with exponential backoff on 5xx and
+    on secondary rate limits (403/429 with Retry-After, at most max_wait), and slows down when
+    X-RateLimit-Remaining gets low (spreading the remaining calls until X-RateLimit-Reset).
+    A refused connection is not retried.
+
+    Honours HTTP_PROXY / HTTPS_PROXY / NO_PROXY like urlopen (or an explicit proxies dict,
+    {scheme: proxy URL}): https goes through a CONNECT tunnel, http sends the full URL.
+    """
+
+    RETRY_CONNECTION_ERRORS = (http.client.HTTPException, ConnectionError, TimeoutError)
+
+    def __init__(
+        self,
+        *,
+        max_retries: int = 4,
+        backoff: float = 1.0,
+        timeout: float = 30.0,
+        min_remaining: int = 10,
+        max_wait: float = 120.0,
+        proxies: Optional[Dict[str, str]] = None,
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.min_remaining = min_remaining
+        self.max_wait = max_wait
+        self.proxies = proxies
+        self._local = threading.local()
+        self._all_connections = []  # (owner thread, connection)
+        self._lock = threading.Lock()
+        self.rate_remaining: Optional[int] = None
+        self.rate_reset: Optional[float] = None
+        self.requests = 0
+        self.connections = 0
+        self.bytes_received = 0
+
+    def _proxy(self, scheme: str, netloc: str) -> Optional[str]:
+        proxies = self.proxies if self.proxies is not None else urllib.request.getproxies()
+        proxy = proxies.get(scheme)
+        if proxy and urllib.request.proxy_bypass(urlparse(f"//{netloc}").hostname or netloc):
+            return None
+        return proxy
+
+    def _connection(self, scheme: str, netloc: str, *, fresh: bool = False):
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        key = (scheme, netloc)
+        conn = conns.get(key)
+        if conn is not None and fresh:
+            conn.close()
+            conn = None
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            proxy = self._proxy(scheme, netloc)
+            if proxy is None:
+                conn = cls(netloc, timeout=self.timeout)
+            else:
+                p = urlparse(proxy if "://" in proxy else f"http://{proxy}")
+                proxy_headers = {}
+                if p.username:
+                    credentials = f"{p.username}:{p.password or ''}".encode("utf-8")
+                    proxy_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials).decode("ascii")
+                if scheme == "https":
+                    conn = cls(p.hostname, p.port or 8080, timeout=self.timeout)
+                    conn.set_tunnel(netloc, headers=proxy_headers)
+                else:
+                    conn = http.client.HTTPConnection(p.hostname, p.port or 8080, timeout=self.timeout)
+                    conn.proxy_headers = proxy_headers  # sent with every request (no tunnel)
+            conns[key] = conn
+            with self._lock:
+                self._all_connections.append((threading.current_thread(), conn))
+                self.connections += 1
+        return conn
+
+    def _send(self, url: str, headers: Dict[str, str]):
+        parts = urlparse(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        for fresh in (False, True):
+            conn = self._connection(parts.scheme, parts.netloc, fresh=fresh)
+            proxy_headers = getattr(conn, "proxy_headers", None)
+            if proxy_headers is not None and path.startswith("/"):
+                # plain http through a proxy: absolute URL in the request line
+                path = f"http://{parts.netloc}{path}"
+                headers = {**headers, **proxy_headers}
+            reused = conn.sock is not None
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()  # must be fully read before the connection can be reused
+            except self.RETRY_CONNECTION_ERRORS:
+                conn.close()
+                if reused and not fresh:
+                    continue  # the server closed an idle keep-alive connection: reconnect once
+                raise
+            if resp.will_close:
+                conn.close()
+            with self._lock:
+                self.requests += 1
+                self.bytes_received += len(body)
+            return resp.status, resp.headers, body
+
+    def _update_rate_limit(self, headers) -> None:
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is not None and remaining.isdigit():
+            self.rate_remaining = int(remaining)
+        if reset is not None and reset.isdigit():
+            self.rate_reset = float(reset)
+
+    def _pace(self) -> None:
+        remaining, reset = self.rate_remaining, self.rate_reset
+        if remaining is None or reset is None or remaining >= self.min_remaining:
+            return
+        wait = (reset - time.time()) / max(remaining, 1)
+        if wait > 0:
+            time.sleep(min(wait, self.max_wait))
+
+    def _retry_delay(self, status: int, headers, attempt: int) -> Optional[float]:
+        if status >= 500:
+            return self.backoff * (2 ** attempt)
+        if status in (403, 429):
+            retry_after = headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.max_wait)  # secondary rate limit
+            if headers.get("X-RateLimit-Remaining") == "0" and self.rate_reset is not None:
+                wait = self.rate_reset - time.time()
+                return max(wait, 0.0) if wait <= self.max_wait else None
+            if status == 429:
+                return self.backoff * (2 ** attempt)
+        return None
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None):
+        """
+        GET url and return (status, response headers, body bytes). Follows redirects.
+        """
+        headers = dict(headers or {})
+        headers.setdefault("User-Agent", "wis-python-course-script")
+
+        attempt = redirects = 0
+        while True:
+            self._pace()
+            try:
+                status, resp_headers, body = self._send(url, headers)
+            except ConnectionRefusedError:
+                raise  # nothing is listening: retrying will not help
+            except self.RETRY_CONNECTION_ERRORS:
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self.backoff * (2 ** attempt))
+                attempt += 1
+                continue
+
+            self._update_rate_limit(resp_headers)
+
+            location = resp_headers.get("Location")
+            if status in (301, 302, 303, 307, 308) and location and redirects < 5:
+                url = urljoin(url, location)
+                redirects += 1
+                continue
+
+            wait = self._retry_delay(status, resp_headers, attempt)
+            if wait is None or attempt >= self.max_retries:
+                return status, resp_headers, body
+            time.sleep(wait)
+            attempt += 1
+
+    def prune(self) -> int:
+        """
+        Closes the connections of threads that have exited (e.g. finished fetch workers),
+        so a long-running process does not keep their sockets open.
+
+        Returns:
+          the number of connections closed
+        """
+        with self._lock:
+            dead = [conn for thread, conn in self._all_connections if not thread.is_alive()]
+            self._all_connections = [(t, c) for t, c in self._all_connections if t.is_alive()]
+        for conn in dead:
+            conn.close()
+        return len(dead)
+
+    def close(self) -> None:
+        with self._lock:
+            for _thread, conn in self._all_connections:
+                conn.close()
+            self._all_connections.clear()
+        self._local = threading.local()
+
+
+HTTP_SESSION = HTTPSession()
+
+
+def _http_get(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    cache: Optional[HTTPCache] = HTTP_CACHE,
+    session: HTTPSession = HTTP_SESSION,
+):
+    """
+    GET url and return (body bytes, response headers), revalidating against the cache if given.
+    Raises urllib.error.HTTPError for error statuses (same as urlopen).
+    """
+    headers = dict(headers or {})
+    cached = cache.get(url) if cache is not None else None
+    if cached is not None:
+        headers.update(cache.conditional_headers(cached))
+
+    status, resp_headers, body = session.get(url, headers)
+
+    if status == 304 and cached is not None:
+        cache.count(hit=True)
+        return cached["body"], cached["headers"]
+    if not 200 <= status < 300:
+        raise HTTPError(url, status, http.client.responses.get(status, ""), resp_headers, None)
+
+    if cache is not None:
+        cache.count(hit=False)
+        cache.put(url, body, resp_headers)
+    return body, resp_headers
+
+
+def fetch_text(url, cache: Optional[HTTPCache] = HTTP_CACHE):
+    body, _headers = _http_get(url, cache=cache)
+    return body.decode("utf-8")
+
+GITHUB_API = "https://api.github.com"
+
+
+def _parse_link_header(headers) -> Dict[str, str]:
+    """
+    Parse a GitHub pagination header into {rel: url}:
+        Link: <...>; rel="next", <...>; rel="last"
+    """
+    link = headers.get("Link")
+    if not link:
+        return {}
+    rels = {}
+    for part in link.split(","):
+        part = part.strip()
+        m = re.match(r'<([^>]+)>\s*;\s*rel="([^"]+)"', part)
+        if m:
+            rels[m.group(2)] = m.group(1)
+    return rels
+
+
+def _with_page(url: str, page: int) -> str:
+    # Replace (or add) the page=N query parameter, keeping all other params
+    parts = urlparse(url)
+    query = parse_qs(parts.query)
+    query["page"] = [str(page)]
+    return urlunparse(parts._replace(query=urlencode(query, doseq=True)))
+
+
+GITHUB_HEADERS = {
+    "Accept": "application/vnd.github+json",
+    "X-GitHub-Api-Version": "2022-11-28",
+    "User-Agent": "wis-python-course-script",
+}
+
+
+def _get_page(url: str, cache: Optional[HTTPCache] = HTTP_CACHE):
+    return _http_get(url, GITHUB_HEADERS, cache=cache)
+
+
+def _iter_page_bodies(
+    github_user: str,
+    github_repo: str | None,
+    *,
+    concurrent: bool = False,
+    max_workers: int = 8,
+    api_base: str = GITHUB_API,
+    since: str | None = None,
+    cache: Optional[HTTPCache] = HTTP_CACHE,
+) -> Iterator[bytes]:
+    """
+    Yield the raw issue page bodies of a repository, in page order.
+
+    Sequential mode follows Link: rel="next" one page at a time.
+    Concurrent mode reads rel="last" from the first response and fetches pages 2..last
+    with a bounded thread pool; pages are still yielded in order.
+    since='2025-11-01T00:00:00Z' only returns issues updated at or after that time.
+    """
+    base = f"{api_base}/repos/{github_user}/{github_repo}/issues"
+    params = {"state": "all", "per_page": 100, "page": 1}
+    if since:
+        params["since"] = since
+    url = base + "?" + urlencode(params)
+
+    body, headers = _get_page(url, cache=cache)
+    links = _parse_link_header(headers)
+    yield body
+
+    if concurrent and "last" in links:
+        last_url = links["last"]
+        last_page = int(parse_qs(urlparse(last_url).query).get("page", ["1"])[0])
+        page_urls = iter([_with_page(last_url, p) for p in range(2, last_page + 1)])
+        workers = max(1, max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Only a window of pages is in flight (or waiting to be consumed) at a time,
+            # and futures are consumed in submission order -> deterministic output
+            pending = deque(pool.submit(_get_page, u, cache) for u in islice(page_urls, 2 * workers))
+            while pending:
+                body, _headers = pending.popleft().result()
+                next_url = next(page_urls, None)
+                if next_url is not None:
+                    pending.append(pool.submit(_get_page, next_url, cache))
+                yield body
+        HTTP_SESSION.prune()  # the workers have exited: close their keep-alive connections
+        return
+
+    url = links.get("next")
+    while url:
+        body, headers = _get_page(url, cache=cache)
+        url = _parse_link_header(headers).get("next")
+        yield body
+
+
+def iter_json_array(data: bytes, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Decode a top-level JSON array from UTF-8 bytes incrementally, yielding one element at a time.
+
+    Only one chunk of decoded text plus the element being decoded exist at once, instead of
+    the whole page as a str AND as a list of dicts. A malformed array (e.g. a missing or
+    extra ',') raises json.JSONDecodeError, as json.loads would.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    view = memoryview(data)
+    offset = 0
+    buf = ""
+    pos = 0
+    eof = False
+    started = False
+    after_value = False  # a value was just decoded: "," or "]" must follow
+    after_comma = False  # a "," was just read: a value must follow
+
+    def read_more():
+        nonlocal buf, pos, offset, eof
+        chunk = view[offset: offset + chunk_size]
+        offset += len(chunk)
+        eof = offset >= len(view)
+        buf = buf[pos:] + utf8.decode(chunk, final=eof)
+        pos = 0
+
+    while True:
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            read_more()
+        if pos >= len(buf):
+            raise json.JSONDecodeError("Unterminated JSON array", buf, pos)
+
+        ch = buf[pos]
+        if not started:
+            if ch != "[":
+                raise json.JSONDecodeError("Expected a JSON array", buf, pos)
+            started = True
+            pos += 1
+            continue
+        if ch == "]":
+            if after_comma:
+                raise json.JSONDecodeError("Expecting value after ','", buf, pos)
+            return
+        if ch == ",":
+            if not after_value:
+                raise json.JSONDecodeError("Unexpected ','", buf, pos)
+            after_value, after_comma = False, True
+            pos += 1
+            continue
+        if after_value:
+            raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            read_more()  # element continues in the next chunk
+            continue
+        if not eof and (end == len(buf) or buf[end] not in " \t\r\n,]"):
+            read_more()  # e.g. a number cut in half at the chunk boundary ("-1.5" of "-1.5e10")
+            continue
+        pos = end
+        after_value, after_comma = True, False
+        yield value
+
+
+ISSUE_FIELDS = ("number", "state", "title", "created_at")
+
+
+def iter_issue_records(
+    github_user: str,
+    github_repo: str | None = None,
+    *,
+    fields: Tuple[str, ...] = ISSUE_FIELDS,
+    concurrent: bool = False,
+    max_workers: int = 8,
+    api_base: str = GITHUB_API,
+    since: str | None = None,
+    cache: Optional[HTTPCache] = HTTP_CACHE,
+) -> Iterator[tuple]:
+    """
+    Yield one compact tuple per issue (PRs excluded), holding only `fields`:
+        (number, state, title, created_at)
+
+    Pages are decoded element by element (iter_json_array) and every other field of the
+    issue is dropped immediately, so the decoded issues do not pile up in memory.
+    The raw page bodies are kept by `cache` (for ETag revalidation on the next run, up to
+    its max_bytes) unless cache=None, in which case only the page being decoded is held.
+    """
+    bodies = _iter_page_bodies(
+        github_user, github_repo, concurrent=concurrent, max_workers=max_workers, api_base=api_base, since=since,
+        cache=cache,
+    )
+    for body in bodies:
+        for issue in iter_json_array(body):
+            # The Issues endpoint can include PRs; exclude them
+            if "pull_request" in issue:
+                continue
+            yield tuple(issue.get(f) for f in fields)
+
+
+class Issue(NamedTuple):
+    """One submission issue, as used by parse_subjects (one line of subjects.txt)."""
+    number: Optional[int]
+    state: str        # 'OPEN' / 'CLOSED'
+    title: str
+    created_at: str   # '2026-01-03T18:44:38Z'
+
+
+def _make_issue(number, state, title, created_at) -> Issue:
+    return Issue(number, (state or "").strip().upper(), (title or "").strip(), (created_at or "").strip())
+
+
+def iter_issues(
+    github_user: str,
+    github_repo: str | None = None,
+    *,
+    concurrent: bool = False,
+    max_workers: int = 8,
+    api_base: str = GITHUB_API,
+    since: str | None = None,
+) -> Iterator[Issue]:
+    """
+    Yield an Issue record per GitHub issue (PRs excluded), ready for parse_subjects.
+    """
+    records = iter_issue_records(
+        github_user, github_repo, concurrent=concurrent, max_workers=max_workers, api_base=api_base, since=since
+    )
+    for record in records:
+        yield _make_issue(*record)
+
+
+def issues_from_subjects_text(subjects_text: str) -> Iterator[Issue]:
+    """
+    Read subjects.txt TSV lines:
+      issue_id<TAB>OPEN/CLOSED<TAB>title<TAB><TAB>created_at
+    """
+    for raw in subjects_text.splitlines():
+        if not raw.strip():
+            continue
+
+        parts = raw.split("\t")
+        if len(parts) < 3:
+            continue
+
+        try:
+            issue_id = int(parts[0].strip())
+        except ValueError:
+            issue_id = None
+
+        # last field is the timestamp in this file
+        yield _make_issue(issue_id, parts[1], parts[2], parts[-1])
+
+
+def issues_to_subjects_text(issues: Iterable[Issue]) -> str:
+    """
+    Write Issue records as subjects.txt TSV (the inverse of issues_from_subjects_text).
+    """
+    lines = [_issue_to_line(*issue) for issue in issues]
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+def build_subjects_text_from_github_api(
+    github_user: str,
+    github_repo: str | None = None,
+    *,
+    concurrent: bool = False,
+    max_workers: int = 8,
+    api_base: str = GITHUB_API,
+) -> str:
+    """
+    Fetch ALL issues from GitHub (excluding PRs) and return a TSV string that matches subjects.txt format:
+        issue_number<TAB>OPEN/CLOSED<TAB>title<TAB><TAB>created_at
+
+    Uses issue.created_at (first submission time), not updated_at.
+    With concurrent=True the remaining pages are fetched in parallel (see iter_issue_records).
+    """
+    records = iter_issue_records(
+        github_user, github_repo, concurrent=concurrent, max_workers=max_workers, api_base=api_base
+    )
+    return issues_to_subjects_text(records)
+
+
+def _issue_to_line(number, state, title, created_at) -> str:
+    state = (state or "").upper()   # OPEN/CLOSED
+    title = title or ""
+    created_at = created_at or ""
+
+    # Match subjects.txt shape: id \t OPEN/CLOSED \t title \t\t created_at
+    return f"{number}\t{state}\t{title}\t\t{created_at}"
+
+# ----------------------------
+# Local issue store (incremental sync)
+# ----------------------------
+
+STORE_FIELDS = ("number", "state", "title", "created_at", "updated_at")
+
+
+def load_issue_store(store_path: str) -> Dict[int, dict]:
+    """
+    Read the append-only JSONL issue store into { issue_number: record }.
+    Later lines win, so an updated issue simply overrides its older record.
+    """
+    issues: Dict[int, dict] = {}
+    if not os.path.exists(store_path):
+        return issues
+    with open(store_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # e.g. a half-written last line from an interrupted run
+            issues[record["number"]] = record
+    return issues
+
+
+def sync_issue_store(
+    github_user: str,
+    github_repo: str,
+    store_path: str,
+    *,
+    concurrent: bool = False,
+    api_base: str = GITHUB_API,
+) -> Dict[int, dict]:
+    """
+    Bring the local issue store up to date and return { issue_number: record }.
+
+    The watermark is the newest updated_at in the store; only issues updated since then
+    are requested (since=<watermark>), and only records that actually changed are appended.
+    The first run (no store yet) downloads everything.
+    """
+    issues = load_issue_store(store_path)
+    update_issue_store(issues, github_user, github_repo, store_path, concurrent=concurrent, api_base=api_base)
+    return issues
+
+
+def update_issue_store(
+    issues: Dict[int, dict],
+    github_user: str,
+    github_repo: str,
+    store_path: str,
+    *,
+    concurrent: bool = False,
+    api_base: str = GITHUB_API,
+) -> List[dict]:
+    """
+    One incremental sync of an already loaded store: fetches the issues updated since its
+    watermark, updates issues in place, appends the changed records to store_path.
+
+    Returns:
+      the changed records (new or different from the stored ones)
+    """
+    watermark = max((r.get("updated_at") or "" for r in issues.values()), default="") or None
+
+    changed = []
+    # The full download (no watermark) is never requested again (later syncs use since=),
+    # so its pages are not worth keeping in the HTTP cache
+    records = iter_issue_records(
+        github_user, github_repo, fields=STORE_FIELDS, concurrent=concurrent, api_base=api_base, since=watermark,
+        cache=HTTP_CACHE if watermark else None,
+    )
+    for values in records:
+        record = dict(zip(STORE_FIELDS, values))
+        if issues.get(record["number"]) != record:
+            issues[record["number"]] = record
+            changed.append(record)
+
+    if changed:
+        with open(store_path, "a", encoding="utf-8") as f:
+            for record in changed:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    return changed
+
+
+def issues_from_store(issues: Dict[int, dict]) -> List[Issue]:
+    """
+    Issue records from the store, in the API order (newest issue first).
+    """
+    return [_issue_from_record(issues[n]) for n in sorted(issues, reverse=True)]
+
+
+def _issue_from_record(r: dict) -> Issue:
+    return _make_issue(r.get("number"), r.get("state"), r.get("title"), r.get("created_at"))
+
+
+def subjects_text_from_issue_store(issues: Dict[int, dict]) -> str:
+    """
+    Same TSV as build_subjects_text_from_github_api, in the API order (newest issue first).
+    """
+    return issues_to_subjects_text(issues_from_store(issues))
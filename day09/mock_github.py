@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+
+'''
+Local stand-in for GitHub, for offline tests and benchmarks of the day09 pipeline.
+
+  make_synthetic_course(n_students, n_assignments, n_issues) -> a course with a README
+      (students table + "Assignment (day N)" deadlines) and issues with messy titles
+  MockGitHub(course) -> a local HTTP server with the two endpoints the report uses:
+      GET /<user>/<repo>/<branch>/README.md            (raw.githubusercontent.com)
+      GET /repos/<user>/<repo>/issues?state=all&per_page=..&page=..&since=..  (api.github.com)
+    with GitHub-like Link (rel="next" / rel="last") headers, ETags / 304 answers,
+    keep-alive connections and a fixed per-request latency.
+
+Serve a synthetic course (point raw_base / api_base at the printed URL):
+    python mock_github.py --students 60 --assignments 12 --issues 5000
+'''
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, NamedTuple, Optional, Set
+from urllib.parse import urlparse, parse_qs
+
+# Title formats seen in real courses, including the messy ones
+TITLE_FORMATS = [
+    "Day{d:02d} by {n}",
+    "Day {d} - {n}",
+    "day{d}: {n}",
+    "Day{d:02d} {n}",
+    "DAY {d} by {n_lower}",
+    "Assignment (day {d}): {n}",
+    "Assignment {d} - {n}",
+    "Assignment {d} by {n}",
+    "{n} - day {d}",
+    "{n} - Day{d:02d} (fixed)",
+    "Re: Day{d:02d} by {n}",
+    "Day{d:02d} by {n_first}",
+    "Final project proposal by {n}",
+    "{n}",
+    "homework {d}",
+]
+
+
+class SyntheticCourse(NamedTuple):
+    readme: str
+    roster: List[str]
+    deadlines: Dict[str, str]
+    issues: List[dict]
+
+
+def make_synthetic_course(
+    n_students: int = 60,
+    n_assignments: int = 12,
+    n_issues: int = 2000,
+    *,
+    seed: int = 0,
+    pr_share: float = 0.02,
+) -> SyntheticCourse:
+    """
+    A reproducible course: n_students in the README roster, n_assignments weekly deadlines
+    and n_issues issues (newest first, like the API), some of them pull requests.
+    Titles use TITLE_FORMATS; a few name unknown students or no assignment at all.
+    """
+    rnd = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    word = lambda: "".join(rnd.choice(letters) for _ in range(rnd.randint(3, 9))).title()
+
+    roster = []
+    while len(roster) < n_students:
+        name = f"{word()} {word()}"
+        if name not in roster:
+            roster.append(name)
+
+    first_deadline = datetime(2025, 10, 25, 22, 0, tzinfo=timezone.utc)
+    deadlines = {}
+    lines = ["# Synthetic Python course", "", "## Students", "", "| Name | GitHub |", "| --- | --- |"]
+    lines += [f"| [{name}](https://github.com/{name.split()[0].lower()}) | {name.split()[0].lower()} |" for name in roster]
+    lines += ["", "## Assignments", ""]
+    for d in range(1, n_assignments + 1):
+        deadline = first_deadline + timedelta(weeks=d)
+        deadlines[f"Day{d:02d}"] = deadline.strftime("%Y-%m-%dT%H:%M:%SZ")
+        lines += [f"### Assignment (day {d})", "", "Some text about the assignment.", "",
+                  f"* Dead-line: {deadline:%Y.%m.%d %H:%M} (Saturday)", ""]
+    readme = "\n".join(lines)
+
+    issues = []
+    for number in range(1, n_issues + 1):
+        name = rnd.choice(roster) if rnd.random() < 0.97 else f"{word()} {word()}"
+        d = rnd.randint(1, n_assignments)
+        title = rnd.choice(TITLE_FORMATS).format(d=d, n=name, n_lower=name.lower(), n_first=name.split()[0])
+        # around the deadline: mostly in the last days before it, some late
+        offset = -rnd.expovariate(1 / (2 * 86400)) + (rnd.uniform(0, 3 * 86400) if rnd.random() < 0.15 else 0)
+        created = first_deadline + timedelta(weeks=d, seconds=int(offset))
+        updated = created + timedelta(seconds=rnd.randint(0, 86400))
+        issue = {
+            "number": number,
+            "state": "closed" if rnd.random() < 0.7 else "open",
+            "title": title,
+            "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "updated_at": updated.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "body": "x" * rnd.randint(0, 400),
+        }
+        if rnd.random() < pr_share:
+            issue["pull_request"] = {"url": f"https://api.github.com/repos/x/y/pulls/{number}"}
+        issues.append(issue)
+    issues.reverse()  # newest first, like the API
+    return SyntheticCourse(readme, roster, deadlines, issues)
+
+
+class MockGitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body are separate writes
+
+    def setup(self):
+        with self.server.mock.lock:
+            self.server.mock.connections += 1
+        super().setup()
+
+    def do_GET(self):
+        mock: "MockGitHub" = self.server.mock
+        parts = urlparse(self.path)
+        with mock.lock:
+            mock.requests += 1
+            mock.paths.append(self.path)
+            failing = mock.fail_next > 0
+            if failing:
+                mock.fail_next -= 1
+        time.sleep(mock.latency)
+
+        segments = parts.path.split("/")
+        if failing:
+            return self.send_body(b'{"message": "Server Error"}', "application/json", status=502)
+        if parts.path.endswith("/README.md") and "/".join(segments[1:3]) not in mock.missing_repos:
+            return self.send_body(mock.course.readme.encode("utf-8"), "text/plain; charset=utf-8")
+        if (parts.path.startswith("/repos/") and parts.path.endswith("/issues")
+                and "/".join(segments[2:4]) not in mock.missing_repos):
+            return self.issues(parts)
+        self.send_body(b'{"message": "Not Found"}', "application/json", status=404)
+
+    def issues(self, parts):
+        mock: "MockGitHub" = self.server.mock
+        query = parse_qs(parts.query)
+        page = int(query.get("page", ["1"])[0])
+        per_page = min(int(query.get("per_page", ["30"])[0]), mock.max_per_page)
+        since = query.get("since", [""])[0]
+
+        matching = [i for i in mock.course.issues if i["updated_at"] >= since] if since else mock.course.issues
+        pages = max(1, -(-len(matching) // per_page))
+        body = json.dumps(matching[(page - 1) * per_page: page * per_page]).encode("utf-8")
+
+        base = f"http://{self.headers['Host']}{parts.path}?state=all&per_page={per_page}"
+        if since:
+            base += f"&since={since}"
+        links = []
+        if page < pages:
+            links.append(f'<{base}&page={page + 1}>; rel="next"')
+            links.append(f'<{base}&page={pages}>; rel="last"')
+        if page > 1:
+            links.append(f'<{base}&page=1>; rel="first"')
+            links.append(f'<{base}&page={page - 1}>; rel="prev"')
+        self.send_body(body, "application/json", links=links)
+
+    def send_body(self, body: bytes, content_type: str, *, status: int = 200, links: Optional[List[str]] = None):
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            with self.server.mock.lock:
+                self.server.mock.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("X-RateLimit-Remaining", "4999")
+        if links:
+            self.send_header("Link", ", ".join(links))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class MockGitHub:
+    """
+    The mock server, in a background thread. Use as a context manager:
+
+        with MockGitHub(make_synthetic_course(60, 12, 5000), latency=0.02) as gh:
+            fetch_course(CourseRepo("org", "course"), raw_base=gh.url, api_base=gh.url)
+
+    requests / not_modified / connections count the requests served, the 304 answers and the
+    connections opened; paths lists the requested paths. course can be replaced (or its issues
+    changed) while the server runs, and so can the knobs for tests:
+      latency       seconds added to every request
+      max_per_page  page size cap of /issues (GitHub: 100)
+      fail_next     the next n requests answer 502
+      missing_repos "user/repo" names answering 404 (README and issues)
+    """
+
+    def __init__(
+        self,
+        course: SyntheticCourse,
+        *,
+        latency: float = 0.0,
+        max_per_page: int = 100,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.course = course
+        self.latency = latency
+        self.max_per_page = max_per_page
+        self.fail_next = 0
+        self.missing_repos: Set[str] = set()
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.not_modified = 0
+        self.connections = 0
+        self.paths: List[str] = []
+        self._server = ThreadingHTTPServer((host, port), MockGitHubHandler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockGitHub":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockGitHub":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic course as a local GitHub stand-in")
+    parser.add_argument("--students", type=int, default=60)
+    parser.add_argument("--assignments", type=int, default=12)
+    parser.add_argument("--issues", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every request")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    course = make_synthetic_course(args.students, args.assignments, args.issues, seed=args.seed)
+    gh = MockGitHub(course, latency=args.latency, port=args.port)
+    print(f"Serving {len(course.roster)} students, {len(course.deadlines)} assignments, "
+          f"{len(course.issues)} issues at {gh.url} (raw_base = api_base)")
+    try:
+        gh._server.serve_forever()
+    except KeyboardInterrupt:
+        gh.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1012 @@
+'''
+Deadline deltas, single-pass aggregation, the columnar model, the report tables and the figures.
+'''
+
+import bisect
+import multiprocessing
+import os
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Tuple, Optional, Any, Iterable, NamedTuple
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+# ----------------------------
+# Helpers
+# ----------------------------
+def parse_z_iso(ts: str) -> Optional[datetime]:
+    if not ts:
+        return None
+    ts = ts.strip()
+    # Handle trailing Z
+    if ts.endswith("Z"):
+        ts = ts[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(ts).astimezone(timezone.utc)
+    except ValueError:
+        return None
+
+# Same parser (the plotting code used to have its own copy)
+_parse_iso_z = parse_z_iso
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Only the deadlines go through the cache: they repeat on every run (and in watch mode on
+# every tick), while the issue times are mostly distinct and are read in batches
+# (_epoch_us_array) instead
+TIMESTAMP_CACHE_SIZE = 1 << 10
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _iso_z_to_epoch_us(ts: str) -> Optional[int]:
+    """
+    Cached: ISO deadline timestamp -> integer microseconds since the epoch (None if unparsable).
+    Integer microseconds keep the deltas exact, like datetime subtraction.
+    """
+    dt = parse_z_iso(ts)
+    if dt is None:
+        return None
+    return (dt - _EPOCH) // timedelta(microseconds=1)
+
+
+_NAT_US = np.iinfo(np.int64).min
+
+
+def _epoch_us_array(values: List[str]) -> np.ndarray:
+    """
+    ISO timestamps -> int64 epoch microseconds (_NAT_US where unparsable), in one NumPy cast:
+    the usual '...Z' strings are read as datetime64[us]; the others (UTC offsets, bad values)
+    go through parse_z_iso one by one.
+    """
+    values = [v if isinstance(v, str) else "" for v in values]
+    zulu = [v[:-1] if v.endswith("Z") else "NaT" for v in values]
+    try:
+        us = np.array(zulu, dtype="datetime64[us]").view(np.int64)
+    except ValueError:
+        # a malformed '...Z' string: those are read one by one as well
+        us = np.full(len(values), _NAT_US, dtype=np.int64)
+        zulu = ["NaT"] * len(values)
+    for i, (v, z) in enumerate(zip(values, zulu)):
+        if z == "NaT" and v:
+            dt = parse_z_iso(v)
+            if dt is not None:
+                us[i] = (dt - _EPOCH) // timedelta(microseconds=1)
+    return us
+
+
+def epoch_us_to_datetime(us: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=us)
+
+
+def timestamp_cache_info() -> Dict[str, Any]:
+    """
+    Statistics of the deadline timestamp cache: hits, misses, size, maxsize, hit_rate.
+    """
+    info = _iso_z_to_epoch_us.cache_info()
+    calls = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hit_rate": info.hits / calls if calls else 0.0,
+    }
+
+
+def build_deadline_epochs(deadlines: Dict[str, str]) -> Dict[str, Optional[int]]:
+    """
+    Per-assignment deadline table { 'Day01': epoch microseconds or None }, built once from
+    the parse_readme deadlines and passed to add_deadline_deltas(deadline_epochs=...).
+    """
+    return {a: (_iso_z_to_epoch_us(d) if d else None) for a, d in deadlines.items()}
+
+
+def local_time_histogram(epoch_us: Iterable[int], tz_name: str = "Asia/Jerusalem") -> np.ndarray:
+    """
+    Weekday x hour counts of epoch-microsecond times in tz_name, as a 7x24 int64 array
+    (rows Mon=0..Sun=6, columns hours 0..23). The whole array is converted to the zone in
+    one tz_convert call; sum(axis=1) gives the weekday counts, sum(axis=0) the hour counts.
+    """
+    us = np.asarray(epoch_us if isinstance(epoch_us, np.ndarray) else list(epoch_us), dtype=np.int64)
+    local = pd.DatetimeIndex(pd.to_datetime(us, unit="us", utc=True)).tz_convert(tz_name)
+    cells = np.asarray(local.dayofweek, dtype=np.int64) * 24 + np.asarray(local.hour, dtype=np.int64)
+    return np.bincount(cells, minlength=7 * 24).reshape(7, 24)
+
+
+def format_delta(delta_us: Optional[int]) -> Optional[str]:
+    """
+    Human-readable delta like str(timedelta): '-2 days, 03:10:00' (from microseconds).
+    """
+    if delta_us is None:
+        return None
+    return str(timedelta(microseconds=int(delta_us)))
+
+
+def add_deadline_deltas(
+    submissions: Dict[str, Dict[str, dict]],
+    deadlines: Dict[str, str],
+    *,
+    delta_key: Optional[str] = None,
+    seconds_key: str = "delta_seconds",
+    deadline_epochs: Optional[Dict[str, Optional[int]]] = None,
+) -> Dict[str, Dict[str, dict]]:
+    """
+    Compute (submission_time - deadline_time) for each (student, assignment) and add:
+      - submissions[student][assignment][seconds_key] -> signed seconds (negative => early, positive => late)
+      - submissions[student][assignment][delta_key]   -> human string like '-2 days, 03:10:00',
+        only when a delta_key is given (format_delta builds one on demand)
+
+    Expects:
+      - deadlines values like: '2025-11-01T22:00:00Z'
+      - submissions[...][...]['time'] like: '2026-01-03T18:44:38Z'
+
+    Batch computation: all submission times are converted to epoch microseconds in one
+    NumPy cast, and the deltas come from one array subtraction against the deadline epochs
+    (deadline_epochs from build_deadline_epochs skips re-parsing the deadlines).
+
+    Modifies submissions in-place and also returns it.
+    """
+    deadline_us = deadline_epochs if deadline_epochs is not None else build_deadline_epochs(deadlines)
+
+    batch: List[dict] = []
+    batch_deadlines: List[int] = []
+    for student, per_student in submissions.items():
+        for assignment, entry in per_student.items():
+            # skip the synthetic key used for repeats, if present
+            if assignment.startswith("_"):
+                continue
+
+            dl_us = deadline_us.get(assignment)
+            # If you kept multiple submissions in "_all", compute deltas for them too
+            entries = entry["_all"] if isinstance(entry.get("_all"), list) else [entry]
+            if dl_us is None:
+                for e in entries:
+                    e[seconds_key] = None
+                    if delta_key is not None:
+                        e[delta_key] = None
+                continue
+            batch.extend(entries)
+            batch_deadlines.extend([dl_us] * len(entries))
+
+    sub_us = _epoch_us_array([e.get("time") for e in batch])
+    valid = sub_us != _NAT_US
+    delta_us = sub_us - np.array(batch_deadlines, dtype=np.int64)
+    # int(timedelta.total_seconds()) truncates towards zero
+    delta_s = np.where(delta_us >= 0, delta_us // 1_000_000, -(-delta_us // 1_000_000))
+    seconds = np.where(valid, delta_s, 0).tolist()
+
+    if delta_key is None:
+        for e, ok, d_s in zip(batch, valid.tolist(), seconds):
+            e[seconds_key] = d_s if ok else None
+    else:
+        for e, ok, d_s, d_us in zip(batch, valid.tolist(), seconds, delta_us.tolist()):
+            e[seconds_key] = d_s if ok else None
+            e[delta_key] = format_delta(d_us) if ok else None
+
+    return submissions
+
+# ----------------------------
+# 3) Single-pass aggregation for all tables and plots
+# ----------------------------
+
+class DeadlineIndex:
+    """
+    Per assignment, the deadline deltas (submission - deadline, seconds) of the latest
+    submissions of the roster students, kept sorted; i.e. the submission times on an axis
+    where the assignment's deadline is 0. Counting the submissions in any time window is
+    two binary searches instead of a scan over the submissions:
+
+      on_time_late(a)           -> (delta <= 0, delta > 0) counts
+      count_between(a, lo, hi)  -> lo <= delta <= hi (seconds)
+      submitted_within(a, h)    -> in the last h hours before the deadline
+      late_within(a, h)         -> at most h hours late
+      window_counts(a, hours)   -> submitted_within for many windows at once (np.searchsorted)
+
+    Kept up to date with add / remove (bisect.insort), e.g. in watch mode. Cells without a
+    delta are not in the time axis but still count towards unchecked(a).
+    """
+
+    def __init__(self):
+        self._deltas: Dict[str, List[int]] = defaultdict(list)
+        self._unchecked: Counter = Counter()
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def add(self, assignment: str, delta_seconds: Optional[int], unchecked: bool) -> None:
+        if delta_seconds is not None:
+            bisect.insort(self._deltas[assignment], delta_seconds)
+            self._arrays.pop(assignment, None)
+        if unchecked:
+            self._unchecked[assignment] += 1
+
+    def remove(self, assignment: str, delta_seconds: Optional[int], unchecked: bool) -> None:
+        if delta_seconds is not None:
+            deltas = self._deltas[assignment]
+            del deltas[bisect.bisect_left(deltas, delta_seconds)]
+            self._arrays.pop(assignment, None)
+        if unchecked:
+            self._unchecked[assignment] -= 1
+
+    def deltas(self, assignment: str) -> np.ndarray:
+        """
+        Returns:
+          the sorted deltas of the assignment (int64 seconds, read-only)
+        """
+        if assignment not in self._arrays:
+            array = np.array(self._deltas.get(assignment, ()), dtype=np.int64)
+            array.flags.writeable = False
+            self._arrays[assignment] = array
+        return self._arrays[assignment]
+
+    def on_time_late(self, assignment: str) -> Tuple[int, int]:
+        deltas = self._deltas.get(assignment, [])
+        on_time = bisect.bisect_right(deltas, 0)
+        return on_time, len(deltas) - on_time
+
+    def unchecked(self, assignment: str) -> int:
+        return self._unchecked[assignment]
+
+    def count_between(self, assignment: str, lo: Optional[float] = None, hi: Optional[float] = None) -> int:
+        deltas = self._deltas.get(assignment, [])
+        start = bisect.bisect_left(deltas, lo) if lo is not None else 0
+        end = bisect.bisect_right(deltas, hi) if hi is not None else len(deltas)
+        return max(end - start, 0)
+
+    def submitted_within(self, assignment: str, hours: float) -> int:
+        return self.count_between(assignment, -hours * 3600, 0)
+
+    def late_within(self, assignment: str, hours: float) -> int:
+        deltas = self._deltas.get(assignment, [])
+        return bisect.bisect_right(deltas, hours * 3600) - bisect.bisect_right(deltas, 0)
+
+    def window_counts(self, assignment: str, hours: Iterable[float]) -> np.ndarray:
+        """
+        Returns:
+          submitted_within(assignment, h) for every h in hours, as an int64 array
+        """
+        deltas = self.deltas(assignment)
+        starts = -np.asarray(list(hours), dtype=np.float64) * 3600
+        on_time = np.searchsorted(deltas, 0, side="right")
+        return (on_time - np.searchsorted(deltas, starts, side="left")).clip(min=0).astype(np.int64)
+
+
+class ReportAggregates:
+    """
+    Everything the report tables and plots need, collected in ONE pass over submissions
+    (see aggregate_submissions), so the report touches each submission once.
+
+      cell_status[(student, assignment)]  -> 'On-time' / 'Late' / 'Missing' (latest entry)
+      cell_unchecked[(student, assignment)] -> True if the latest issue is not CLOSED
+      assignment_counts[assignment] -> (on_time, late, missing, unchecked) over the roster
+      format_counts[assignment][format] -> count of every issue (repeats included)
+      student_delta_sum / student_delta_count[student] -> sum / count of (deadline - submission) hours
+      student_formats[student] -> formats used (entries with a delta only)
+      on_time_times -> submission times of the on-time latest entries (any student)
+      deadline_index -> DeadlineIndex of the roster students' cells (when roster is given);
+                        assignment_counts are then read from it instead of a roster scan
+    """
+
+    def __init__(
+        self,
+        *,
+        roster: Optional[Iterable[str]] = None,
+        delta_seconds_key: str = "delta_seconds",
+        status_key: str = "status",
+        format_key: str = "format",
+        time_key: str = "time",
+    ):
+        self.delta_seconds_key = delta_seconds_key
+        self.status_key = status_key
+        self.format_key = format_key
+        self.time_key = time_key
+        self.cell_status: Dict[Tuple[str, str], str] = {}
+        self.cell_unchecked: Dict[Tuple[str, str], bool] = {}
+        self.assignment_counts: Dict[str, Tuple[int, int, int, int]] = {}
+        self.format_counts: Dict[str, Counter] = defaultdict(Counter)
+        self.student_delta_sum: Dict[str, float] = defaultdict(float)
+        self.student_delta_count: Dict[str, int] = defaultdict(int)
+        self.student_formats: Dict[str, set] = defaultdict(set)
+        self.on_time_times: List[str] = []
+        self._local_time_histograms: Dict[str, np.ndarray] = {}
+        self._roster = set(roster) if roster is not None else None
+        self.deadline_index = DeadlineIndex() if roster is not None else None
+
+    @staticmethod
+    def _entries(entry: dict) -> List[dict]:
+        return entry.get("_all") if isinstance(entry.get("_all"), list) else [entry]
+
+    def add_cell(self, student: str, assignment: str, entry: dict, *, habits: bool) -> None:
+        """
+        Adds one (student, assignment) entry (and its repeats); habits=True also adds its
+        deltas / formats to the student's habits (roster students only).
+        """
+        entries = self._entries(entry)
+
+        # Every issue counts towards format popularity
+        fmt_counter = self.format_counts[assignment]
+        for e in entries:
+            fmt_counter[(e.get(self.format_key) or "Other").strip() or "Other"] += 1
+
+        # skip the synthetic key used for repeats, if present
+        if assignment.startswith("_"):
+            return
+
+        # Latest entry: status cell + on-time times
+        if entry:
+            ds = entry.get(self.delta_seconds_key, None)
+            if ds is None:
+                status = "Missing"
+            elif ds > 0:
+                status = "Late"
+            else:
+                status = "On-time"
+                self.on_time_times.append(entry.get(self.time_key, ""))
+                self._local_time_histograms.clear()
+            unchecked = (entry.get(self.status_key) or "").upper() != "CLOSED"
+            self.cell_status[(student, assignment)] = status
+            self.cell_unchecked[(student, assignment)] = unchecked
+            if self.deadline_index is not None and student in self._roster:
+                self.deadline_index.add(assignment, ds, unchecked)
+
+        # Habits: every issue with a delta
+        if habits:
+            for e in entries:
+                ds = e.get(self.delta_seconds_key, None)
+                if ds is None:
+                    continue
+                # user wants: deadline - submission, but ds is (submission - deadline)
+                self.student_delta_sum[student] += (-ds) / 3600.0
+                self.student_delta_count[student] += 1
+                fmt = (e.get(self.format_key) or "").strip()
+                if fmt:
+                    self.student_formats[student].add(fmt)
+
+    def remove_cell(self, student: str, assignment: str, entry: dict) -> None:
+        """
+        Undoes add_cell for the entry (not the habits: see recount_student).
+        """
+        fmt_counter = self.format_counts[assignment]
+        for e in self._entries(entry):
+            fmt = (e.get(self.format_key) or "Other").strip() or "Other"
+            fmt_counter[fmt] -= 1
+            if fmt_counter[fmt] <= 0:
+                del fmt_counter[fmt]
+
+        status = self.cell_status.pop((student, assignment), None)
+        unchecked = self.cell_unchecked.pop((student, assignment), None)
+        if status == "On-time":
+            self.on_time_times.remove(entry.get(self.time_key, ""))
+            self._local_time_histograms.clear()
+        if status is not None and self.deadline_index is not None and student in self._roster:
+            self.deadline_index.remove(assignment, entry.get(self.delta_seconds_key, None), unchecked)
+
+    def recount_student(self, student: str, per_student: Dict[str, dict]) -> None:
+        """
+        Recomputes the habits of one roster student from all of their entries.
+        """
+        self.student_delta_sum.pop(student, None)
+        self.student_delta_count.pop(student, None)
+        self.student_formats.pop(student, None)
+        for assignment, entry in per_student.items():
+            if isinstance(entry, dict) and not assignment.startswith("_"):
+                for e in self._entries(entry):
+                    ds = e.get(self.delta_seconds_key, None)
+                    if ds is None:
+                        continue
+                    self.student_delta_sum[student] += (-ds) / 3600.0
+                    self.student_delta_count[student] += 1
+                    fmt = (e.get(self.format_key) or "").strip()
+                    if fmt:
+                        self.student_formats[student].add(fmt)
+
+    def count_assignment(self, assignment: str, roster: List[str]) -> None:
+        """
+        (on_time, late, missing, unchecked) of one assignment over the roster (cells only).
+        With a deadline_index (built for this roster): O(log n) lookups, no roster scan.
+        """
+        if self.deadline_index is not None:
+            on_time, late = self.deadline_index.on_time_late(assignment)
+            unchecked = self.deadline_index.unchecked(assignment)
+            self.assignment_counts[assignment] = (on_time, late, len(roster) - on_time - late, unchecked)
+            return
+        on_time = late = missing = unchecked = 0
+        for student in roster:
+            key = (student, assignment)
+            status = self.cell_status.get(key)
+            if status is None:
+                missing += 1
+                continue
+            if status == "On-time":
+                on_time += 1
+            elif status == "Late":
+                late += 1
+            else:
+                missing += 1
+            if self.cell_unchecked[key]:
+                unchecked += 1
+        self.assignment_counts[assignment] = (on_time, late, missing, unchecked)
+
+    def status(self, student: str, assignment: str) -> str:
+        return self.cell_status.get((student, assignment), "Missing")
+
+    def local_time_histogram(self, tz_name: str = "Asia/Jerusalem") -> np.ndarray:
+        """
+        7x24 weekday x hour counts of the on-time submissions in tz_name (Mon=0..Sun=6).
+        Computed on first use and kept per time zone.
+        """
+        if tz_name not in self._local_time_histograms:
+            epochs = _epoch_us_array(self.on_time_times)
+            epochs = epochs[epochs != _NAT_US]
+            self._local_time_histograms[tz_name] = local_time_histogram(epochs, tz_name)
+        return self._local_time_histograms[tz_name]
+
+    def local_time_counts(self, tz_name: str = "Asia/Jerusalem") -> Tuple[Counter, Counter]:
+        """
+        (weekday_counts, hour_counts) of the on-time submissions in tz_name (Mon=0..Sun=6).
+        """
+        histogram = self.local_time_histogram(tz_name)
+        weekday_counts = Counter({d: int(n) for d, n in enumerate(histogram.sum(axis=1)) if n})
+        hour_counts = Counter({h: int(n) for h, n in enumerate(histogram.sum(axis=0)) if n})
+        return weekday_counts, hour_counts
+
+
+def aggregate_submissions(
+    submissions: Dict[str, Dict[str, dict]],
+    roster: List[str],
+    assignment_names: List[str],
+    *,
+    delta_seconds_key: str = "delta_seconds",
+    status_key: str = "status",
+    format_key: str = "format",
+    time_key: str = "time",
+) -> ReportAggregates:
+    """
+    One pass over submissions (and over each '_all' list) filling a ReportAggregates.
+    Pass the result as aggregates= to the table and plot functions below.
+    """
+    agg = ReportAggregates(
+        roster=roster,
+        delta_seconds_key=delta_seconds_key, status_key=status_key, format_key=format_key, time_key=time_key,
+    )
+    roster_set = set(roster)
+
+    for student, per_student in submissions.items():
+        in_roster = student in roster_set
+
+        for assignment, entry in per_student.items():
+            if not isinstance(entry, dict):
+                continue
+            agg.add_cell(student, assignment, entry, habits=in_roster)
+
+    # Per-assignment counts over the roster (cells only, no second pass over submissions)
+    for a in assignment_names:
+        agg.count_assignment(a, roster)
+
+    return agg
+
+
+# ----------------------------
+# 3b) Columnar (NumPy) submissions model
+# ----------------------------
+
+class SubmissionColumns:
+    """
+    Submissions as NumPy columns, one row per issue (repeats included):
+
+      student, assignment, format, status : int32 codes into student_names / assignment_names /
+                                            format_names / status_names
+      issue_id      : int64 (-1 when unknown)
+      time          : datetime64[us] submission time (NaT when unparsable)
+      delta_seconds : int64 submission - deadline, valid where has_delta
+      time_strings, delta_strings : the original 'time' / 'delta_to_deadline' values
+      is_latest     : the row is the latest issue of its (student, assignment)
+
+    A compact store of the submissions (to_dict() rebuilds the nested dict exactly), with the
+    on-time / late masks for ad-hoc NumPy queries. The report's counts and means come from
+    ReportAggregates, which the tables, plots and watch mode share.
+    """
+
+    def __init__(self):
+        self.student_names: List[str] = []
+        self.assignment_names: List[str] = []
+        self.format_names: List[str] = []
+        self.status_names: List[str] = []
+        self.student = np.zeros(0, dtype=np.int32)
+        self.assignment = np.zeros(0, dtype=np.int32)
+        self.format = np.zeros(0, dtype=np.int32)
+        self.status = np.zeros(0, dtype=np.int32)
+        self.issue_id = np.zeros(0, dtype=np.int64)
+        self.time = np.zeros(0, dtype="datetime64[us]")
+        self.delta_seconds = np.zeros(0, dtype=np.int64)
+        self.time_strings: List[str] = []
+        self.delta_strings: List[Optional[str]] = []
+        self.has_delta = np.zeros(0, dtype=bool)
+        self.is_latest = np.zeros(0, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.student)
+
+    @classmethod
+    def from_dict(
+        cls,
+        submissions: Dict[str, Dict[str, dict]],
+        *,
+        delta_seconds_key: str = "delta_seconds",
+        status_key: str = "status",
+        format_key: str = "format",
+        time_key: str = "time",
+        delta_key: str = "delta_to_deadline",
+    ) -> "SubmissionColumns":
+        cols = cls()
+        codes: Dict[str, Dict[str, int]] = {"student": {}, "assignment": {}, "format": {}, "status": {}}
+        names = {
+            "student": cols.student_names,
+            "assignment": cols.assignment_names,
+            "format": cols.format_names,
+            "status": cols.status_names,
+        }
+
+        def code(kind: str, value: str) -> int:
+            table = codes[kind]
+            c = table.get(value)
+            if c is None:
+                c = table[value] = len(table)
+                names[kind].append(value)
+            return c
+
+        rows = defaultdict(list)
+        for student, per_student in submissions.items():
+            for assignment, entry in per_student.items():
+                if not isinstance(entry, dict) or assignment.startswith("_"):
+                    continue
+                entries = entry.get("_all") if isinstance(entry.get("_all"), list) else [entry]
+                for e in entries:
+                    ds = e.get(delta_seconds_key, None)
+                    issue_id = e.get("issue_id")
+                    rows["student"].append(code("student", student))
+                    rows["assignment"].append(code("assignment", assignment))
+                    rows["format"].append(code("format", e.get(format_key) or ""))
+                    rows["status"].append(code("status", (e.get(status_key) or "").upper()))
+                    rows["issue_id"].append(issue_id if isinstance(issue_id, int) else -1)
+                    cols.time_strings.append(e.get(time_key) or "")
+                    cols.delta_strings.append(e.get(delta_key) if ds is not None else None)
+                    rows["delta_seconds"].append(0 if ds is None else ds)
+                    rows["has_delta"].append(ds is not None)
+                    rows["is_latest"].append(e is entry)
+
+        cols.student = np.array(rows["student"], dtype=np.int32)
+        cols.assignment = np.array(rows["assignment"], dtype=np.int32)
+        cols.format = np.array(rows["format"], dtype=np.int32)
+        cols.status = np.array(rows["status"], dtype=np.int32)
+        cols.issue_id = np.array(rows["issue_id"], dtype=np.int64)
+        cols.time = _to_datetime64_us(cols.time_strings)
+        cols.delta_seconds = np.array(rows["delta_seconds"], dtype=np.int64)
+        cols.has_delta = np.array(rows["has_delta"], dtype=bool)
+        cols.is_latest = np.array(rows["is_latest"], dtype=bool)
+        return cols
+
+    def to_dict(self) -> Dict[str, Dict[str, dict]]:
+        """
+        The nested dict view: data[student][assignment] = latest entry (+ '_all' for repeats),
+        with the original 'time' strings; the 'delta_to_deadline' string is built here from
+        delta_seconds when the source entry did not have one.
+        """
+        groups: Dict[Tuple[int, int], List[dict]] = {}
+        latest: Dict[Tuple[int, int], dict] = {}
+        for i in range(len(self)):
+            has_delta = bool(self.has_delta[i])
+            ds = int(self.delta_seconds[i]) if has_delta else None
+            issue_id = int(self.issue_id[i])
+            entry = {
+                "status": self.status_names[self.status[i]],
+                "time": self.time_strings[i],
+                "format": self.format_names[self.format[i]],
+                "issue_id": issue_id if issue_id >= 0 else None,
+                "delta_seconds": ds,
+                "delta_to_deadline": (self.delta_strings[i] or format_delta(ds * 1_000_000)) if has_delta else None,
+            }
+            key = (int(self.student[i]), int(self.assignment[i]))
+            groups.setdefault(key, []).append(entry)
+            if self.is_latest[i]:
+                latest[key] = entry
+
+        data: Dict[str, Dict[str, dict]] = defaultdict(dict)
+        for key, entries in groups.items():
+            entry = latest.get(key, entries[-1])
+            if len(entries) > 1:
+                entry["_all"] = entries
+            data[self.student_names[key[0]]][self.assignment_names[key[1]]] = entry
+        return dict(data)
+
+    # ---- on-time / late classification ----
+
+    def on_time_mask(self) -> np.ndarray:
+        return self.has_delta & (self.delta_seconds <= 0)
+
+    def late_mask(self) -> np.ndarray:
+        return self.has_delta & (self.delta_seconds > 0)
+
+
+def _to_datetime64_us(values: List[str]) -> np.ndarray:
+    # Read like the deltas (_epoch_us_array: offsets, fractions); _NAT_US is NaT
+    return _epoch_us_array(values).view("datetime64[us]")
+
+
+def _assignment_sort_key(a: str):
+    # Sort Day01, Day02, ... nicely; otherwise keep at end
+    m = re.match(r"(?i)^day(\d{1,2})$", a.strip())
+    return (0, int(m.group(1))) if m else (1, a.casefold())
+
+
+def make_submissions_status_table(
+    roster: List[str],
+    assignment_names: List[str],
+    submissions: Dict[str, Dict[str, dict]],
+    *,
+    delta_seconds_key: str = "delta_seconds",
+    aggregates: Optional[ReportAggregates] = None,
+) -> Tuple[List[str], List[List[Any]]]:
+    """
+    Build a table:
+      Rows: one per student in roster
+      Columns: Name, one per assignment, Total Late, Total Missing
+      Cell values (assignments): 'On-time' / 'Late' / 'Missing'
+
+    Rule:
+      - Missing: no submission entry for that (student, assignment)
+      - Late: submission[delta_seconds] > 0
+      - On-time: submission[delta_seconds] <= 0
+        (If delta_seconds missing/None, this function falls back to Missing.)
+    """
+    if aggregates is None:
+        aggregates = aggregate_submissions(submissions, roster, [], delta_seconds_key=delta_seconds_key)
+
+    assignments = sorted(list(assignment_names), key=_assignment_sort_key)
+
+    header = ["Student"] + assignments + ["Total Late", "Total Missing"]
+    rows: List[List[Any]] = []
+
+    for student in roster:
+        statuses = [aggregates.status(student, a) for a in assignments]
+        rows.append([student] + statuses + [statuses.count("Late"), statuses.count("Missing")])
+
+    return header, rows
+
+def print_per_assignment_summary(
+    roster: List[str],
+    assignment_names: List[str],
+    submissions: Dict[str, Dict[str, dict]],
+    *,
+    delta_seconds_key: str = "delta_seconds",
+    status_key: str = "status",
+    aggregates: Optional[ReportAggregates] = None,
+) -> None:
+    """
+    For each assignment, prints:
+      Day01: 12 on-time, 3 late, 5 missing (2 unchecked issues)
+
+    Definitions:
+      - on-time: has entry and delta_seconds <= 0
+      - late: has entry and delta_seconds > 0
+      - missing: no entry for that student+assignment OR delta_seconds is None
+      - unchecked issues: entry exists but status != 'CLOSED'
+
+    The counts come from the aggregates' DeadlineIndex (binary searches per assignment).
+    """
+    if aggregates is None or aggregates.deadline_index is None:
+        aggregates = aggregate_submissions(
+            submissions, roster, assignment_names, delta_seconds_key=delta_seconds_key, status_key=status_key
+        )
+    for a in assignment_names:
+        if a not in aggregates.assignment_counts:
+            aggregates.count_assignment(a, roster)
+
+    # stable order: as given
+    assignment_summary = {a: aggregates.assignment_counts[a] for a in assignment_names}
+
+    return assignment_summary
+
+
+DEADLINE_WINDOW_HOURS = (1, 6, 24)
+
+
+def make_deadline_window_table(
+    roster: List[str],
+    assignment_names: List[str],
+    submissions: Dict[str, Dict[str, dict]],
+    *,
+    hours: Iterable[float] = DEADLINE_WINDOW_HOURS,
+    delta_seconds_key: str = "delta_seconds",
+    aggregates: Optional[ReportAggregates] = None,
+) -> Tuple[List[str], List[List[Any]]]:
+    """
+    Build a table:
+      Rows: one per assignment
+      Columns: Assignment, then per window h in hours: 'Last <h>h' (submitted at most h hours
+               before the deadline), then per h: 'Late <= <h>h' (at most h hours late)
+    Over the latest submission of each roster student, like the per-assignment summary.
+    """
+    if aggregates is None or aggregates.deadline_index is None:
+        aggregates = aggregate_submissions(submissions, roster, [], delta_seconds_key=delta_seconds_key)
+    index = aggregates.deadline_index
+    hours = list(hours)
+
+    header = ["Assignment"] + [f"Last {h:g}h" for h in hours] + [f"Late <= {h:g}h" for h in hours]
+    rows: List[List[Any]] = []
+    for a in assignment_names:
+        within = [int(n) for n in index.window_counts(a, hours)]
+        rows.append([a] + within + [index.late_within(a, h) for h in hours])
+    return header, rows
+
+class FigureSpec(NamedTuple):
+    """
+    Everything needed to draw one bar plot. Plain data (picklable), so figures can be
+    drawn in worker processes.
+
+      series : [(legend label or None, values)]; more than one series -> grouped bars
+    """
+    name: str
+    title: str
+    labels: List[str]
+    series: List[Tuple[Optional[str], List[int]]]
+    figsize: Tuple[float, float]
+    rotation: int = 0
+    ha: str = "center"
+
+
+def on_time_figure_specs(aggregates: ReportAggregates, tz_name: str = "Asia/Jerusalem") -> List[FigureSpec]:
+    """
+    The two on-time plots (by weekday, by hour of day) in tz_name.
+    """
+    histogram = aggregates.local_time_histogram(tz_name)
+    weekday_totals = histogram.sum(axis=1)  # Mon=0..Sun=6
+    hour_totals = histogram.sum(axis=0)
+
+    # Want Sunday..Saturday
+    weekday_order = [6, 0, 1, 2, 3, 4, 5]
+    weekday_labels = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+    weekday_values = [int(weekday_totals[i]) for i in weekday_order]
+
+    hour_labels = [f"{h:02d}:00-{h:02d}:59" for h in range(24)]
+    hour_values = [int(h) for h in hour_totals]
+
+    return [
+        FigureSpec("on_time_by_weekday", "On-time submissions by weekday", weekday_labels,
+                   [(None, weekday_values)], (9, 4), rotation=30, ha="right"),
+        FigureSpec("on_time_by_hour", "On-time submissions by hour of day", hour_labels,
+                   [(None, hour_values)], (12, 4), rotation=90),
+    ]
+
+
+def format_popularity_figure_spec(aggregates: ReportAggregates, assignment_names: List[str]) -> Optional[FigureSpec]:
+    """
+    Grouped bars of the subject formats per assignment (None if there are no formats).
+    """
+    # counts[assignment][format] = count
+    counts = aggregates.format_counts
+
+    # Collect formats that appear anywhere (stable-ish order: most common overall first)
+    overall = Counter()
+    for a in assignment_names:
+        overall.update(counts[a])
+
+    formats = [fmt for fmt, _ in overall.most_common()]
+    if not formats:
+        return None
+
+    # One series per format, one value per assignment
+    series = [(fmt, [counts[a].get(fmt, 0) for a in assignment_names]) for fmt in formats]
+    return FigureSpec("subject_format_popularity", "Subject format popularity by assignment", list(assignment_names),
+                      series, (max(10, len(assignment_names) * 0.6), 5), rotation=30, ha="right")
+
+
+def _draw_figure(fig, spec: FigureSpec) -> None:
+    ax = fig.add_subplot()
+    if len(spec.series) == 1 and spec.series[0][0] is None:
+        ax.bar(spec.labels, spec.series[0][1])
+        ax.set_title(spec.title)
+        ax.set_ylabel("Count")
+        for label in ax.get_xticklabels():
+            label.set_rotation(spec.rotation)
+            label.set_horizontalalignment(spec.ha)
+    else:
+        x = list(range(len(spec.labels)))
+        n_fmt = len(spec.series)
+        width = 0.8 / n_fmt
+
+        # Center the grouped bars around each integer x
+        for k, (label, values) in enumerate(spec.series):
+            offset = (k - (n_fmt - 1) / 2) * width
+            ax.bar([xi + offset for xi in x], values, width=width, label=label)
+
+        ax.set_title(spec.title)
+        ax.set_ylabel("Count")
+        ax.set_xticks(x)
+        ax.set_xticklabels(spec.labels, rotation=spec.rotation, ha=spec.ha)
+
+        # Legend outside below
+        ax.legend(
+            loc="upper center",
+            bbox_to_anchor=(0.5, -0.20),
+            ncol=min(n_fmt, 4),
+            frameon=False,
+        )
+    fig.tight_layout()
+
+
+def _show_figures(specs: List[FigureSpec]) -> None:
+    for spec in specs:
+        fig = plt.figure(figsize=spec.figsize)
+        _draw_figure(fig, spec)
+        plt.show()
+        plt.close(fig)
+
+
+def _save_figure(spec: FigureSpec, output_dir: str, formats: Tuple[str, ...]) -> List[str]:
+    # A bare Figure (not pyplot) renders with Agg / the SVG backend: no display, and nothing
+    # is kept in pyplot's figure registry.
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=spec.figsize)
+    _draw_figure(fig, spec)
+    paths = []
+    for fmt in formats:
+        path = os.path.join(output_dir, f"{spec.name}.{fmt}")
+        fig.savefig(path)
+        paths.append(path)
+    fig.clear()
+    return paths
+
+
+# Starting a (spawned) worker costs about as much as drawing a few figures: fewer figures
+# than this are drawn in-process unless max_workers / pool ask for a pool
+PARALLEL_FIGURES_MIN = 8
+
+
+def figure_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    A process pool for render_figures, to share between several calls (pool=...).
+    spawn: the workers do not inherit the caller's threads, open connections or pyplot state.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def render_figures(
+    specs: List[FigureSpec],
+    output_dir: str,
+    formats: Iterable[str] = ("png",),
+    *,
+    max_workers: Optional[int] = None,
+    pool: Optional[Executor] = None,
+) -> List[str]:
+    """
+    Headless rendering: writes each figure as <output_dir>/<spec.name>.<fmt> (png, svg, ...).
+    Independent figures are drawn in parallel in a process pool when there are at least
+    PARALLEL_FIGURES_MIN of them or max_workers > 1 asks for it (max_workers=1: in-process);
+    pool (figure_pool) is used instead of starting one, and left open.
+
+    Returns:
+      the written paths, in spec order
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    formats = tuple(formats)
+    if pool is not None:
+        results = pool.map(_save_figure, specs, repeat(output_dir), repeat(formats))
+        return [path for paths in results for path in paths]
+    few = max_workers is None and len(specs) < PARALLEL_FIGURES_MIN
+    if max_workers == 1 or len(specs) <= 1 or few:
+        return [path for spec in specs for path in _save_figure(spec, output_dir, formats)]
+
+    with figure_pool(min(len(specs), max_workers or os.cpu_count() or 1)) as pool:
+        results = pool.map(_save_figure, specs, repeat(output_dir), repeat(formats))
+        return [path for paths in results for path in paths]
+
+
+def plot_on_time_distributions(
+    submissions: dict,
+    *,
+    delta_seconds_key: str = "delta_seconds",
+    time_key: str = "time",
+    tz_name: str = "Asia/Jerusalem",
+    aggregates: Optional[ReportAggregates] = None,
+    output_dir: Optional[str] = None,
+    formats: Iterable[str] = ("png",),
+    pool: Optional[Executor] = None,
+) -> Optional[List[str]]:
+    """
+    Makes two bar plots using ONLY on-time submissions (delta_seconds <= 0):
+      A) Count by weekday
+      B) Count by hour (0..23)
+    Shown with plt.show(), or with output_dir, written there headless (see render_figures,
+    pool: a figure_pool shared with plot_subject_format_popularity) and the paths returned.
+    """
+    if aggregates is None:
+        aggregates = aggregate_submissions(submissions, [], [], delta_seconds_key=delta_seconds_key, time_key=time_key)
+
+    specs = on_time_figure_specs(aggregates, tz_name)
+    if output_dir is not None:
+        return render_figures(specs, output_dir, formats, pool=pool)
+    _show_figures(specs)
+    return None
+
+
+def plot_subject_format_popularity(
+    submissions: dict,
+    assignment_names: list[str],
+    *,
+    format_key: str = "format",
+    aggregates: Optional[ReportAggregates] = None,
+    output_dir: Optional[str] = None,
+    formats: Iterable[str] = ("png",),
+    pool: Optional[Executor] = None,
+) -> Optional[List[str]]:
+    """
+    Grouped bar plot:
+      x-axis: assignments
+      bars per x: subject formats used for that assignment
+      y-axis: counts
+      legend: outside, below plot
+    Counts every issue:
+      - if entry has "_all": counts each item in that list
+      - else counts the single entry
+    Shown with plt.show(), or with output_dir, written there headless (see render_figures,
+    pool: a figure_pool shared with plot_on_time_distributions) and the paths returned.
+    """
+    if aggregates is None:
+        aggregates = aggregate_submissions(submissions, [], [], format_key=format_key)
+
+    spec = format_popularity_figure_spec(aggregates, assignment_names)
+    if spec is None:
+        print("No subject formats found to plot.")
+        return [] if output_dir is not None else None
+
+    if output_dir is not None:
+        return render_figures([spec], output_dir, formats, pool=pool)
+    _show_figures([spec])
+    return None
+
+def make_student_habits_table(
+    roster: List[str],
+    submissions: Dict[str, Dict[str, dict]],
+    *,
+    delta_seconds_key: str = "delta_seconds",
+    format_key: str = "format",
+    aggregates: Optional[ReportAggregates] = None,
+) -> Tuple[List[str], List[List[Any]]]:
+    """
+    Builds a per-student habits table.
+
+    Columns:
+      - Student
+      - Mean delta (hours), where delta = deadline - submission = -(submission - deadline)
+      - # unique subject formats used
+
+    Notes:
+      - Uses only entries that have delta_seconds (ignores Missing / None).
+      - If an entry contains "_all" (multiple issues), each one is included.
+      - Std is population std (divide by N). Change to (N-1) if you want sample std.
+    """
+    if aggregates is None:
+        aggregates = aggregate_submissions(
+            submissions, roster, [], delta_seconds_key=delta_seconds_key, format_key=format_key
+        )
+
+    header = ["Student", "Avg. sub. time (hours)", "Unique formats", "Formats"]
+    rows: List[List[Any]] = []
+
+    for student in roster:
+        count = aggregates.student_delta_count.get(student, 0)
+        if count:
+            mean = aggregates.student_delta_sum[student] / count
+            mean_out = round(mean, 2)
+        else:
+            mean_out = None
+
+        formats = set(aggregates.student_formats.get(student, ()))
+        rows.append([student, mean_out, len(formats), formats])
+
+    return header, rows
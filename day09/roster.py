@@ -0,0 +1,901 @@
+'''
+Parsing: the course README (roster, deadlines) and the issue titles (student, assignment, format).
+'''
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict, defaultdict, deque
+from typing import Dict, List, Tuple, Optional, Any, Iterable
+from functools import lru_cache
+import pandas as pd
+from github_api import (
+    Issue,
+    issues_from_subjects_text,
+)
+
+# ----------------------------
+# 1) Parse README.md
+# ----------------------------
+
+class ReadmeCache:
+    """
+    Cache of parse_readme results, keyed by a hash of the README content.
+
+    An unchanged README is not parsed at all. In a changed one the '## Students' section is
+    parsed again only if its content hash is new; the deadlines are always re-read by the
+    single-pass scan (_parse_day_deadlines), which is cheaper than hashing the blocks.
+    Bounded: least recently used READMEs / sections are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 64, max_sections: int = 4096):
+        self.max_entries = max_entries
+        self.max_sections = max_sections
+        self._results: "OrderedDict[str, Tuple[List[str], Dict[str, str]]]" = OrderedDict()
+        self._sections: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.section_hits = 0
+        self.section_misses = 0
+
+    @staticmethod
+    def _key(kind: str, lines: List[str]) -> str:
+        return hashlib.sha256(("\n".join([kind] + lines)).encode("utf-8")).hexdigest()
+
+    def _remember(self, table: OrderedDict, key: str, value: Any, limit: int) -> None:
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > limit:
+            table.popitem(last=False)
+
+    def _section(self, kind: str, lines: List[str], parse) -> Any:
+        key = self._key(kind, lines)
+        with self._lock:
+            if key in self._sections:
+                self._sections.move_to_end(key)
+                self.section_hits += 1
+                return self._sections[key]
+            self.section_misses += 1
+        value = parse(lines)
+        with self._lock:
+            self._remember(self._sections, key, value, self.max_sections)
+        return value
+
+    def parse(self, readme_text: str) -> Tuple[List[str], Dict[str, str]]:
+        key = hashlib.sha256(readme_text.encode("utf-8")).hexdigest()
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.hits += 1
+                roster, deadlines = self._results[key]
+                return list(roster), dict(deadlines)
+            self.misses += 1
+
+        lines = readme_text.splitlines()
+        roster = self._section("students", _students_section(lines), _parse_students_rows)
+        deadlines = _parse_day_deadlines(lines)
+
+        with self._lock:
+            self._remember(self._results, key, (roster, deadlines), self.max_entries)
+        return list(roster), dict(deadlines)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "section_hits": self.section_hits,
+            "section_misses": self.section_misses,
+            "entries": len(self._results),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._sections.clear()
+            self.hits = self.misses = self.section_hits = self.section_misses = 0
+
+    def save(self, path: str) -> None:
+        with self._lock:
+            data = {
+                "results": [[k, roster, deadlines] for k, (roster, deadlines) in self._results.items()],
+                "sections": [[k, v] for k, v in self._sections.items()],
+            }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def load(self, path: str) -> None:
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                data = json.load(f)
+            except ValueError:
+                return  # corrupt cache file: start empty
+        with self._lock:
+            for k, roster, deadlines in data.get("results", []):
+                self._remember(self._results, k, (roster, deadlines), self.max_entries)
+            for k, v in data.get("sections", []):
+                self._remember(self._sections, k, v, self.max_sections)
+
+
+README_CACHE = ReadmeCache()
+
+
+def parse_readme(readme_text: str, cache: Optional[ReadmeCache] = README_CACHE) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Returns:
+      roster: list of student names under '## Students' table
+      deadlines: dict { 'Day01': '2025.11.01 22:00', ... } extracted from '* Dead-line: ...'
+
+    With a cache (the default, README_CACHE) an unchanged README is not parsed again and a
+    changed one re-parses only the sections that changed; cache=None always parses.
+    """
+    if cache is not None:
+        return cache.parse(readme_text)
+
+    lines = readme_text.splitlines()
+
+    roster = _parse_students_table(lines)
+    deadlines = _parse_day_deadlines(lines)
+
+    return roster, deadlines
+
+
+_STUDENTS_HEADER_RE = re.compile(r"^\s*##\s+Students\s*$")
+_SECTION_HEADER_RE = re.compile(r"^\s*##\s+\S+")
+
+
+def _students_section(lines: List[str]) -> List[str]:
+    # Find the "## Students" section
+    start = None
+    for i, line in enumerate(lines):
+        if _STUDENTS_HEADER_RE.match(line):
+            start = i + 1
+            break
+    if start is None:
+        return []
+
+    # End at next ## heading
+    end = len(lines)
+    for j in range(start, len(lines)):
+        if _SECTION_HEADER_RE.match(lines[j]):
+            end = j
+            break
+
+    return lines[start:end]
+
+
+def _parse_students_table(lines: List[str]) -> List[str]:
+    return _parse_students_rows(_students_section(lines))
+
+
+def _parse_students_rows(section: List[str]) -> List[str]:
+    # Collect markdown table lines
+    table_lines = [ln for ln in section if ln.strip().startswith("|")]
+    if len(table_lines) < 3:
+        return []
+
+    # Skip header + separator, parse data rows
+    roster = []
+    for row in table_lines[2:]:
+        cells = [c.strip() for c in row.strip().strip("|").split("|")]
+        if not cells:
+            continue
+
+        # In this README, the FIRST cell is like: [Achinoam Shoham](https://...)
+        m = re.search(r"\[([^\]]+)\]\(", cells[0])
+        if m:
+            name = _norm(m.group(1))
+            if name:
+                roster.append(name)
+
+    # De-duplicate preserving order
+    seen = set()
+    out = []
+    for n in roster:
+        k = n.casefold()
+        if k not in seen:
+            seen.add(k)
+            out.append(n)
+    return out
+
+
+_ASSIGNMENT_HEADER_RE = re.compile(r"^\s*###\s*Assignment\s*\(\s*day\s*(\d{1,2})\s*\)\s*$", re.IGNORECASE)
+_DEADLINE_RE = re.compile(r"(?i)\bDead-?line:\s*([^\n\r]*)")
+_DEADLINE_DATETIME_RE = re.compile(r"(\d{4})[.\-/](\d{2})[.\-/](\d{2})\s+(\d{2}):(\d{2})(?::(\d{2}))?")
+
+
+def _deadline_to_iso_z(text: str) -> str:
+    text = _norm(text)  # removes "(...)" and normalizes spaces
+    m = _DEADLINE_DATETIME_RE.search(text)
+    if not m:
+        return text  # fallback: keep cleaned text
+    y, mo, d, hh, mm, ss = m.group(1), m.group(2), m.group(3), m.group(4), m.group(5), (m.group(6) or "00")
+    return f"{y}-{mo}-{d}T{hh}:{mm}:{ss}Z"
+
+
+def _parse_day_deadlines(lines: List[str]) -> Dict[str, str]:
+    """
+    Extract deadlines for assignments as ISO like subjects.txt: YYYY-MM-DDTHH:MM:SSZ
+
+    Strategy (a single pass over the lines):
+      - Find "### Assignment (day N)" (case-insensitive).
+      - The block of day N runs until the NEXT "### Assignment (day ...)" heading (or end
+        of file); within it take the FIRST occurrence of "Dead-line:".
+      - Convert "YYYY.MM.DD HH:MM" into "YYYY-MM-DDTHH:MM:00Z".
+      - Strip any "(...)" part.
+    """
+    deadlines: Dict[str, str] = {}
+    key, found = None, True
+    for line in lines:
+        m = _ASSIGNMENT_HEADER_RE.match(line)
+        if m:
+            key, found = f"Day{int(m.group(1)):02d}", False
+            continue
+        if found:
+            continue  # before the first header, or the block already has its deadline
+        dm = _DEADLINE_RE.search(line)
+        if dm:
+            deadlines[key] = _deadline_to_iso_z(dm.group(1))
+            found = True
+
+    return deadlines
+
+
+def _norm(s: str) -> str:
+    s = re.sub(r"\([^)]*\)", "", s)     # drop "(...)"
+    s = re.sub(r"\s+", " ", s).strip()  # normalize whitespace
+    return s
+
+# ----------------------------
+# 2) Parse day09/subjects.txt
+# ----------------------------
+
+def parse_subjects(
+    subjects: str | Iterable[Issue],
+    roster: List[str],
+    assignment_names: List[str],
+    *,
+    backend: str = "python",
+    fuzzy: bool = True,
+) -> Dict[str, Dict[str, dict]]:
+    """
+    subjects is either Issue records (e.g. from iter_issues / issues_from_store)
+    or the subjects.txt TSV text:
+      issue_id<TAB>OPEN/CLOSED<TAB>title<TAB><TAB>created_at
+
+    Returns nested dict:
+      data[student][assignment] = {
+          'status': 'OPEN'/'CLOSED',
+          'time': '2026-01-03T18:44:38Z',
+          'format': '<label>',
+          'issue_id': 213
+      }
+    If multiple issues exist for same (student, assignment), keeps a list under '_all'.
+
+    backend="pandas" does the extraction with vectorized string ops (see parse_subjects_frame).
+    fuzzy=True resolves titles with no roster name in them to the closest roster name
+    (FuzzyRosterIndex, e.g. a typo in the name); fuzzy=False keeps them as written.
+    """
+    if backend == "pandas":
+        return subjects_frame_to_dict(parse_subjects_frame(subjects, roster, assignment_names, fuzzy=fuzzy))
+    if backend != "python":
+        raise ValueError(f"Unknown backend: {backend!r} (expected 'python' or 'pandas')")
+
+    roster_lookup = _build_roster_lookup(roster)
+    roster_matcher = RosterMatcher(roster_lookup)
+    fuzzy_index = FuzzyRosterIndex(roster) if fuzzy else None
+    assignments_lookup = {a.casefold(): a for a in assignment_names}
+
+    data: Dict[str, Dict[str, dict]] = defaultdict(dict)
+
+    if isinstance(subjects, str):
+        subjects = issues_from_subjects_text(subjects)
+
+    for issue_id, status, title, created_at in subjects:
+        student = _extract_student(title, roster_lookup, roster_matcher, fuzzy_index) or "UNKNOWN"
+        assignment = _extract_assignment(title, assignments_lookup) or "UNKNOWN"
+        fmt = _classify_subject_format(title)
+
+        entry = {
+            "status": status,
+            "time": created_at,
+            "format": fmt,
+            "issue_id": issue_id,
+        }
+
+        _add_submission(data[student], assignment, entry)
+
+    return dict(data)
+
+
+def _add_submission(per_student: Dict[str, dict], assignment: str, entry: dict) -> None:
+    # If repeated (student, assignment), keep them all
+    prev = per_student.get(assignment)
+    if prev is None:
+        per_student[assignment] = entry
+        return
+
+    all_list = prev.get("_all")
+    if all_list is None:
+        all_list = prev["_all"] = [prev]
+    all_list.append(entry)
+    # keep "latest" as the newest by timestamp string (ISO Z compares lexicographically);
+    # on equal times the earlier issue stays, and only the latest entry carries "_all"
+    if entry.get("time", "") > prev.get("time", ""):
+        entry["_all"] = prev.pop("_all")
+        per_student[assignment] = entry
+
+
+def _build_roster_lookup(roster: List[str]) -> Dict[str, str]:
+    """
+    Maps simplified keys -> canonical roster name.
+    """
+    lookup: Dict[str, str] = {}
+    for name in roster:
+        lookup[name.casefold()] = name
+        lookup[_simplify(name)] = name
+    return lookup
+
+
+def _simplify(s: str) -> str:
+    s = s.casefold()
+    s = re.sub(r"[^a-z0-9\s]", " ", s)
+    s = _norm(s)
+    return s
+
+
+class RosterMatcher:
+    """
+    Aho–Corasick automaton over the roster lookup keys (simplified / casefolded names).
+
+    Built once per run; longest_match() scans a title in a single pass and returns the
+    canonical name of the longest key found as a substring (ties: first key in lookup order),
+    i.e. the same answer as checking every key with `key in title`.
+    """
+
+    def __init__(self, roster_lookup: Dict[str, str], min_len: int = 4):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._best: List[Optional[Tuple[int, int, str]]] = [None]   # (len, -order, canonical)
+
+        for order, (key, canonical) in enumerate(roster_lookup.items()):
+            if len(key) < min_len:
+                continue
+            node = 0
+            for ch in key:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                    self._goto[node][ch] = nxt
+                node = nxt
+            self._best[node] = _better(self._best[node], (len(key), -order, canonical))
+
+        # BFS: failure links, and fold the best match of the failure chain into each node
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._best[nxt] = _better(self._best[nxt], self._best[self._fail[nxt]])
+                queue.append(nxt)
+
+    def longest_match(self, text: str) -> Optional[str]:
+        goto, fail, best_at = self._goto, self._fail, self._best
+        node = 0
+        best = None
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if best_at[node] is not None:
+                best = _better(best, best_at[node])
+        return best[2] if best else None
+
+
+def _better(a: Optional[tuple], b: Optional[tuple]) -> Optional[tuple]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a if a[:2] >= b[:2] else b
+
+
+def _pattern_masks(pattern: str) -> Dict[str, int]:
+    masks: Dict[str, int] = {}
+    for i, ch in enumerate(pattern):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    return masks
+
+
+def _levenshtein(pattern: str, text: str, masks: Optional[Dict[str, int]] = None) -> int:
+    """
+    Edit distance, with Myers' bit-parallel algorithm: one column of the DP table per
+    character of text, as a few integer operations on bit vectors of len(pattern) bits.
+    masks: _pattern_masks(pattern), when the same pattern is compared with many texts.
+    """
+    m = len(pattern)
+    if not m:
+        return len(text)
+    if masks is None:
+        masks = _pattern_masks(pattern)
+    full, high = (1 << m) - 1, 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    for ch in text:
+        eq = masks.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score
+
+
+class BKTree:
+    """
+    Burkhard–Keller tree over strings with the Levenshtein distance.
+
+    search(query, max_distance) only visits the children whose edge distance is within
+    max_distance of the query's distance to the node (triangle inequality), so a lookup
+    with a small max_distance touches a fraction of the words.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._root: Optional[Tuple[str, Dict[int, tuple]]] = None
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        if self._root is None:
+            self._root = (word, {})
+            self.size = 1
+            return
+        node = self._root
+        while True:
+            d = _levenshtein(word, node[0])
+            if d == 0:
+                return
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = (word, {})
+                self.size += 1
+                return
+            node = child
+
+    def search(self, query: str, max_distance: int) -> List[Tuple[int, str]]:
+        """
+        Returns:
+          [(distance, word), ...] for every word within max_distance, closest first
+        """
+        found = []
+        masks = _pattern_masks(query)
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            word, children = stack.pop()
+            d = _levenshtein(query, word, masks)
+            if d <= max_distance:
+                found.append((d, word))
+            for edge, child in children.items():
+                if d - max_distance <= edge <= d + max_distance:
+                    stack.append(child)
+        return sorted(found)
+
+
+class ResolvedTitleCache:
+    """
+    Titles resolved by the fuzzy roster match (FuzzyRosterIndex), keyed by a hash of the
+    roster and the title; a title with no close roster name is cached as None.
+    Saved between runs (resolved_titles.json), so the fuzzy search only runs for new titles.
+    Bounded: least recently used titles are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 65536):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, roster_key: str, title: str) -> Tuple[bool, Optional[str]]:
+        """
+        Returns:
+          (found, canonical name or None)
+        """
+        key = (roster_key, title)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, roster_key: str, title: str, name: Optional[str]) -> None:
+        with self._lock:
+            self._entries[(roster_key, title)] = name
+            self._entries.move_to_end((roster_key, title))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def save(self, path: str) -> None:
+        with self._lock:
+            data = [[roster_key, title, name] for (roster_key, title), name in self._entries.items()]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def load(self, path: str) -> None:
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                data = json.load(f)
+            except ValueError:
+                return  # corrupt cache file: start empty
+        for roster_key, title, name in data:
+            self.put(roster_key, title, name)
+
+
+RESOLVED_TITLE_CACHE = ResolvedTitleCache()
+
+
+class FuzzyRosterIndex:
+    """
+    Fallback for titles where no roster name is a substring: finds the roster name closest
+    (Levenshtein, on simplified names) to the "by Name" / "- Name" guess, or else to any run
+    of consecutive title words as long as a roster name, e.g. "Day03 by Jon Smith" -> "John Smith".
+
+    A match must be within max(len // 4, 1) edits (at most max_distance, queries shorter
+    than min_len are not matched) and unambiguous (a single closest roster name).
+    The BK-tree is built on the first lookup; results go to cache (RESOLVED_TITLE_CACHE),
+    so a title is only searched once, also across runs when the cache is saved.
+    """
+
+    def __init__(
+        self,
+        roster: List[str],
+        *,
+        cache: Optional[ResolvedTitleCache] = RESOLVED_TITLE_CACHE,
+        max_distance: int = 3,
+        min_len: int = 4,
+    ):
+        self.cache = cache
+        self.max_distance = max_distance
+        self.min_len = min_len
+        self._canonical: Dict[str, List[str]] = defaultdict(list)
+        for name in roster:
+            if name not in self._canonical[_simplify(name)]:
+                self._canonical[_simplify(name)].append(name)
+        self._window_sizes = sorted({len(key.split()) for key in self._canonical if key})
+        self.roster_key = hashlib.sha256("\n".join(roster).encode("utf-8")).hexdigest()[:16]
+        self._tree: Optional[BKTree] = None
+        self._query_matches: Dict[str, List[Tuple[int, str]]] = {}  # word runs repeat across titles
+        self.searches = 0
+
+    def resolve(self, title: str, guess: Optional[str] = None) -> Optional[str]:
+        """
+        guess: the "by Name" / "- Name" part of the title, if any.
+
+        Returns:
+          the canonical roster name, or None when no roster name is close enough
+        """
+        if self.cache is not None:
+            found, name = self.cache.get(self.roster_key, title)
+            if found:
+                return name
+        name = self._search(title, guess)
+        if self.cache is not None:
+            self.cache.put(self.roster_key, title, name)
+        return name
+
+    def _search(self, title: str, guess: Optional[str]) -> Optional[str]:
+        if self._tree is None:
+            self._tree = BKTree(self._canonical)
+        self.searches += 1
+
+        words = _simplify(guess if guess else title).split()
+        queries = {" ".join(words)} if guess else set()
+        for n in self._window_sizes:
+            queries.update(" ".join(words[i:i + n]) for i in range(len(words) - n + 1))
+
+        best_distance, best = None, set()
+        for query in queries:
+            if len(query) < self.min_len:
+                continue
+            matches = self._query_matches.get(query)
+            if matches is None:
+                limit = min(self.max_distance, max(len(query) // 4, 1))
+                matches = self._query_matches[query] = self._tree.search(query, limit)
+            for d, key in matches:
+                if best_distance is None or d < best_distance:
+                    best_distance, best = d, set(self._canonical[key])
+                elif d == best_distance:
+                    best.update(self._canonical[key])
+        return best.pop() if len(best) == 1 else None
+
+
+_BY_TAIL_RE = re.compile(r"(?i)\bby\s+(.+?)\s*$")
+_DASH_TAIL_RE = re.compile(r"\s-\s(.+?)\s*$")
+
+
+def _tail_guess(title: str) -> Optional[str]:
+    # the name after "by", else after " - " (common in this file)
+    m = _BY_TAIL_RE.search(title) or _DASH_TAIL_RE.search(title)
+    return _norm(m.group(1)) if m else None
+
+
+def _extract_student(
+    title: str,
+    roster_lookup: Dict[str, str],
+    matcher: Optional[RosterMatcher] = None,
+    fuzzy: Optional[FuzzyRosterIndex] = None,
+) -> Optional[str]:
+    """
+    Best-effort:
+      1) longest roster name substring match (simplified)
+      2) parse tail after 'by'
+      3) parse tail after '-' (common in this file)
+      4) with fuzzy: the closest roster name, when 2) / 3) give no roster name
+
+    Pass a RosterMatcher built once for roster_lookup when extracting many titles.
+    """
+    if matcher is None:
+        matcher = RosterMatcher(roster_lookup)
+    t_simpl = _simplify(title)
+
+    # Longest match wins
+    best = matcher.longest_match(t_simpl)
+    if best:
+        return best
+
+    # "by Name", "... - Name"
+    guess = _tail_guess(title)
+    if guess is not None and _simplify(guess) in roster_lookup:
+        return roster_lookup[_simplify(guess)]
+
+    if fuzzy is not None:
+        return fuzzy.resolve(title, guess) or guess
+    return guess
+
+
+def _extract_assignment(title: str, assignments_lookup: Dict[str, str]) -> Optional[str]:
+    t = title.casefold()
+
+    # match known assignment names (prefer longer)
+    for k in sorted(assignments_lookup.keys(), key=len, reverse=True):
+        if k in t:
+            return assignments_lookup[k]
+
+    # fallback: Day## patterns
+    m = re.search(r"(?i)\bday\s*[-_ ]*0?(\d{1,2})\b", title)
+    if m:
+        return f"Day{int(m.group(1)):02d}"
+
+    return None
+
+
+# Subject-line formats, in priority order (the first matching pattern wins).
+# Compiled with re.IGNORECASE.
+SUBJECT_FORMAT_PATTERNS = [
+    # Day formats
+    (r"^\s*day\s*0?\d{1,2}\s+by\s+.+$", "Day## by Name"),
+    (r"^\s*day\s*0?\d{1,2}\s*[-–—]\s*.+$", "Day## - Name"),
+    (r"^\s*day\s*0?\d{1,2}\s*:\s*.+$", "Day##: Name"),
+    (r"^\s*day\s*0?\d{1,2}\s+.+$", "Day## Name (no separator)"),
+
+    # Assignment formats
+    (r"^\s*assignment\s*\(?\s*day\s*0?\d{1,2}\s*\)?\s*[-–—:]\s*.+$", "Assignment (day ##): ..."),
+    (r"^\s*assignment\s*0?\d{1,2}\s*[-–—]\s*.+$", "Assignment ## - ..."),
+    (r"^\s*assignment\s*0?\d{1,2}\s+by\s+.+$", "Assignment ## by Name"),
+    (r"^\s*assignment\s*0?\d{1,2}\s*:\s*.+$", "Assignment ##: ..."),
+
+    # Final project common ones
+    (r"^\s*final\s+project\s+proposal\s+by\s+.+$", "Final Project Proposal by Name"),
+    (r"^\s*final\s+project\s+.*$", "Final Project (other)"),
+
+    # Catch-all “contains”
+    (r".*\bday\s*0?\d{1,2}\b.*\bby\b.*", "... Day## ... by ..."),
+    (r".*\bassignment\b.*\bday\s*0?\d{1,2}\b.*", "... Assignment ... day## ..."),
+]
+
+# One alternation with a named group per format: re.match tries the alternatives in order,
+# so the group that matched (m.lastgroup) is the first pattern that would have matched alone.
+_SUBJECT_FORMAT_RE = re.compile(
+    "|".join(f"(?P<f{i}>{pat})" for i, (pat, _label) in enumerate(SUBJECT_FORMAT_PATTERNS)),
+    re.IGNORECASE,
+)
+_SUBJECT_FORMAT_LABELS = {f"f{i}": label for i, (_pat, label) in enumerate(SUBJECT_FORMAT_PATTERNS)}
+
+_HAS_BY_RE = re.compile(r"\bby\b", re.IGNORECASE)
+_HAS_DAY_RE = re.compile(r"\bday\s*0?\d{1,2}\b", re.IGNORECASE)
+_HAS_ASSIGNMENT_RE = re.compile(r"\bassignment\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=65536)
+def _classify_subject_format(title: str) -> str:
+    t = title.strip()
+
+    m = _SUBJECT_FORMAT_RE.match(t)
+    if m:
+        return _SUBJECT_FORMAT_LABELS[m.lastgroup]
+
+    # A slightly-more-informative fallback than plain "Other"
+    has_day = bool(_HAS_DAY_RE.search(t))
+    if has_day and _HAS_BY_RE.search(t):
+        return "Other (mentions Day## + by)"
+    if has_day:
+        return "Other (mentions Day##)"
+    if _HAS_ASSIGNMENT_RE.search(t):
+        return "Other (mentions Assignment)"
+    return "Other"
+
+# ----------------------------
+# 2b) Vectorized parse_subjects backend (pandas)
+# ----------------------------
+
+SUBJECTS_FRAME_COLUMNS = ["issue_id", "status", "time", "title", "student", "assignment", "format"]
+
+
+def parse_subjects_frame(
+    subjects: str | Iterable[Issue],
+    roster: List[str],
+    assignment_names: List[str],
+    *,
+    fuzzy: bool = True,
+) -> pd.DataFrame:
+    """
+    Same extraction as parse_subjects, as a long-format DataFrame (one row per issue):
+      issue_id, status, time, title, student, assignment, format
+
+    Student, assignment and format are extracted with vectorized str.contains / str.extract
+    passes over the UNIQUE titles (repeated titles are extracted once) and mapped back;
+    the few titles with no roster name go through FuzzyRosterIndex one by one (fuzzy=True).
+    """
+    if isinstance(subjects, str):
+        subjects = issues_from_subjects_text(subjects)
+    columns = list(zip(*subjects)) or [(), (), (), ()]
+    df = pd.DataFrame({
+        "issue_id": pd.Series(columns[0], dtype=object),  # ints, or None (keep them out of float64)
+        "status": pd.Series(columns[1], dtype=object),
+        "title": pd.Series(columns[2], dtype=object),
+        "time": pd.Series(columns[3], dtype=object),
+    })
+
+    titles = pd.Series(df["title"].unique(), dtype=object)
+    extracted = pd.DataFrame({
+        "student": _vectorized_students(titles, roster, FuzzyRosterIndex(roster) if fuzzy else None).fillna("UNKNOWN"),
+        "assignment": _vectorized_assignments(titles, assignment_names).fillna("UNKNOWN"),
+        "format": _vectorized_formats(titles),
+    })
+    extracted.index = titles
+
+    for col in ("student", "assignment", "format"):
+        df[col] = df["title"].map(extracted[col])
+    return df[SUBJECTS_FRAME_COLUMNS]
+
+
+def _vectorized_simplify(s: pd.Series) -> pd.Series:
+    # Same as _simplify: casefold, non [a-z0-9\s] -> space, collapse whitespace
+    s = s.str.casefold().str.replace(r"[^a-z0-9\s]", " ", regex=True)
+    return s.str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+def _vectorized_norm(s: pd.Series) -> pd.Series:
+    # Same as _norm: drop "(...)", collapse whitespace
+    s = s.str.replace(r"\([^)]*\)", "", regex=True)
+    return s.str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+def _vectorized_students(titles: pd.Series, roster: List[str], fuzzy: Optional[FuzzyRosterIndex] = None) -> pd.Series:
+    roster_lookup = _build_roster_lookup(roster)
+    t_simpl = _vectorized_simplify(titles)
+    student = pd.Series(None, index=titles.index, dtype=object)
+
+    # 1) longest roster key wins: one contains-pass per key, longest first (ties in lookup order)
+    keys = sorted((k for k in roster_lookup if len(k) >= 4), key=len, reverse=True)
+    for key in keys:
+        todo = student.isna()
+        if not todo.any():
+            break
+        hit = t_simpl[todo].str.contains(key, regex=False)
+        student[hit[hit].index] = roster_lookup[key]
+
+    # 2) "by Name", 3) "... - Name" (only where the previous step found nothing)
+    for pattern in (r"(?i)\bby\s+(.+?)\s*$", r"\s-\s(.+?)\s*$"):
+        todo = student.isna()
+        if not todo.any():
+            break
+        guess = titles[todo].str.extract(pattern, expand=False).dropna()
+        guess = _vectorized_norm(guess)
+        canonical = _vectorized_simplify(guess).map(roster_lookup)
+        # an empty guess still "matches" (and ends up as UNKNOWN), like _extract_student
+        student[guess.index] = canonical.fillna(guess).replace("", "UNKNOWN")
+
+    # 4) closest roster name for the rest (a handful of titles: not vectorized)
+    if fuzzy is not None:
+        for i in student.index[~student.isin(roster)]:
+            name = fuzzy.resolve(titles[i], _tail_guess(titles[i]))
+            if name:
+                student[i] = name
+
+    return student
+
+
+def _vectorized_assignments(titles: pd.Series, assignment_names: List[str]) -> pd.Series:
+    assignments_lookup = {a.casefold(): a for a in assignment_names}
+    t = titles.str.casefold()
+    assignment = pd.Series(None, index=titles.index, dtype=object)
+
+    for k in sorted(assignments_lookup.keys(), key=len, reverse=True):
+        todo = assignment.isna()
+        if not todo.any():
+            break
+        hit = t[todo].str.contains(k, regex=False)
+        assignment[hit[hit].index] = assignments_lookup[k]
+
+    todo = assignment.isna()
+    day = titles[todo].str.extract(r"(?i)\bday\s*[-_ ]*0?(\d{1,2})\b", expand=False).dropna()
+    assignment[day.index] = "Day" + day.str.zfill(2)  # at most 2 digits -> same as f"{int(d):02d}"
+    return assignment
+
+
+def _vectorized_formats(titles: pd.Series) -> pd.Series:
+    t = titles.str.strip()
+    # \A: str.extract searches, _classify_subject_format matches at the start
+    groups = t.str.extract(r"\A(?:" + _SUBJECT_FORMAT_RE.pattern + ")", flags=re.IGNORECASE)
+    matched = groups.notna()
+    fmt = matched.idxmax(axis=1).map(_SUBJECT_FORMAT_LABELS).where(matched.any(axis=1))
+
+    has_day = t.str.contains(_HAS_DAY_RE.pattern, flags=re.IGNORECASE, regex=True)
+    has_by = t.str.contains(_HAS_BY_RE.pattern, flags=re.IGNORECASE, regex=True)
+    has_assignment = t.str.contains(_HAS_ASSIGNMENT_RE.pattern, flags=re.IGNORECASE, regex=True)
+    fallback = pd.Series("Other", index=t.index, dtype=object)
+    fallback[has_assignment] = "Other (mentions Assignment)"
+    fallback[has_day] = "Other (mentions Day##)"
+    fallback[has_day & has_by] = "Other (mentions Day## + by)"
+    return fmt.fillna(fallback)
+
+
+def subjects_frame_to_dict(df: pd.DataFrame) -> Dict[str, Dict[str, dict]]:
+    """
+    Long-format frame (parse_subjects_frame) -> the nested dict returned by parse_subjects.
+    """
+    groups: Dict[Tuple[str, str], List[dict]] = {}
+    rows = zip(df["issue_id"], df["status"], df["time"], df["format"], df["student"], df["assignment"])
+    for issue_id, status, created_at, fmt, student, assignment in rows:
+        entry = {"status": status, "time": created_at, "format": fmt, "issue_id": issue_id}
+        groups.setdefault((student, assignment), []).append(entry)
+
+    data: Dict[str, Dict[str, dict]] = defaultdict(dict)
+    for (student, assignment), entries in groups.items():
+        if len(entries) == 1:
+            data[student][assignment] = entries[0]
+        else:
+            latest = max(entries, key=lambda e: e.get("time", ""))
+            latest["_all"] = entries
+            data[student][assignment] = latest
+    return dict(data)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+
+'''
+pytest test suite for the local GitHub stand-in and the synthetic course generator
+(mock_github module) used by the offline benchmarks.
+'''
+
+import pytest
+from mock_github import MockGitHub, make_synthetic_course
+from utilities import (
+    CourseRepo,
+    fetch_course,
+    analyze_course,
+    parse_readme,
+    parse_subjects,
+    iter_issue_records,
+)
+
+
+def test_synthetic_course():
+    course = make_synthetic_course(25, 6, 400, seed=1)
+    assert course == make_synthetic_course(25, 6, 400, seed=1)  # reproducible
+    assert len(course.roster) == len(set(course.roster)) == 25
+    assert [i["number"] for i in course.issues] == list(range(400, 0, -1))
+
+    roster, deadlines = parse_readme(course.readme, cache=None)
+    assert (roster, deadlines) == (course.roster, course.deadlines)
+
+    # Messy titles: most issues still map to a student and an assignment, not all of them
+    submissions = parse_subjects(
+        [(i["number"], i["state"].upper(), i["title"], i["created_at"]) for i in course.issues], roster, list(deadlines)
+    )
+    matched = sum(len(e.get("_all", [e])) for s, per in submissions.items() if s != "UNKNOWN"
+                  for a, e in per.items() if a != "UNKNOWN")
+    assert 0.6 * len(course.issues) < matched < len(course.issues)
+
+
+def test_mock_server(tmp_path):
+    course = make_synthetic_course(10, 3, 250, seed=2)
+    with MockGitHub(course) as gh:
+        readme_text, issues = fetch_course(CourseRepo("org", "course"), str(tmp_path), raw_base=gh.url, api_base=gh.url)
+        assert readme_text == course.readme
+        assert [i.number for i in issues] == [i["number"] for i in course.issues if "pull_request" not in i]
+
+        # 100 per page, Link rel="last": README + 3 pages. The store's full download is not
+        # kept in the HTTP cache; pages fetched through the cache answer 304 the next time
+        assert gh.requests == 1 + 3
+        records = list(iter_issue_records("org", "course", api_base=gh.url, concurrent=True))
+        assert len(records) == len(issues) and gh.not_modified == 0
+        records = list(iter_issue_records("org", "course", api_base=gh.url, concurrent=True))
+        assert len(records) == len(issues) and gh.not_modified == 3
+
+        result = analyze_course(readme_text, issues)
+        assert result["roster"] == course.roster and result["issues"] == len(issues)
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+
+'''
+pytest test suite for parsing the course README in utilities module.
+The single-pass deadline scan must return exactly the deadlines of the original
+nested-scan implementation (copied below as the reference), with and without the cache.
+'''
+
+import random
+import re
+
+import pytest
+from roster import _norm, _parse_day_deadlines
+from utilities import ReadmeCache, parse_readme
+
+
+def reference_parse_day_deadlines(lines):
+    assign_hdr = re.compile(
+        r"^\s*###\s*Assignment\s*\(\s*day\s*(\d{1,2})\s*\)\s*$", re.IGNORECASE
+    )
+    deadline_anywhere = re.compile(r"(?i)\bDead-?line:\s*([^\n\r]*)")
+    dt = re.compile(r"(\d{4})[.\-/](\d{2})[.\-/](\d{2})\s+(\d{2}):(\d{2})(?::(\d{2}))?")
+
+    def to_iso_z(text):
+        text = _norm(text)
+        m = dt.search(text)
+        if not m:
+            return text
+        y, mo, d, hh, mm, ss = m.group(1), m.group(2), m.group(3), m.group(4), m.group(5), (m.group(6) or "00")
+        return f"{y}-{mo}-{d}T{hh}:{mm}:{ss}Z"
+
+    deadlines = {}
+    i = 0
+    while i < len(lines):
+        m = assign_hdr.match(lines[i])
+        if not m:
+            i += 1
+            continue
+        key = f"Day{int(m.group(1)):02d}"
+        next_i = i + 1
+        while next_i < len(lines) and not assign_hdr.match(lines[next_i]):
+            next_i += 1
+        found = None
+        for j in range(i, next_i):
+            dm = deadline_anywhere.search(lines[j])
+            if dm:
+                found = to_iso_z(dm.group(1))
+                break
+        if found:
+            deadlines[key] = found
+        i = next_i
+    return deadlines
+
+
+README = """\
+# WIS Python course
+
+## Students
+
+| Name | GitHub |
+| --- | --- |
+| [Achinoam Shoham](https://github.com/a) | a |
+| [Guy  Vosco (TA)](https://github.com/g) | g |
+| [guy vosco](https://github.com/g2) | g2 |
+| not a link | x |
+
+## Assignments
+
+* Dead-line: 2025.10.01 10:00 (before any assignment: ignored)
+
+### Assignment (day 1)
+
+* Dead-line: 2025.11.01 22:00 (Saturday)
+* Dead-line: 2025.11.02 22:00
+
+### Assignment (DAY 2)
+
+Nothing here.
+
+### Assignment (day 3)
+
+* deadline: 2025/11/15 08:30:15
+"""
+
+
+def random_readme(rnd):
+    lines = []
+    for _ in range(rnd.randint(0, 60)):
+        lines.append(rnd.choice([
+            f"### Assignment (day {rnd.randint(1, 12)})",
+            f"  ###Assignment ( Day {rnd.randint(1, 12)} )  ",
+            f"* Dead-line: 2025.11.{rnd.randint(1, 28):02d} {rnd.randint(0, 23):02d}:00",
+            "* Deadline: TBD (soon)",
+            "## Some section",
+            "text",
+            "",
+        ]))
+    return "\n".join(lines)
+
+
+def test_parse_readme():
+    roster, deadlines = parse_readme(README, cache=None)
+    assert roster == ["Achinoam Shoham", "Guy Vosco"]
+    assert deadlines == {"Day01": "2025-11-01T22:00:00Z", "Day03": "2025-11-15T08:30:15Z"}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_single_pass_same_as_reference(seed):
+    text = random_readme(random.Random(seed))
+    expected = reference_parse_day_deadlines(text.splitlines())
+    assert _parse_day_deadlines(text.splitlines()) == expected
+    assert list(_parse_day_deadlines(text.splitlines())) == list(expected)
+    assert parse_readme(text, cache=ReadmeCache())[1] == expected
+
+
+def test_readme_cache(tmp_path):
+    cache = ReadmeCache()
+    expected = parse_readme(README, cache=None)
+    assert parse_readme(README, cache=cache) == expected
+    sections = cache.stats()["section_misses"]
+    assert sections == 1  # the students section; the deadlines are one scan, not cached per block
+
+    # Unchanged README: no parsing at all; the caller gets its own copies
+    roster, deadlines = parse_readme(README, cache=cache)
+    roster.append("Someone")
+    deadlines.clear()
+    assert parse_readme(README, cache=cache) == expected
+    assert cache.stats()["hits"] == 2 and cache.stats()["section_misses"] == sections
+
+    # One deadline changed: the students section is not parsed again
+    changed = README.replace("2025/11/15 08:30:15", "2025/11/16 08:30")
+    assert parse_readme(changed, cache=cache)[1]["Day03"] == "2025-11-16T08:30:00Z"
+    assert cache.stats()["section_misses"] == sections
+    assert cache.stats()["section_hits"] == 1
+
+    # Saved and loaded: a new process skips the parsing too
+    cache.save(str(tmp_path / "readme_cache.json"))
+    loaded = ReadmeCache()
+    loaded.load(str(tmp_path / "readme_cache.json"))
+    assert parse_readme(README, cache=loaded) == expected
+    assert loaded.stats()["hits"] == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
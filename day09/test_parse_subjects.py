@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+
+'''
+pytest test suite for parsing submission subjects in utilities module.
+The roster, assignments and issue titles are hardcoded for testing purposes.
+'''
+
+import random
+
+import pytest
+from roster import _build_roster_lookup, _levenshtein, _simplify, _tail_guess
+from utilities import (
+    Issue,
+    RosterMatcher,
+    parse_subjects,
+    parse_subjects_frame,
+    issues_from_subjects_text,
+    issues_to_subjects_text,
+    add_deadline_deltas,
+    aggregate_submissions,
+    SubmissionState,
+    BKTree,
+    FuzzyRosterIndex,
+    ResolvedTitleCache,
+)
+
+ROSTER = ["Achinoam Shoham", "Guy Vosco", "Dana Levi", "Li Wu", "José Núñez"]
+ASSIGNMENTS = ["Day01", "Day02", "Day03", "Day05"]
+
+SUBJECTS_TEXT = """\
+12\tCLOSED\tDay01 by Guy Vosco\t\t2025-11-01T10:00:00Z
+13\tOPEN\tDay 2 - Dana Levi\t\t2025-11-05T21:59:59Z
+14\tCLOSED\tAssignment (day 3): Achinoam Shoham\t\t2025-11-09T08:15:00Z
+15\tCLOSED\tday05: guy vosco\t\t2025-11-20T23:00:00Z
+16\tOPEN\tFinal project proposal by Dana Levi\t\t2026-01-03T18:44:38Z
+17\tCLOSED\tDay01 by Guy Vosco (fixed)\t\t2025-11-02T09:00:00Z
+18\tCLOSED\tDay01 by Guy Vosco\t\t2025-11-01T12:00:00Z
+19\tCLOSED\tDay02 by Someone New\t\t2025-11-04T10:00:00Z
+20\tCLOSED\tmy homework\t\t2025-11-04T10:00:00Z
+x\tOPEN\tAssignment 3 - Li Wu\t\t2025-11-08T10:00:00Z
+21\tCLOSED\tDay03 José Núñez\t\t2025-11-08T11:00:00Z
+
+broken line without tabs
+"""
+
+
+def flatten(data):
+    # "_all" holds the latest entry itself, so compare issue ids instead of the nested dicts
+    return {
+        (student, assignment): (
+            {k: v for k, v in entry.items() if k != "_all"},
+            [e["issue_id"] for e in entry.get("_all", [])],
+        )
+        for student, per_student in data.items()
+        for assignment, entry in per_student.items()
+    }
+
+
+def test_parse_subjects_tsv():
+    data = parse_subjects(SUBJECTS_TEXT, ROSTER, ASSIGNMENTS)
+
+    assert data["Dana Levi"]["Day02"] == {
+        "status": "OPEN", "time": "2025-11-05T21:59:59Z", "format": "Day## - Name", "issue_id": 13,
+    }
+    assert data["Achinoam Shoham"]["Day03"]["format"] == "Assignment (day ##): ..."
+    assert data["Guy Vosco"]["Day05"]["format"] == "Day##: Name"
+    assert data["Li Wu"]["UNKNOWN"]["issue_id"] is None
+    assert data["Someone New"]["Day02"]["issue_id"] == 19
+    assert data["UNKNOWN"]["UNKNOWN"]["format"] == "Other"
+
+    # Repeated (student, assignment): latest by time wins, all kept under "_all"
+    day01 = data["Guy Vosco"]["Day01"]
+    assert day01["issue_id"] == 17
+    assert [e["issue_id"] for e in day01["_all"]] == [12, 17, 18]
+    assert [e for e in day01["_all"] if "_all" in e] == [day01]
+
+
+def test_many_duplicates():
+    times = ["2025-11-01T10:00:00Z", "2025-11-03T10:00:00Z", "2025-11-02T10:00:00Z", "2025-11-03T10:00:00Z",
+             "2025-11-04T10:00:00Z", "2025-10-30T10:00:00Z"] * 50
+    issues = [Issue(n, "OPEN", "Day01 by Dana Levi", t) for n, t in enumerate(times)]
+    entry = parse_subjects(issues, ROSTER, ASSIGNMENTS)["Dana Levi"]["Day01"]
+
+    assert entry["issue_id"] == 4  # first of the newest
+    assert [e["issue_id"] for e in entry["_all"]] == list(range(len(times)))
+    assert sum("_all" in e for e in entry["_all"]) == 1
+
+
+def test_issue_records_same_as_tsv():
+    issues = list(issues_from_subjects_text(SUBJECTS_TEXT))
+    assert issues[0] == Issue(12, "CLOSED", "Day01 by Guy Vosco", "2025-11-01T10:00:00Z")
+    expected = flatten(parse_subjects(SUBJECTS_TEXT, ROSTER, ASSIGNMENTS))
+    assert flatten(parse_subjects(issues, ROSTER, ASSIGNMENTS)) == expected
+
+    # TSV export / import round trip
+    assert list(issues_from_subjects_text(issues_to_subjects_text(issues))) == issues
+
+
+
+def random_issues(seed, n=500):
+    rnd = random.Random(seed)
+    names = ROSTER + ["Someone New", "guy", "Dana"]
+    formats = ["Day{d:02d} by {n}", "Day {d} - {n}", "Assignment (day {d}): {n}", "day{d} {n}", "{n}: day {d}",
+               "Assignment {d} by {n}", "Final project proposal by {n}", "{n}", "Day{d} by ({n})", "Day{d} by "]
+    issues = []
+    for number in range(n):
+        title = rnd.choice(formats).format(d=rnd.randint(1, 6), n=rnd.choice(names))
+        created = f"2025-11-{rnd.randint(1, 3):02d}T{rnd.randint(0, 23):02d}:00:00Z"
+        issues.append(Issue(number if number % 50 else None, rnd.choice(["OPEN", "CLOSED"]), title, created))
+    return issues
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_pandas_backend_same_as_python(seed):
+    issues = random_issues(seed) + list(issues_from_subjects_text(SUBJECTS_TEXT))
+    python = parse_subjects(issues, ROSTER, ASSIGNMENTS)
+    pandas = parse_subjects(issues, ROSTER, ASSIGNMENTS, backend="pandas")
+    assert flatten(pandas) == flatten(python)
+    assert list(pandas) == list(python)
+
+
+def test_subjects_frame():
+    df = parse_subjects_frame(SUBJECTS_TEXT, ROSTER, ASSIGNMENTS)
+    assert len(df) == 11
+    row = df.iloc[0].to_dict()
+    assert row == {
+        "issue_id": 12, "status": "CLOSED", "time": "2025-11-01T10:00:00Z", "title": "Day01 by Guy Vosco",
+        "student": "Guy Vosco", "assignment": "Day01", "format": "Day## by Name",
+    }
+
+    with pytest.raises(ValueError):
+        parse_subjects(SUBJECTS_TEXT, ROSTER, ASSIGNMENTS, backend="numba")
+
+
+def naive_longest_match(text, roster_lookup):
+    best, best_len = None, 0
+    for key, canonical in roster_lookup.items():
+        if len(key) >= 4 and key in text and len(key) > best_len:
+            best, best_len = canonical, len(key)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_roster_matcher_same_as_substring_loop(seed):
+    rnd = random.Random(seed)
+    syllables = ["an", "na", "ana", "el", "li", "da", "dan", "ya", "ron", "on", "i", "a"]
+    word = lambda: "".join(rnd.choice(syllables) for _ in range(rnd.randint(1, 3)))
+    roster = [f"{word().title()} {word().title()}" for _ in range(40)] + ["Dan", "Anna Ana"]
+    lookup = _build_roster_lookup(roster)
+    matcher = RosterMatcher(lookup)
+
+    for _ in range(300):
+        name = rnd.choice(roster)
+        title = _simplify(f"Day{rnd.randint(1, 12):02d} by {word()}{name[rnd.randint(0, 3):]} {word()} {word()}")
+        assert matcher.longest_match(title) == naive_longest_match(title, lookup)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_incremental_state_same_as_full_run(seed):
+    rnd = random.Random(seed)
+    deadlines = {a: f"2025-11-02T{rnd.randint(0, 23):02d}:00:00Z" for a in ASSIGNMENTS}
+    state = SubmissionState(ROSTER, deadlines)
+    store = {}
+
+    for batch in range(6):
+        # new issues, retitled ones (they move to another cell) and closed ones
+        changed = [i._replace(number=n) for n, i in enumerate(random_issues(seed * 10 + batch, 60), start=len(store))]
+        for number in rnd.sample(sorted(store), min(len(store), 20)):
+            new = random_issues(rnd.random(), 1)[0]
+            changed.append(store[number]._replace(title=new.title, state=new.state))
+        store.update((i.number, i) for i in changed)
+        state.apply(changed)
+
+        issues = [store[n] for n in sorted(store, reverse=True)]
+        full = add_deadline_deltas(parse_subjects(issues, ROSTER, ASSIGNMENTS), deadlines)
+        assert flatten(state.submissions) == flatten(full)
+
+        agg = aggregate_submissions(full, ROSTER, ASSIGNMENTS)
+        assert state.aggregates.cell_status == agg.cell_status
+        assert state.aggregates.assignment_counts == agg.assignment_counts
+        assert {a: +c for a, c in state.aggregates.format_counts.items() if +c} == {a: c for a, c in agg.format_counts.items() if c}
+        assert sorted(state.aggregates.on_time_times) == sorted(agg.on_time_times)
+        assert state.aggregates.student_formats == agg.student_formats
+        for student, total in agg.student_delta_sum.items():
+            assert state.aggregates.student_delta_sum[student] == pytest.approx(total)
+
+
+def dp_levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_bk_tree_same_as_linear_scan(seed):
+    rnd = random.Random(seed)
+    word = lambda: "".join(rnd.choice("aben dlos") for _ in range(rnd.randint(0, 12)))
+    words = list({word() for _ in range(300)})
+    tree = BKTree(words)
+    assert tree.size == len(words)
+
+    for _ in range(100):
+        query, limit = word(), rnd.randint(0, 3)
+        assert [d for d, _w in tree.search(query, limit)] == sorted(d for d, _w in tree.search(query, limit))
+        assert {w: d for d, w in tree.search(query, limit)} == {
+            w: dp_levenshtein(query, w) for w in words if dp_levenshtein(query, w) <= limit
+        }
+        other = word()
+        assert _levenshtein(query, other) == dp_levenshtein(query, other)
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("Day03 by Guy Vosko", "Guy Vosco"),              # typo after "by"
+    ("Day 2 - Dan Levy", "Dana Levi"),                # typo after " - "
+    ("day3 Achinoam Shoam final", "Achinoam Shoham"),  # no separator: runs of title words
+    ("Day02 by Someone New", None),                   # not close to anyone
+    ("Day02 by Guy", None),                           # too short to match
+    ("my homework", None),
+])
+def test_fuzzy_roster_index(title, expected):
+    index = FuzzyRosterIndex(ROSTER, cache=None)
+    assert index.resolve(title, _tail_guess(title)) == expected
+
+
+def test_fuzzy_roster_index_ambiguous():
+    index = FuzzyRosterIndex(["Dana Levi", "Dina Levi"], cache=None)
+    assert index.resolve("Day01 by Dena Levi", "Dena Levi") is None  # one edit from both
+    assert index.resolve("Day01 by Dana Levy", "Dana Levy") == "Dana Levi"
+
+
+def test_parse_subjects_fuzzy(tmp_path):
+    typos = [
+        Issue(1, "OPEN", "Day01 by Guy Vosko", "2025-11-01T10:00:00Z"),
+        Issue(2, "OPEN", "Day 2 - Dan Levy", "2025-11-01T10:00:00Z"),
+        Issue(3, "OPEN", "Day02 by Someone New", "2025-11-01T10:00:00Z"),
+        Issue(4, "OPEN", "Day03 by ", "2025-11-01T10:00:00Z"),
+    ]
+    data = parse_subjects(typos, ROSTER, ASSIGNMENTS)
+    assert data["Guy Vosco"]["Day01"]["issue_id"] == 1
+    assert data["Dana Levi"]["Day02"]["issue_id"] == 2
+    assert data["Someone New"]["Day02"]["issue_id"] == 3
+    assert data["UNKNOWN"]["Day03"]["issue_id"] == 4
+
+    plain = parse_subjects(typos, ROSTER, ASSIGNMENTS, fuzzy=False)
+    assert plain["Guy Vosko"]["Day01"]["issue_id"] == 1
+    assert flatten(parse_subjects(typos, ROSTER, ASSIGNMENTS, backend="pandas")) == flatten(data)
+    assert flatten(parse_subjects(typos, ROSTER, ASSIGNMENTS, backend="pandas", fuzzy=False)) == flatten(plain)
+
+    # resolved titles are cached (None included) and survive a save / load
+    cache = ResolvedTitleCache()
+    index = FuzzyRosterIndex(ROSTER, cache=cache)
+    assert [index.resolve(i.title, _tail_guess(i.title)) for i in typos] == ["Guy Vosco", "Dana Levi", None, None]
+    assert index.searches == 4
+    cache.save(tmp_path / "resolved.json")
+
+    loaded = ResolvedTitleCache()
+    loaded.load(tmp_path / "resolved.json")
+    index = FuzzyRosterIndex(ROSTER, cache=loaded)
+    assert [index.resolve(i.title, _tail_guess(i.title)) for i in typos] == ["Guy Vosco", "Dana Levi", None, None]
+    assert index.searches == 0
+    assert loaded.stats() == {"hits": 4, "misses": 0, "entries": 4}
+
+    # another roster does not see these results
+    assert FuzzyRosterIndex(ROSTER + ["Guy Vosko"], cache=loaded).resolve("Day01 by Guy Vosko") == "Guy Vosko"
+    assert loaded.stats()["entries"] == 5
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
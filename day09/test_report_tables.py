@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+
+'''
+pytest test suite for the report tables and aggregates in utilities module.
+The roster, deadlines and issues are hardcoded for testing purposes.
+'''
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import json
+import random
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+import report
+from utilities import (
+    Issue,
+    parse_subjects,
+    add_deadline_deltas,
+    aggregate_submissions,
+    make_submissions_status_table,
+    print_per_assignment_summary,
+    make_student_habits_table,
+    make_deadline_window_table,
+    DeadlineIndex,
+    SubmissionColumns,
+    format_delta,
+    build_deadline_epochs,
+    timestamp_cache_info,
+    local_time_histogram,
+    on_time_figure_specs,
+    format_popularity_figure_spec,
+    render_figures,
+    figure_pool,
+    PARALLEL_FIGURES_MIN,
+    plot_on_time_distributions,
+    plot_subject_format_popularity,
+    export_report,
+    iter_submission_frames,
+    RunTrace,
+)
+
+ROSTER = ["Ann Lee", "Bob Stone", "Cy Twain"]
+ASSIGNMENTS = ["Day01", "Day02"]
+DEADLINES = {"Day01": "2025-11-01T22:00:00Z", "Day02": "2025-11-08T22:00:00Z"}
+ISSUES = [
+    Issue(1, "CLOSED", "Day01 by Ann Lee", "2025-11-01T10:00:00Z"),    # 12h early
+    Issue(2, "OPEN", "Day02 by Ann Lee", "2025-11-09T00:00:00Z"),      # 2h late
+    Issue(3, "CLOSED", "Day01 - Bob Stone", "2025-11-01T23:00:00Z"),   # 1h late (latest)
+    Issue(4, "CLOSED", "Day01 by Bob Stone", "2025-11-01T21:00:00Z"),  # 1h early (repeat)
+    Issue(5, "OPEN", "Day02: Bob Stone", "2025-11-08T20:00:00Z"),      # 2h early
+]
+
+
+@pytest.fixture
+def submissions():
+    return add_deadline_deltas(parse_subjects(ISSUES, ROSTER, ASSIGNMENTS), DEADLINES, delta_key="delta_to_deadline")
+
+
+@pytest.mark.parametrize("time, deadline, seconds, text", [
+    ("2025-11-01T10:00:00Z", "2025-11-01T22:00:00Z", -43200, "-1 day, 12:00:00"),
+    ("2025-11-02T01:10:00Z", "2025-11-01T22:00:00Z", 11400, "3:10:00"),
+    ("2025-11-01T22:00:00Z", "2025-11-02T00:00:00+02:00", 0, "0:00:00"),
+    ("2025-11-01T21:59:59.5Z", "2025-11-01T22:00:00Z", 0, "-1 day, 23:59:59.500000"),
+    ("not a time", "2025-11-01T22:00:00Z", None, None),
+    ("2025-11-01T10:00:00Z", "", None, None),
+])
+def test_deadline_deltas(time, deadline, seconds, text):
+    submissions = {"Ann Lee": {"Day01": {"time": time}}}
+    entry = add_deadline_deltas(submissions, {"Day01": deadline}, delta_key="delta_to_deadline")["Ann Lee"]["Day01"]
+    assert (entry["delta_seconds"], entry["delta_to_deadline"]) == (seconds, text)
+
+    # seconds only (the default); the string can be built later, on demand
+    entry = add_deadline_deltas({"Ann Lee": {"Day01": {"time": time}}}, {"Day01": deadline})["Ann Lee"]["Day01"]
+    assert "delta_to_deadline" not in entry and entry["delta_seconds"] == seconds
+    if seconds is not None:
+        assert format_delta(seconds * 1_000_000) == str(timedelta(seconds=seconds))
+
+
+def test_deadline_epochs_cache():
+    epochs = build_deadline_epochs({**DEADLINES, "Day03": ""})
+    assert epochs == {"Day01": 1762034400_000000, "Day02": 1762639200_000000, "Day03": None}
+
+    # The deadlines are served from the cache the next time
+    before = timestamp_cache_info()
+    assert build_deadline_epochs(DEADLINES) == {a: epochs[a] for a in DEADLINES}
+    after = timestamp_cache_info()
+    assert after["hits"] == before["hits"] + len(DEADLINES) and after["misses"] == before["misses"]
+
+    # The issue times do not go through it (read in one batch), so they cannot evict the deadlines
+    submissions = add_deadline_deltas(parse_subjects(ISSUES, ROSTER, ASSIGNMENTS), DEADLINES, deadline_epochs=epochs)
+    aggregate_submissions(submissions, ROSTER, ASSIGNMENTS).local_time_counts("Asia/Jerusalem")
+    assert timestamp_cache_info() == after
+    assert after["size"] <= after["maxsize"]
+    assert submissions["Ann Lee"]["Day02"]["delta_seconds"] == 7200
+
+
+def test_status_table(submissions):
+    header, rows = make_submissions_status_table(ROSTER, ASSIGNMENTS, submissions)
+    assert header == ["Student", "Day01", "Day02", "Total Late", "Total Missing"]
+    assert rows == [
+        ["Ann Lee", "On-time", "Late", 1, 0],
+        ["Bob Stone", "Late", "On-time", 1, 0],
+        ["Cy Twain", "Missing", "Missing", 0, 2],
+    ]
+
+
+def test_per_assignment_summary(submissions):
+    assert print_per_assignment_summary(ROSTER, ASSIGNMENTS, submissions) == {
+        "Day01": (1, 1, 1, 0),
+        "Day02": (1, 1, 1, 2),
+    }
+
+
+def test_deadline_window_table(submissions):
+    # latest entries: Day01 Ann -12h, Bob +1h; Day02 Ann +2h, Bob -2h
+    header, rows = make_deadline_window_table(ROSTER, ASSIGNMENTS, submissions, hours=[1, 2.5, 24])
+    assert header == ["Assignment", "Last 1h", "Last 2.5h", "Last 24h", "Late <= 1h", "Late <= 2.5h", "Late <= 24h"]
+    assert rows == [
+        ["Day01", 0, 0, 1, 1, 1, 1],
+        ["Day02", 0, 1, 1, 0, 1, 1],
+    ]
+    agg = aggregate_submissions(submissions, ROSTER, ASSIGNMENTS)
+    assert make_deadline_window_table(ROSTER, ASSIGNMENTS, submissions, aggregates=agg) == make_deadline_window_table(
+        ROSTER, ASSIGNMENTS, submissions
+    )
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_deadline_index_same_as_scan(seed):
+    rnd = random.Random(seed)
+    index = DeadlineIndex()
+    cells = []
+    for _ in range(300):
+        if cells and rnd.random() < 0.3:
+            index.remove(*cells.pop(rnd.randrange(len(cells))))
+        else:
+            cell = (rnd.choice(ASSIGNMENTS), rnd.choice([None, rnd.randint(-3 * 86400, 86400)]), rnd.random() < 0.5)
+            index.add(*cell)
+            cells.append(cell)
+
+        a = rnd.choice(ASSIGNMENTS)
+        deltas = [d for a2, d, _u in cells if a2 == a and d is not None]
+        assert index.on_time_late(a) == (sum(d <= 0 for d in deltas), sum(d > 0 for d in deltas))
+        assert index.unchecked(a) == sum(u for a2, _d, u in cells if a2 == a)
+        assert list(index.deltas(a)) == sorted(deltas)
+
+        lo, hi = sorted(rnd.randint(-3 * 86400, 86400) for _ in range(2))
+        assert index.count_between(a, lo, hi) == sum(lo <= d <= hi for d in deltas)
+        hours = [rnd.uniform(0, 72) for _ in range(5)]
+        assert list(index.window_counts(a, hours)) == [index.submitted_within(a, h) for h in hours] == [
+            sum(-h * 3600 <= d <= 0 for d in deltas) for h in hours
+        ]
+        assert index.late_within(a, hours[0]) == sum(0 < d <= hours[0] * 3600 for d in deltas)
+
+
+def test_habits_table(submissions):
+    _header, rows = make_student_habits_table(ROSTER, submissions)
+    assert rows == [
+        ["Ann Lee", 5.0, 1, {"Day## by Name"}],
+        ["Bob Stone", 0.67, 3, {"Day## - Name", "Day## by Name", "Day##: Name"}],
+        ["Cy Twain", None, 0, set()],
+    ]
+
+
+def test_single_aggregation_pass(submissions):
+    agg = aggregate_submissions(submissions, ROSTER, ASSIGNMENTS)
+
+    # Same tables from the shared aggregates
+    for func, args in [
+        (make_submissions_status_table, (ROSTER, ASSIGNMENTS, submissions)),
+        (print_per_assignment_summary, (ROSTER, ASSIGNMENTS, submissions)),
+        (make_student_habits_table, (ROSTER, submissions)),
+    ]:
+        assert func(*args, aggregates=agg) == func(*args)
+
+    assert agg.format_counts["Day01"] == {"Day## by Name": 2, "Day## - Name": 1}
+
+    # On-time latest entries: Sat 12:00 and Sat 22:00 in Israel (UTC+2 in November)
+    weekday_counts, hour_counts = agg.local_time_counts("Asia/Jerusalem")
+    assert weekday_counts == {5: 2}
+    assert hour_counts == {12: 1, 22: 1}
+
+
+@pytest.mark.parametrize("tz_name", ["Asia/Jerusalem", "America/New_York", "UTC", "Asia/Kolkata"])
+def test_local_time_histogram(tz_name):
+    # Every 37 minutes over 2025, so the DST transitions are crossed
+    start = 1735689600_000000
+    epochs = [start + i * 37 * 60_000_000 for i in range(14_000)]
+    expected = [[0] * 24 for _ in range(7)]
+    for us in epochs:
+        local = datetime.fromtimestamp(us / 1_000_000, timezone.utc).astimezone(ZoneInfo(tz_name))
+        expected[local.weekday()][local.hour] += 1
+
+    histogram = local_time_histogram(epochs, tz_name)
+    assert histogram.shape == (7, 24) and histogram.tolist() == expected
+    assert local_time_histogram([], tz_name).sum() == 0
+
+
+def test_columnar_model(submissions):
+    cols = SubmissionColumns.from_dict(submissions)
+    assert len(cols) == 5
+    assert cols.time.dtype == "datetime64[us]" and cols.delta_seconds.dtype == "int64"
+
+    # The masks classify like the aggregates (latest issue of each roster cell)
+    agg = aggregate_submissions(submissions, ROSTER, ASSIGNMENTS)
+    latest = cols.is_latest
+    assert (int((cols.on_time_mask() & latest).sum()), int((cols.late_mask() & latest).sum())) == (
+        sum(c[0] for c in agg.assignment_counts.values()), sum(c[1] for c in agg.assignment_counts.values())
+    )
+
+    # The dict view is the same as the original nested dict
+    view = cols.to_dict()
+    assert list(view) == list(submissions)
+    for student, per_student in submissions.items():
+        for assignment, entry in per_student.items():
+            got = view[student][assignment]
+            assert {k: v for k, v in got.items() if k != "_all"} == {k: v for k, v in entry.items() if k != "_all"}
+            assert [e["issue_id"] for e in got.get("_all", [])] == [e["issue_id"] for e in entry.get("_all", [])]
+
+
+
+def test_columnar_round_trip():
+    # fractional seconds and UTC offsets survive from_dict -> to_dict, with no NumPy tz parsing
+    submissions = {
+        "Ann Lee": {
+            "Day01": {"status": "OPEN", "time": "2025-11-01T21:59:59.500Z", "format": "Day## by Name", "issue_id": 1},
+            "Day02": {"status": "CLOSED", "time": "2025-11-09T00:30:00+02:00", "format": "Day## by Name", "issue_id": 2},
+            "Day03": {"status": "OPEN", "time": "not a time", "format": "Day## by Name", "issue_id": 3},
+        }
+    }
+    add_deadline_deltas(
+        submissions, {"Day01": "2025-11-01T22:00:00Z", "Day02": "2025-11-08T22:00:00Z", "Day03": ""},
+        delta_key="delta_to_deadline",
+    )
+    assert submissions["Ann Lee"]["Day01"]["delta_to_deadline"] == "-1 day, 23:59:59.500000"
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        cols = SubmissionColumns.from_dict(submissions)
+    assert cols.time[:2].astype(np.int64).tolist() == [1762034399_500000, 1762641000_000000]
+    assert np.isnat(cols.time[2])
+    assert cols.to_dict() == submissions
+
+    # without the strings (seconds-only deltas) they are rebuilt from delta_seconds
+    add_deadline_deltas(submissions, {"Day01": "2025-11-01T22:00:00Z", "Day02": "2025-11-08T22:00:00Z"})
+    for entry in submissions["Ann Lee"].values():
+        entry.pop("delta_to_deadline", None)
+    view = SubmissionColumns.from_dict(submissions).to_dict()
+    assert view["Ann Lee"]["Day02"]["delta_to_deadline"] == "0:30:00"
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_render_figures(submissions, tmp_path, max_workers):
+    agg = aggregate_submissions(submissions, ROSTER, ASSIGNMENTS)
+    specs = on_time_figure_specs(agg, "Asia/Jerusalem") + [format_popularity_figure_spec(agg, ASSIGNMENTS)]
+    assert specs[0].series == [(None, [0, 0, 0, 0, 0, 0, 2])]
+
+    paths = render_figures(specs, str(tmp_path / "plots"), ["png", "svg"], max_workers=max_workers)
+    names = ["on_time_by_weekday", "on_time_by_hour", "subject_format_popularity"]
+    assert paths == [str(tmp_path / "plots" / f"{n}.{fmt}") for n in names for fmt in ["png", "svg"]]
+    for path in paths:
+        with open(path, "rb") as fh:
+            head = fh.read(64)
+        assert head.startswith(b"\x89PNG") if path.endswith(".png") else b"<svg" in head or b"<?xml" in head
+
+    # The plot functions write the same files instead of showing them, here in one shared pool
+    with figure_pool(2) as pool:
+        assert plot_on_time_distributions(submissions, output_dir=str(tmp_path), aggregates=agg, pool=pool) == [
+            str(tmp_path / "on_time_by_weekday.png"), str(tmp_path / "on_time_by_hour.png")
+        ]
+        assert plot_subject_format_popularity(
+            submissions, ASSIGNMENTS, output_dir=str(tmp_path), aggregates=agg, pool=pool
+        ) == [str(tmp_path / "subject_format_popularity.png")]
+
+
+def test_render_few_figures_in_process(submissions, tmp_path, monkeypatch):
+    # A handful of figures is cheaper to draw here than to start (spawn) a pool for
+    def no_pool(*args, **kwargs):
+        raise AssertionError("figure_pool started")
+
+    monkeypatch.setattr(report, "figure_pool", no_pool)
+    agg = aggregate_submissions(submissions, ROSTER, ASSIGNMENTS)
+    specs = on_time_figure_specs(agg, "Asia/Jerusalem")
+    assert len(specs) < PARALLEL_FIGURES_MIN
+    assert len(render_figures(specs, str(tmp_path), ["png"])) == len(specs)
+
+
+def export(submissions, output_dir, formats, chunk_size=50_000):
+    return export_report(
+        str(output_dir),
+        status_table=make_submissions_status_table(ROSTER, ASSIGNMENTS, submissions),
+        summary=print_per_assignment_summary(ROSTER, ASSIGNMENTS, submissions),
+        habits_table=make_student_habits_table(ROSTER, submissions),
+        submissions=submissions,
+        formats=formats,
+        chunk_size=chunk_size,
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+def test_export_csv_json(submissions, tmp_path, chunk_size):
+    paths = export(submissions, tmp_path, ["csv", "json"], chunk_size)
+    assert [p.rsplit("/", 1)[1] for p in paths] == [
+        f"{name}.{fmt}" for fmt in ["csv", "json"] for name in ["status", "summary", "habits", "submissions"]
+    ]
+
+    status = pd.read_csv(tmp_path / "status.csv")
+    assert status.values.tolist() == make_submissions_status_table(ROSTER, ASSIGNMENTS, submissions)[1]
+    summary = pd.read_json(tmp_path / "summary.json", lines=True)
+    assert summary.values.tolist() == [["Day01", 1, 1, 1, 0], ["Day02", 1, 1, 1, 2]]
+    habits = pd.read_csv(tmp_path / "habits.csv")
+    assert habits["Formats"][1] == "Day## - Name; Day## by Name; Day##: Name"
+
+    # Long format: one row per issue, the same whatever the chunk size
+    rows = pd.read_csv(tmp_path / "submissions.csv")
+    assert len(rows) == len(ISSUES) and rows["is_latest"].sum() == 4
+    bob = rows[(rows["student"] == "Bob Stone") & (rows["assignment"] == "Day01")]
+    assert bob[["issue_id", "delta_seconds", "is_latest"]].values.tolist() == [[3, 3600, True], [4, -3600, False]]
+    assert pd.read_json(tmp_path / "submissions.json", lines=True)["issue_id"].tolist() == rows["issue_id"].tolist()
+
+
+def test_export_chunks_and_errors(submissions, tmp_path):
+    frames = list(iter_submission_frames(submissions, chunk_size=2))
+    assert [len(df) for df in frames] == [2, 2, 1]
+    assert all(df.dtypes.equals(frames[0].dtypes) for df in frames)
+    assert [len(df) for df in iter_submission_frames({})] == [0]
+
+    with pytest.raises(ValueError):
+        export(submissions, tmp_path, ["xlsx"])
+
+
+def test_export_parquet(submissions, tmp_path):
+    pytest.importorskip("pyarrow")
+    export(submissions, tmp_path, ["parquet"], chunk_size=2)
+    rows = pd.read_parquet(tmp_path / "submissions.parquet", memory_map=True)
+    assert len(rows) == len(ISSUES) and str(rows["issue_id"].dtype) == "Int64"
+
+
+def test_run_trace(tmp_path):
+    with RunTrace(profile=True, trace_memory=True, top=5) as trace:
+        with trace.stage("parse_subjects"):
+            submissions = parse_subjects(ISSUES * 200, ROSTER, ASSIGNMENTS)
+        with trace.stage("deadline_deltas") as stage:
+            add_deadline_deltas(submissions, DEADLINES)
+            stage["entries"] = len(submissions)
+        trace.count("issues", len(ISSUES) * 200)
+
+    path = tmp_path / "trace.json"
+    trace.save(str(path))
+    data = json.loads(path.read_text())
+    assert [s["name"] for s in data["stages"]] == ["parse_subjects", "deadline_deltas"]
+    for stage in data["stages"]:
+        assert stage["wall_s"] >= 0 and stage["cpu_s"] >= 0 and stage["peak_bytes"] > 0
+    assert data["stages"][1]["entries"] == 2
+    assert data["wall_s"] >= sum(s["wall_s"] for s in data["stages"])
+
+    counters = data["counters"]
+    assert counters["custom"] == {"issues": 1000}
+    assert set(counters) >= {"http", "http_cache", "readme_cache", "timestamp_cache", "regex"}
+    assert counters["regex"]["subject_format_cache_hits"] > 0
+
+    assert len(data["profile"]) == 5 and any("parse_subjects" in p["function"] for p in data["profile"])
+    assert data["memory"]["peak_bytes"] > 0 and len(data["memory"]["top"]) <= 5
+    assert (tmp_path / "trace.json.prof").exists()
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
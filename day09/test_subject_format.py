@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+'''
+pytest test suite for the subject format classifier in utilities module.
+The combined-regex classifier must return exactly the labels of the original
+pattern-by-pattern implementation (copied below as the reference).
+'''
+
+import itertools
+import re
+
+import pytest
+from roster import _classify_subject_format
+
+
+def reference_classify_subject_format(title: str) -> str:
+    t = title.strip()
+
+    has_by = bool(re.search(r"(?i)\bby\b", t))
+    has_day = bool(re.search(r"(?i)\bday\s*0?\d{1,2}\b", t))
+    has_assignment = bool(re.search(r"(?i)\bassignment\b", t))
+
+    patterns = [
+        (r"(?i)^\s*day\s*0?\d{1,2}\s+by\s+.+$", "Day## by Name"),
+        (r"(?i)^\s*day\s*0?\d{1,2}\s*[-–—]\s*.+$", "Day## - Name"),
+        (r"(?i)^\s*day\s*0?\d{1,2}\s*:\s*.+$", "Day##: Name"),
+        (r"(?i)^\s*day\s*0?\d{1,2}\s+.+$", "Day## Name (no separator)"),
+        (r"(?i)^\s*assignment\s*\(?\s*day\s*0?\d{1,2}\s*\)?\s*[-–—:]\s*.+$", "Assignment (day ##): ..."),
+        (r"(?i)^\s*assignment\s*0?\d{1,2}\s*[-–—]\s*.+$", "Assignment ## - ..."),
+        (r"(?i)^\s*assignment\s*0?\d{1,2}\s+by\s+.+$", "Assignment ## by Name"),
+        (r"(?i)^\s*assignment\s*0?\d{1,2}\s*:\s*.+$", "Assignment ##: ..."),
+        (r"(?i)^\s*final\s+project\s+proposal\s+by\s+.+$", "Final Project Proposal by Name"),
+        (r"(?i)^\s*final\s+project\s+.*$", "Final Project (other)"),
+        (r"(?i).*\bday\s*0?\d{1,2}\b.*\bby\b.*", "... Day## ... by ..."),
+        (r"(?i).*\bassignment\b.*\bday\s*0?\d{1,2}\b.*", "... Assignment ... day## ..."),
+    ]
+
+    for pat, label in patterns:
+        if re.match(pat, t):
+            return label
+
+    if has_day and has_by:
+        return "Other (mentions Day## + by)"
+    if has_day:
+        return "Other (mentions Day##)"
+    if has_assignment:
+        return "Other (mentions Assignment)"
+    return "Other"
+
+
+PREFIXES = ["", " ", "Re: ", "HW ", "[submission] "]
+HEADS = ["Day01", "day 2", "DAY03", "Day 10", "day123", "Assignment", "assignment 4", "Assignment (day 5)",
+         "Assignment day 6", "Final project", "Final Project proposal", "final   project", "Homework", "Dayo1"]
+SEPARATORS = ["", " ", " by ", " - ", " – ", "—", ": ", " : ", " (", ", by "]
+TAILS = ["", "Guy Vosco", "by Dana", "day 7", "Stand-by mode", "José", " "]
+
+TITLES = ["".join(parts) for parts in itertools.product(PREFIXES, HEADS, SEPARATORS, TAILS)]
+
+
+def test_same_labels_as_reference():
+    mismatches = [
+        (t, _classify_subject_format(t), reference_classify_subject_format(t))
+        for t in TITLES
+        if _classify_subject_format(t) != reference_classify_subject_format(t)
+    ]
+    assert mismatches == []
+
+
+def test_all_labels_covered():
+    labels = {reference_classify_subject_format(t) for t in TITLES}
+    assert len(labels) == 16
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("Day01 by Guy Vosco", "Day## by Name"),
+    ("Assignment (day 3): Achinoam Shoham", "Assignment (day ##): ..."),
+    ("Final project proposal by Dana Levi", "Final Project Proposal by Name"),
+    ("my homework", "Other"),
+])
+def test_memoized(title, expected):
+    before = _classify_subject_format.cache_info().hits
+    assert _classify_subject_format(title) == expected
+    assert _classify_subject_format(title) == expected
+    assert _classify_subject_format.cache_info().hits > before
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
@@ -1,767 +1,653 @@
+import cProfile
+import http.client
 import json
+import logging
+import multiprocessing
+import os
+import pstats
 import re
-from urllib.request import Request, urlopen
-from urllib.parse import urlencode
+import socket
+import time
+import tracemalloc
+from urllib.error import URLError
 from collections import Counter, defaultdict
-from typing import Dict, List, Tuple, Optional, Any
-from datetime import datetime, timezone
-from zoneinfo import ZoneInfo
-import matplotlib.pyplot as plt
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple, Optional, Any, Iterable, NamedTuple
+from contextlib import contextmanager, nullcontext
+import numpy as np
+import pandas as pd
+
+# The report is split into github_api (HTTP, issues, issue store), roster (README and title
+# parsing), report (deltas, aggregation, tables, figures) and export; their names are
+# re-exported here, so `from utilities import ...` keeps working.
+from github_api import (
+    HTTPCache,
+    HTTP_CACHE,
+    HTTPSession,
+    HTTP_SESSION,
+    fetch_text,
+    GITHUB_API,
+    GITHUB_HEADERS,
+    iter_json_array,
+    ISSUE_FIELDS,
+    iter_issue_records,
+    Issue,
+    iter_issues,
+    issues_from_subjects_text,
+    issues_to_subjects_text,
+    build_subjects_text_from_github_api,
+    STORE_FIELDS,
+    load_issue_store,
+    sync_issue_store,
+    update_issue_store,
+    issues_from_store,
+    _issue_from_record,
+    subjects_text_from_issue_store,
+)
+from roster import (
+    ReadmeCache,
+    README_CACHE,
+    parse_readme,
+    parse_subjects,
+    _add_submission,
+    _build_roster_lookup,
+    RosterMatcher,
+    BKTree,
+    ResolvedTitleCache,
+    RESOLVED_TITLE_CACHE,
+    FuzzyRosterIndex,
+    _extract_student,
+    _extract_assignment,
+    SUBJECT_FORMAT_PATTERNS,
+    _classify_subject_format,
+    SUBJECTS_FRAME_COLUMNS,
+    parse_subjects_frame,
+    subjects_frame_to_dict,
+)
+from report import (
+    parse_z_iso,
+    TIMESTAMP_CACHE_SIZE,
+    epoch_us_to_datetime,
+    timestamp_cache_info,
+    build_deadline_epochs,
+    local_time_histogram,
+    format_delta,
+    add_deadline_deltas,
+    DeadlineIndex,
+    ReportAggregates,
+    aggregate_submissions,
+    SubmissionColumns,
+    _assignment_sort_key,
+    make_submissions_status_table,
+    print_per_assignment_summary,
+    DEADLINE_WINDOW_HOURS,
+    make_deadline_window_table,
+    FigureSpec,
+    PARALLEL_FIGURES_MIN,
+    on_time_figure_specs,
+    format_popularity_figure_spec,
+    figure_pool,
+    render_figures,
+    plot_on_time_distributions,
+    plot_subject_format_popularity,
+    make_student_habits_table,
+)
+from export import (
+    EXPORT_FORMATS,
+    SUBMISSIONS_EXPORT_DTYPES,
+    iter_submission_rows,
+    iter_submission_frames,
+    export_report,
+)
+
+__all__ = [
+    # re-exported
+    "HTTPCache", "HTTP_CACHE", "HTTPSession", "HTTP_SESSION", "fetch_text", "GITHUB_API",
+    "GITHUB_HEADERS", "iter_json_array", "ISSUE_FIELDS", "iter_issue_records", "Issue",
+    "iter_issues", "issues_from_subjects_text", "issues_to_subjects_text",
+    "build_subjects_text_from_github_api", "STORE_FIELDS", "load_issue_store", "sync_issue_store",
+    "update_issue_store", "issues_from_store", "subjects_text_from_issue_store", "ReadmeCache",
+    "README_CACHE", "parse_readme", "parse_subjects", "RosterMatcher", "BKTree",
+    "ResolvedTitleCache", "RESOLVED_TITLE_CACHE", "FuzzyRosterIndex", "SUBJECT_FORMAT_PATTERNS",
+    "SUBJECTS_FRAME_COLUMNS", "parse_subjects_frame", "subjects_frame_to_dict", "parse_z_iso",
+    "TIMESTAMP_CACHE_SIZE", "epoch_us_to_datetime", "timestamp_cache_info", "build_deadline_epochs",
+    "local_time_histogram", "format_delta", "add_deadline_deltas", "DeadlineIndex",
+    "ReportAggregates", "aggregate_submissions", "SubmissionColumns",
+    "make_submissions_status_table", "print_per_assignment_summary", "DEADLINE_WINDOW_HOURS",
+    "make_deadline_window_table", "FigureSpec", "PARALLEL_FIGURES_MIN", "on_time_figure_specs",
+    "format_popularity_figure_spec", "figure_pool", "render_figures", "plot_on_time_distributions",
+    "plot_subject_format_popularity", "make_student_habits_table", "EXPORT_FORMATS",
+    "SUBMISSIONS_EXPORT_DTYPES", "iter_submission_rows", "iter_submission_frames", "export_report",
+    # defined here
+    "RAW_GITHUB", "CourseRepo", "parse_course_repo", "fetch_course", "analyze_course",
+    "COURSE_SUMMARY_COLUMNS", "course_summary_row", "write_course_report", "run_batch_report",
+    "RunTrace", "SubmissionState", "WATCH_RETRY_ERRORS", "watch_report",
+]
 
-# from __future__ import annotations
-
-def fetch_text(url):
-    with urlopen(url) as response:
-        return response.read().decode("utf-8")
-
-def build_subjects_text_from_github_api(github_user: str, github_repo: str| None = None) -> str:
-    """
-    Fetch ALL issues from GitHub (excluding PRs) and return a TSV string that matches subjects.txt format:
-        issue_number<TAB>OPEN/CLOSED<TAB>title<TAB><TAB>created_at
-
-    Uses issue.created_at (first submission time), not updated_at.
-    """
-
-    def next_link(headers) -> str | None:
-        link = headers.get("Link")
-        if not link:
-            return None
-        # Link: <...>; rel="next", <...>; rel="last"
-        for part in link.split(","):
-            part = part.strip()
-            m = re.match(r'<([^>]+)>\s*;\s*rel="([^"]+)"', part)
-            if m and m.group(2) == "next":
-                return m.group(1)
-        return None
-
-    def get_json(url: str):
-        headers = {
-            "Accept": "application/vnd.github+json",
-            "X-GitHub-Api-Version": "2022-11-28",
-            "User-Agent": "wis-python-course-script",
-        }
-
-        req = Request(url, headers=headers)
-        with urlopen(req) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-            return data, resp.headers
-
-    base = f"https://api.github.com/repos/{github_user}/{github_repo}/issues"
-    params = {"state": "all", "per_page": 100, "page": 1}
-    url = base + "?" + urlencode(params)
-
-    lines = []
-    while url:
-        items, headers = get_json(url)
+# ----------------------------
+# 4) Batch report over many course repositories
+# ----------------------------
 
-        for issue in items:
-            # The Issues endpoint can include PRs; exclude them
-            if "pull_request" in issue:
-                continue
+RAW_GITHUB = "https://raw.githubusercontent.com"
 
-            number = issue.get("number")
-            state = (issue.get("state") or "").upper()   # OPEN/CLOSED
-            title = issue.get("title") or ""
-            created_at = issue.get("created_at") or ""
 
-            # Match subjects.txt shape: id \t OPEN/CLOSED \t title \t\t created_at
-            lines.append(f"{number}\t{state}\t{title}\t\t{created_at}")
+class CourseRepo(NamedTuple):
+    github_user: str
+    github_repo: str
+    branch: str = "main"
 
-        url = next_link(headers)
+    @property
+    def name(self) -> str:
+        return f"{self.github_user}_{self.github_repo}"
 
-    return "\n".join(lines) + ("\n" if lines else "")
 
-# ----------------------------
-# 1) Parse README.md
-# ----------------------------
-
-def parse_readme(readme_text: str) -> Tuple[List[str], Dict[str, str]]:
-    """
-    Returns:
-      roster: list of student names under '## Students' table
-      deadlines: dict { 'Day01': '2025.11.01 22:00', ... } extracted from '* Dead-line: ...'
+def parse_course_repo(text: str) -> CourseRepo:
     """
-    lines = readme_text.splitlines()
-
-    roster = _parse_students_table(lines)
-    deadlines = _parse_day_deadlines(lines)
-
-    return roster, deadlines
-
-
-def _parse_students_table(lines: List[str]) -> List[str]:
-    # Find the "## Students" section
-    start = None
-    for i, line in enumerate(lines):
-        if re.match(r"^\s*##\s+Students\s*$", line):
-            start = i + 1
-            break
-    if start is None:
-        return []
-
-    # End at next ## heading
-    end = len(lines)
-    for j in range(start, len(lines)):
-        if re.match(r"^\s*##\s+\S+", lines[j]):
-            end = j
-            break
-
-    section = lines[start:end]
-
-    # Collect markdown table lines
-    table_lines = [ln for ln in section if ln.strip().startswith("|")]
-    if len(table_lines) < 3:
-        return []
-
-    # Skip header + separator, parse data rows
-    roster = []
-    for row in table_lines[2:]:
-        cells = [c.strip() for c in row.strip().strip("|").split("|")]
-        if not cells:
-            continue
-
-        # In this README, the FIRST cell is like: [Achinoam Shoham](https://...)
-        m = re.search(r"\[([^\]]+)\]\(", cells[0])
-        if m:
-            name = _norm(m.group(1))
-            if name:
-                roster.append(name)
-
-    # De-duplicate preserving order
-    seen = set()
-    out = []
-    for n in roster:
-        k = n.casefold()
-        if k not in seen:
-            seen.add(k)
-            out.append(n)
-    return out
-
-
-def _parse_day_deadlines(lines: List[str]) -> Dict[str, str]:
+    'user/repo' or 'user/repo@branch' -> CourseRepo (ValueError if malformed).
     """
-    Extract deadlines for assignments as ISO like subjects.txt: YYYY-MM-DDTHH:MM:SSZ
-
-    Strategy:
-      - Find "### Assignment (day N)" (case-insensitive).
-      - Search forward until the NEXT "### Assignment (day ...)" heading (or end of file),
-        and within that range take the FIRST occurrence of "Dead-line:".
-      - Convert "YYYY.MM.DD HH:MM" into "YYYY-MM-DDTHH:MM:00Z".
-      - Strip any "(...)" part.
-    """
-    assign_hdr = re.compile(
-        r"^\s*###\s*Assignment\s*\(\s*day\s*(\d{1,2})\s*\)\s*$", re.IGNORECASE
-    )
-    deadline_anywhere = re.compile(r"(?i)\bDead-?line:\s*([^\n\r]*)")
-    dt = re.compile(r"(\d{4})[.\-/](\d{2})[.\-/](\d{2})\s+(\d{2}):(\d{2})(?::(\d{2}))?")
-
-    def to_iso_z(text: str) -> str:
-        text = _norm(text)  # removes "(...)" and normalizes spaces
-        m = dt.search(text)
-        if not m:
-            return text  # fallback: keep cleaned text
-        y, mo, d, hh, mm, ss = m.group(1), m.group(2), m.group(3), m.group(4), m.group(5), (m.group(6) or "00")
-        return f"{y}-{mo}-{d}T{hh}:{mm}:{ss}Z"
-
-    deadlines: Dict[str, str] = {}
-
-    i = 0
-    while i < len(lines):
-        m = assign_hdr.match(lines[i])
-        if not m:
-            i += 1
-            continue
-
-        day_num = int(m.group(1))
-        key = f"Day{day_num:02d}"
-
-        # Find the boundary: next assignment header
-        next_i = i + 1
-        while next_i < len(lines) and not assign_hdr.match(lines[next_i]):
-            next_i += 1
-
-        # Search only within this day block [i, next_i)
-        found = None
-        for j in range(i, next_i):
-            dm = deadline_anywhere.search(lines[j])
-            if dm:
-                found = to_iso_z(dm.group(1))
-                break
-
-        if found:
-            deadlines[key] = found
-
-        i = next_i  # jump to next block (prevents overlap)
-
-    return deadlines
-
-
-def _norm(s: str) -> str:
-    s = re.sub(r"\([^)]*\)", "", s)     # drop "(...)"
-    s = re.sub(r"\s+", " ", s).strip()  # normalize whitespace
-    return s
+    m = re.match(r"^\s*([\w.-]+)/([\w.-]+)(?:@([\w./-]+))?\s*$", text)
+    if not m:
+        raise ValueError(f"Expected user/repo[@branch], got {text!r}")
+    return CourseRepo(m.group(1), m.group(2), m.group(3) or "main")
 
-# ----------------------------
-# 2) Parse day09/subjects.txt
-# ----------------------------
 
-def parse_subjects(
-    subjects_text: str,
-    roster: List[str],
-    assignment_names: List[str],
-) -> Dict[str, Dict[str, dict]]:
+def fetch_course(
+    repo: CourseRepo,
+    store_dir: str = ".",
+    *,
+    raw_base: str = RAW_GITHUB,
+    api_base: str = GITHUB_API,
+) -> Tuple[str, List[Issue]]:
     """
-    subjects.txt is TSV:
-      issue_id<TAB>OPEN/CLOSED<TAB>title<TAB><TAB>created_at
-
-    Returns nested dict:
-      data[student][assignment] = {
-          'status': 'OPEN'/'CLOSED',
-          'time': '2026-01-03T18:44:38Z',
-          'format': '<label>',
-          'issue_id': 213
-      }
-    If multiple issues exist for same (student, assignment), keeps a list under '_all'.
+    Network stage: the README text and the (incrementally synced) issues of one course.
     """
-    roster_lookup = _build_roster_lookup(roster)
-    assignments_lookup = {a.casefold(): a for a in assignment_names}
-
-    data: Dict[str, Dict[str, dict]] = defaultdict(dict)
-
-    for raw in subjects_text.splitlines():
-        if not raw.strip():
-            continue
-
-        parts = raw.split("\t")
-        if len(parts) < 3:
-            continue
-
-        issue_id_str = parts[0].strip()
-        status = parts[1].strip().upper()
-        title = parts[2].strip()
-        created_at = parts[-1].strip()  # last field is the timestamp in this file
+    readme_text = fetch_text(f"{raw_base}/{repo.github_user}/{repo.github_repo}/{repo.branch}/README.md")
+    store_path = os.path.join(store_dir, f"issues_{repo.github_user}_{repo.github_repo}.jsonl")
+    issues = sync_issue_store(repo.github_user, repo.github_repo, store_path, concurrent=True, api_base=api_base)
+    return readme_text, issues_from_store(issues)
 
-        try:
-            issue_id = int(issue_id_str)
-        except ValueError:
-            issue_id = None
-
-        student = _extract_student(title, roster_lookup) or "UNKNOWN"
-        assignment = _extract_assignment(title, assignments_lookup) or "UNKNOWN"
-        fmt = _classify_subject_format(title)
-
-        entry = {
-            "status": status,
-            "time": created_at,
-            "format": fmt,
-            "issue_id": issue_id,
-        }
-
-        # If repeated (student, assignment), keep them all
-        prev = data[student].get(assignment)
-        if prev is None:
-            data[student][assignment] = entry
-        else:
-            all_list = prev.get("_all", [prev])
-            all_list.append(entry)
-            # keep "latest" as the newest by timestamp string (ISO Z compares lexicographically)
-            latest = max(all_list, key=lambda e: e.get("time", ""))
-            latest["_all"] = all_list
-            data[student][assignment] = latest
-
-    return dict(data)
 
-
-def _build_roster_lookup(roster: List[str]) -> Dict[str, str]:
+def analyze_course(
+    readme_text: str,
+    issues: List[Issue],
+    tz_name: str = "Asia/Jerusalem",
+    *,
+    parsed_readme: Optional[Tuple[List[str], Dict[str, str]]] = None,
+) -> Dict[str, Any]:
     """
-    Maps simplified keys -> canonical roster name.
+    CPU stage: README + issues -> every table and figure of the report, as plain
+    (picklable) data, so it can run in a worker process.
+    parsed_readme: (roster, deadlines) already parsed by the caller (e.g. from README_CACHE).
     """
-    lookup: Dict[str, str] = {}
-    for name in roster:
-        lookup[name.casefold()] = name
-        lookup[_simplify(name)] = name
-    return lookup
-
-
-def _simplify(s: str) -> str:
-    s = s.casefold()
-    s = re.sub(r"[^a-z0-9\s]", " ", s)
-    s = _norm(s)
-    return s
-
-
-def _extract_student(title: str, roster_lookup: Dict[str, str]) -> Optional[str]:
+    roster, deadlines = parsed_readme if parsed_readme is not None else parse_readme(readme_text)
+    assignment_names = sorted(deadlines, key=_assignment_sort_key)
+
+    submissions = parse_subjects(issues, roster, assignment_names)
+    add_deadline_deltas(submissions, deadlines, deadline_epochs=build_deadline_epochs(deadlines))
+    aggregates = aggregate_submissions(submissions, roster, assignment_names)
+
+    figures = on_time_figure_specs(aggregates, tz_name)
+    format_spec = format_popularity_figure_spec(aggregates, assignment_names)
+    if format_spec is not None:
+        figures.append(format_spec)
+
+    unknown = submissions.get("UNKNOWN", {})
+    return {
+        "roster": roster,
+        "assignment_names": assignment_names,
+        "issues": len(issues),
+        "unmatched_issues": sum(len(e.get("_all", [e])) for e in unknown.values()),
+        "status_table": make_submissions_status_table(roster, assignment_names, submissions, aggregates=aggregates),
+        "summary": print_per_assignment_summary(roster, assignment_names, submissions, aggregates=aggregates),
+        "habits_table": make_student_habits_table(roster, submissions, aggregates=aggregates),
+        "figures": figures,
+    }
+
+
+COURSE_SUMMARY_COLUMNS = [
+    "Course", "Students", "Assignments", "Issues", "Unmatched issues",
+    "On-time", "Late", "Missing", "Unchecked", "On-time rate", "Error",
+]
+
+
+def course_summary_row(repo: CourseRepo, result: Optional[Dict[str, Any]], error: str = "") -> List[Any]:
     """
-    Best-effort:
-      1) longest roster name substring match (simplified)
-      2) parse tail after 'by'
-      3) parse tail after '-' (common in this file)
+    One row of the cross-course summary (COURSE_SUMMARY_COLUMNS).
     """
-    t_simpl = _simplify(title)
-
-    # Longest match wins
-    best = None
-    best_len = 0
-    for key, canonical in roster_lookup.items():
-        if len(key) < 4:
-            continue
-        if key in t_simpl:
-            if len(key) > best_len:
-                best = canonical
-                best_len = len(key)
-    if best:
-        return best
-
-    # "by Name"
-    m = re.search(r"(?i)\bby\s+(.+?)\s*$", title)
-    if m:
-        guess = _norm(m.group(1))
-        return roster_lookup.get(_simplify(guess)) or guess
-
-    # "... - Name"
-    m2 = re.search(r"\s-\s(.+?)\s*$", title)
-    if m2:
-        guess = _norm(m2.group(1))
-        return roster_lookup.get(_simplify(guess)) or guess
-
-    return None
-
-
-def _extract_assignment(title: str, assignments_lookup: Dict[str, str]) -> Optional[str]:
-    t = title.casefold()
-
-    # match known assignment names (prefer longer)
-    for k in sorted(assignments_lookup.keys(), key=len, reverse=True):
-        if k in t:
-            return assignments_lookup[k]
-
-    # fallback: Day## patterns
-    m = re.search(r"(?i)\bday\s*[-_ ]*0?(\d{1,2})\b", title)
-    if m:
-        return f"Day{int(m.group(1)):02d}"
-
-    return None
-
-
-import re
-
-def _classify_subject_format(title: str) -> str:
-    t = title.strip()
-
-    # Helpful quick checks
-    has_by = bool(re.search(r"(?i)\bby\b", t))
-    has_day = bool(re.search(r"(?i)\bday\s*0?\d{1,2}\b", t))
-    has_assignment = bool(re.search(r"(?i)\bassignment\b", t))
-
-    patterns = [
-        # Day formats
-        (r"(?i)^\s*day\s*0?\d{1,2}\s+by\s+.+$", "Day## by Name"),
-        (r"(?i)^\s*day\s*0?\d{1,2}\s*[-–—]\s*.+$", "Day## - Name"),
-        (r"(?i)^\s*day\s*0?\d{1,2}\s*:\s*.+$", "Day##: Name"),
-        (r"(?i)^\s*day\s*0?\d{1,2}\s+.+$", "Day## Name (no separator)"),
-
-        # Assignment formats
-        (r"(?i)^\s*assignment\s*\(?\s*day\s*0?\d{1,2}\s*\)?\s*[-–—:]\s*.+$", "Assignment (day ##): ..."),
-        (r"(?i)^\s*assignment\s*0?\d{1,2}\s*[-–—]\s*.+$", "Assignment ## - ..."),
-        (r"(?i)^\s*assignment\s*0?\d{1,2}\s+by\s+.+$", "Assignment ## by Name"),
-        (r"(?i)^\s*assignment\s*0?\d{1,2}\s*:\s*.+$", "Assignment ##: ..."),
-
-        # Final project common ones
-        (r"(?i)^\s*final\s+project\s+proposal\s+by\s+.+$", "Final Project Proposal by Name"),
-        (r"(?i)^\s*final\s+project\s+.*$", "Final Project (other)"),
-
-        # Catch-all “contains”
-        (r"(?i).*\bday\s*0?\d{1,2}\b.*\bby\b.*", "... Day## ... by ..."),
-        (r"(?i).*\bassignment\b.*\bday\s*0?\d{1,2}\b.*", "... Assignment ... day## ..."),
+    course = f"{repo.github_user}/{repo.github_repo}@{repo.branch}"
+    if result is None:
+        return [course] + [None] * (len(COURSE_SUMMARY_COLUMNS) - 2) + [error]
+
+    totals = np.array([0, 0, 0, 0])
+    for counts in result["summary"].values():
+        totals += counts
+    on_time, late, missing, unchecked = (int(t) for t in totals)
+    cells = on_time + late + missing
+    return [
+        course, len(result["roster"]), len(result["assignment_names"]), result["issues"], result["unmatched_issues"],
+        on_time, late, missing, unchecked, round(on_time / cells, 3) if cells else None, error,
     ]
 
-    for pat, label in patterns:
-        if re.match(pat, t):
-            return label
 
-    # A slightly-more-informative fallback than plain "Other"
-    if has_day and has_by:
-        return "Other (mentions Day## + by)"
-    if has_day:
-        return "Other (mentions Day##)"
-    if has_assignment:
-        return "Other (mentions Assignment)"
-    return "Other"
-
-# ----------------------------
-# Helpers
-# ----------------------------
-def parse_z_iso(ts: str) -> Optional[datetime]:
-    if not ts:
-        return None
-    ts = ts.strip()
-    # Handle trailing Z
-    if ts.endswith("Z"):
-        ts = ts[:-1] + "+00:00"
-    try:
-        return datetime.fromisoformat(ts).astimezone(timezone.utc)
-    except ValueError:
-        return None
-        
-def add_deadline_deltas(
-    submissions: Dict[str, Dict[str, dict]],
-    deadlines: Dict[str, str],
-    *,
-    delta_key: str = "delta_to_deadline",
-    seconds_key: str = "delta_seconds",
-) -> Dict[str, Dict[str, dict]]:
+def write_course_report(
+    repo: CourseRepo,
+    result: Dict[str, Any],
+    output_dir: str,
+    plot_formats: Optional[Iterable[str]] = None,
+    pool: Optional[Executor] = None,
+) -> str:
     """
-    Compute (submission_time - deadline_time) for each (student, assignment) and add:
-      - submissions[student][assignment][delta_key]   -> human string like '-2 days, 03:10:00'
-      - submissions[student][assignment][seconds_key] -> signed seconds (negative => early, positive => late)
-
-    Expects:
-      - deadlines values like: '2025-11-01T22:00:00Z'
-      - submissions[...][...]['time'] like: '2026-01-03T18:44:38Z'
-
-    Modifies submissions in-place and also returns it.
+    Writes <output_dir>/<user>_<repo>/report.md (+ the plots, if plot_formats, drawn in pool
+    when one is given) and returns its directory.
     """
+    course_dir = os.path.join(output_dir, repo.name)
+    os.makedirs(course_dir, exist_ok=True)
+
+    header, rows = result["status_table"]
+    status_md = pd.DataFrame(rows, columns=header).to_markdown(index=False)
+    header, rows = result["habits_table"]
+    habits_md = pd.DataFrame(rows, columns=header).to_markdown(index=False)
+    summary_lines = [
+        f"{a}: {on_time} on-time, {late} late, {missing} missing ({unchecked} unchecked issues)."
+        for a, (on_time, late, missing, unchecked) in result["summary"].items()
+    ]
 
-    for student, per_student in submissions.items():
-        for assignment, entry in per_student.items():
-            # skip the synthetic key used for repeats, if present
-            if assignment.startswith("_"):
-                continue
-
-            dl_str = deadlines.get(assignment)
-            sub_str = entry.get("time", "")
+    with open(os.path.join(course_dir, "report.md"), "w", encoding="utf-8") as f:
+        f.write(f"# {repo.github_user}/{repo.github_repo} (branch: {repo.branch})\n\n")
+        f.write(f"Students: {len(result['roster'])}, assignments: {len(result['assignment_names'])}, ")
+        f.write(f"issues: {result['issues']} ({result['unmatched_issues']} not matched to a student)\n\n")
+        f.write("## Status Table (On-time / Late / Missing)\n\n" + status_md + "\n\n")
+        f.write("## Per-assignment Summary\n\n" + "\n".join(summary_lines) + "\n\n")
+        f.write("## Student Submission Habits\n\n" + habits_md + "\n")
 
-            dl_dt = parse_z_iso(dl_str) if dl_str else None
-            sub_dt = parse_z_iso(sub_str)
+    if plot_formats:
+        render_figures(result["figures"], course_dir, plot_formats, pool=pool)
+    return course_dir
 
-            if dl_dt is None or sub_dt is None:
-                entry[delta_key] = None
-                entry[seconds_key] = None
-                continue
 
-            delta = sub_dt - dl_dt
-            entry[seconds_key] = int(delta.total_seconds())
-            entry[delta_key] = str(delta)
-
-            # If you kept multiple submissions in "_all", compute deltas for them too
-            if "_all" in entry and isinstance(entry["_all"], list):
-                for e in entry["_all"]:
-                    sdt = parse_z_iso(e.get("time", ""))
-                    if sdt is None:
-                        e[delta_key] = None
-                        e[seconds_key] = None
-                        continue
-                    d = sdt - dl_dt
-                    e[seconds_key] = int(d.total_seconds())
-                    e[delta_key] = str(d)
-
-    return submissions
-
-def make_submissions_status_table(
-    roster: List[str],
-    assignment_names: List[str],
-    submissions: Dict[str, Dict[str, dict]],
+def run_batch_report(
+    repos: Iterable[CourseRepo],
+    output_dir: str,
     *,
-    delta_seconds_key: str = "delta_seconds",
-) -> Tuple[List[str], List[List[Any]]]:
-    """
-    Build a table:
-      Rows: one per student in roster
-      Columns: Name, one per assignment, Total Late, Total Missing
-      Cell values (assignments): 'On-time' / 'Late' / 'Missing'
-
-    Rule:
-      - Missing: no submission entry for that (student, assignment)
-      - Late: submission[delta_seconds] > 0
-      - On-time: submission[delta_seconds] <= 0
-        (If delta_seconds missing/None, this function falls back to Missing.)
+    fetch_workers: int = 4,
+    parse_workers: Optional[int] = None,
+    plot_formats: Optional[Iterable[str]] = None,
+    store_dir: Optional[str] = None,
+    raw_base: str = RAW_GITHUB,
+    api_base: str = GITHUB_API,
+) -> List[List[Any]]:
     """
+    Fetch, parse and report many courses:
+      - the network-bound fetches run concurrently in a thread pool (fetch_workers)
+      - each course is parsed in a process pool (parse_workers) as soon as its fetch is done
+      - per-course reports go to <output_dir>/<user>_<repo>/, and one combined summary
+        (COURSE_SUMMARY_COLUMNS) to <output_dir>/summary.md and summary.csv
 
-    def sort_key(a: str):
-        # Sort Day01, Day02, ... nicely; otherwise keep at end
-        m = re.match(r"(?i)^day(\d{1,2})$", a.strip())
-        return (0, int(m.group(1))) if m else (1, a.casefold())
+    A course that fails (network, parsing) gets an error in its summary row; the others go on.
 
-    assignments = sorted(list(assignment_names), key=sort_key)
+    Returns:
+      the summary rows, in the order of repos
+    """
+    repos = list(repos)
+    os.makedirs(output_dir, exist_ok=True)
+    store_dir = output_dir if store_dir is None else store_dir
+
+    results: Dict[CourseRepo, Any] = {}
+    errors: Dict[CourseRepo, str] = {}
+    # spawn: the fetch threads (and their open connections) are not forked into the workers
+    mp_context = multiprocessing.get_context("spawn")
+    with ThreadPoolExecutor(max_workers=fetch_workers) as fetchers, \
+            ProcessPoolExecutor(max_workers=parse_workers, mp_context=mp_context) as parsers:
+        fetches = {fetchers.submit(fetch_course, repo, store_dir, raw_base=raw_base, api_base=api_base): repo
+                   for repo in repos}
+        parses = {}
+        for future in as_completed(fetches):
+            repo = fetches[future]
+            try:
+                readme_text, issues = future.result()
+            except Exception as e:
+                errors[repo] = f"fetch failed: {e}"
+                continue
+            # README_CACHE lives in this process: parse the README here (cheap, usually a cache hit)
+            parsed_readme = parse_readme(readme_text)
+            parses[parsers.submit(analyze_course, readme_text, issues, parsed_readme=parsed_readme)] = repo
+
+        for future in as_completed(parses):
+            repo = parses[future]
+            try:
+                results[repo] = future.result()
+            except Exception as e:
+                errors[repo] = f"parse failed: {e}"
+
+    # One figure pool for all the courses, and only when there are enough figures to pay for it
+    figures = sum(len(result["figures"]) for result in results.values()) if plot_formats else 0
+    rows = []
+    with figure_pool() if figures >= PARALLEL_FIGURES_MIN else nullcontext() as pool:
+        for repo in repos:
+            if repo in results:
+                write_course_report(repo, results[repo], output_dir, plot_formats, pool=pool)
+            rows.append(course_summary_row(repo, results.get(repo), errors.get(repo, "")))
+
+    df = pd.DataFrame(rows, columns=COURSE_SUMMARY_COLUMNS)
+    df.to_csv(os.path.join(output_dir, "summary.csv"), index=False)
+    with open(os.path.join(output_dir, "summary.md"), "w", encoding="utf-8") as f:
+        f.write(df.to_markdown(index=False) + "\n")
+
+    return rows
 
-    header = ["Student"] + assignments + ["Total Late", "Total Missing"]
-    rows: List[List[Any]] = []
+# ----------------------------
+# 6) Run instrumentation (stage timers, counters, profiling)
+# ----------------------------
 
-    for student in roster:
-        per_student = submissions.get(student, {})
-        row = [student]
-        late_count = 0
-        missing_count = 0
+class RunTrace:
+    """
+    Lightweight instrumentation of one report run, emitted as a JSON trace:
 
-        for a in assignments:
-            entry = per_student.get(a)
+      stage(name)        -> context manager: wall (perf_counter) and CPU (process_time) seconds
+                            of the stage, and its peak traced memory with trace_memory=True
+      count(name, n)     -> free-form counters
+      profile=True       -> cProfile over start()..stop(); the top functions by cumulative
+                            time go into the trace
+      trace_memory=True  -> tracemalloc over start()..stop(); peak and top allocation sites
 
-            if not entry:
-                status = "Missing"
-                missing_count += 1
-            else:
-                ds = entry.get(delta_seconds_key, None)
-                if ds is None:
-                    status = "Missing"
-                    missing_count += 1
-                elif ds > 0:
-                    status = "Late"
-                    late_count += 1
-                else:
-                    status = "On-time"
+    to_dict() also collects the HTTP (requests, connections, bytes), cache (HTTP, README,
+    timestamps) and regex (subject format scans) counters of this process.
+    """
 
-            row.append(status)
+    def __init__(self, *, profile: bool = False, trace_memory: bool = False, top: int = 20):
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.top = top
+        self.stages: List[dict] = []
+        self.counts: Counter = Counter()
+        self._profiler: Optional[cProfile.Profile] = None
+        self._memory: Optional[dict] = None
+        self._started = time.perf_counter()
+        self._started_cpu = time.process_time()
+        self._wall: Optional[float] = None
+        self._cpu: Optional[float] = None
+
+    def start(self) -> "RunTrace":
+        self._started = time.perf_counter()
+        self._started_cpu = time.process_time()
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def stop(self) -> None:
+        self._wall = time.perf_counter() - self._started
+        self._cpu = time.process_time() - self._started_cpu
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics("lineno")[: self.top]
+            tracemalloc.stop()
+            self._memory = {
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "top": [{"where": str(stat.traceback), "bytes": stat.size, "count": stat.count} for stat in top],
+            }
+
+    def __enter__(self) -> "RunTrace":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @contextmanager
+    def stage(self, name: str):
+        record = {"name": name, "start_s": round(time.perf_counter() - self._started, 6)}
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_s"] = round(time.perf_counter() - wall, 6)
+            record["cpu_s"] = round(time.process_time() - cpu, 6)
+            if tracemalloc.is_tracing():
+                record["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            self.stages.append(record)
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counts[name] += n
+
+    def counters(self) -> Dict[str, Any]:
+        formats = _classify_subject_format.cache_info()
+        return {
+            "http": {
+                "requests": HTTP_SESSION.requests,
+                "connections": HTTP_SESSION.connections,
+                "bytes_received": HTTP_SESSION.bytes_received,
+            },
+            "http_cache": HTTP_CACHE.stats(),
+            "readme_cache": README_CACHE.stats(),
+            "resolved_title_cache": RESOLVED_TITLE_CACHE.stats(),
+            "timestamp_cache": timestamp_cache_info(),
+            # every miss of the memoized classifier is one scan with the combined format regex
+            "regex": {"subject_format_scans": formats.misses, "subject_format_cache_hits": formats.hits},
+            "custom": dict(self.counts),
+        }
 
-        row.extend([late_count, missing_count])
-        rows.append(row)
+    def _profile_top(self) -> List[dict]:
+        stats = pstats.Stats(self._profiler)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[: self.top]
+        return [
+            {
+                "function": f"{filename}:{line}({func})",
+                "calls": calls,
+                "tottime_s": round(tottime, 6),
+                "cumtime_s": round(cumtime, 6),
+            }
+            for (filename, line, func), (_prim, calls, tottime, cumtime, _callers) in rows
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        wall = self._wall if self._wall is not None else time.perf_counter() - self._started
+        cpu = self._cpu if self._cpu is not None else time.process_time() - self._started_cpu
+        trace = {
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "stages": self.stages,
+            "counters": self.counters(),
+        }
+        if self._profiler is not None:
+            trace["profile"] = self._profile_top()
+        if self._memory is not None:
+            trace["memory"] = self._memory
+        return trace
+
+    def save(self, path: str) -> None:
+        """
+        Writes the JSON trace to path (and the raw cProfile stats to <path>.prof, for
+        pstats / snakeviz, when profiling).
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        if self._profiler is not None:
+            self._profiler.dump_stats(path + ".prof")
 
-    return header, rows
+# ----------------------------
+# 7) Watch mode: incremental submission state
+# ----------------------------
 
-def print_per_assignment_summary(
-    roster: List[str],
-    assignment_names: List[str],
-    submissions: Dict[str, Dict[str, dict]],
-    *,
-    delta_seconds_key: str = "delta_seconds",
-    status_key: str = "status",
-) -> None:
+class SubmissionState:
     """
-    For each assignment, prints:
-      Day01: 12 on-time, 3 late, 5 missing (2 unchecked issues)
-
-    Definitions:
-      - on-time: has entry and delta_seconds <= 0
-      - late: has entry and delta_seconds > 0
-      - missing: no entry for that student+assignment OR delta_seconds is None
-      - unchecked issues: entry exists but status != 'CLOSED'
+    Submissions + aggregates kept in memory and updated issue by issue (watch mode).
+
+    apply(issues) takes new or changed Issue records (keyed by issue number), re-parses
+    only those, and rebuilds only the (student, assignment) cells they leave or enter:
+    the cell entry and its deadline delta, the cell's aggregates, the habits of the
+    affected students and the counts of the affected assignments.
+    The result is the same as parse_subjects + add_deadline_deltas + aggregate_submissions
+    over all issues in the store order (newest issue first).
     """
-    # stable order: as given
-    assignment_summary = {}
-    for a in assignment_names:
-        on_time = late = missing = unchecked = 0
 
-        for student in roster:
-            entry = submissions.get(student, {}).get(a)
-
-            if not entry:
-                missing += 1
+    def __init__(self, roster: List[str], deadlines: Dict[str, str], assignment_names: Optional[List[str]] = None):
+        self.roster = roster
+        self.deadlines = deadlines
+        self.assignment_names = assignment_names if assignment_names is not None else sorted(deadlines, key=_assignment_sort_key)
+        self.deadline_epochs = build_deadline_epochs(deadlines)
+
+        self._roster_set = set(roster)
+        self._roster_lookup = _build_roster_lookup(roster)
+        self._roster_matcher = RosterMatcher(self._roster_lookup)
+        self._fuzzy = FuzzyRosterIndex(roster)
+        self._assignments_lookup = {a.casefold(): a for a in self.assignment_names}
+
+        self.issues: Dict[int, Issue] = {}
+        self._cell_of: Dict[int, Tuple[str, str]] = {}
+        self._cell_issues: Dict[Tuple[str, str], set] = defaultdict(set)
+        self.submissions: Dict[str, Dict[str, dict]] = {}
+        self.aggregates = ReportAggregates(roster=roster)
+        for a in self.assignment_names:
+            self.aggregates.count_assignment(a, roster)
+
+    def apply(self, issues: Iterable[Issue]) -> set:
+        """
+        Returns:
+          the (student, assignment) cells that were rebuilt
+        """
+        affected = set()
+        for issue in issues:
+            if self.issues.get(issue.number) == issue:
                 continue
+            student = _extract_student(issue.title, self._roster_lookup, self._roster_matcher, self._fuzzy) or "UNKNOWN"
+            assignment = _extract_assignment(issue.title, self._assignments_lookup) or "UNKNOWN"
+
+            old_cell = self._cell_of.get(issue.number)
+            if old_cell is not None:
+                self._cell_issues[old_cell].discard(issue.number)
+                affected.add(old_cell)
+            self.issues[issue.number] = issue
+            self._cell_of[issue.number] = (student, assignment)
+            self._cell_issues[(student, assignment)].add(issue.number)
+            affected.add((student, assignment))
+
+        for student, assignment in affected:
+            self._rebuild_cell(student, assignment)
+
+        agg = self.aggregates
+        for student in {s for s, _ in affected if s in self._roster_set}:
+            agg.recount_student(student, self.submissions.get(student, {}))
+        for assignment in {a for _, a in affected}:
+            if assignment in self._assignments_lookup.values():
+                agg.count_assignment(assignment, self.roster)
+        return affected
+
+    def _rebuild_cell(self, student: str, assignment: str) -> None:
+        per_student = self.submissions.get(student, {})
+        old = per_student.get(assignment)
+        if old is not None:
+            self.aggregates.remove_cell(student, assignment, old)
+
+        numbers = self._cell_issues.get((student, assignment))
+        if not numbers:
+            self._cell_issues.pop((student, assignment), None)
+            if old is not None:
+                del per_student[assignment]
+                if not per_student:
+                    del self.submissions[student]
+            return
+
+        # Same entry as parse_subjects: the cell's issues in the store order (newest issue first)
+        rebuilt: Dict[str, dict] = {}
+        for number in sorted(numbers, reverse=True):
+            issue = self.issues[number]
+            entry = {
+                "status": issue.state,
+                "time": issue.created_at,
+                "format": _classify_subject_format(issue.title),
+                "issue_id": issue.number,
+            }
+            _add_submission(rebuilt, assignment, entry)
+        add_deadline_deltas({student: rebuilt}, self.deadlines, deadline_epochs=self.deadline_epochs)
+
+        self.submissions.setdefault(student, {})[assignment] = rebuilt[assignment]
+        self.aggregates.add_cell(student, assignment, rebuilt[assignment], habits=False)
+
+    def tables(self) -> Dict[str, Any]:
+        """
+        The status table, per-assignment summary and habits table of the current state.
+        """
+        agg = self.aggregates
+        return {
+            "status_table": make_submissions_status_table(self.roster, self.assignment_names, self.submissions, aggregates=agg),
+            "summary": print_per_assignment_summary(self.roster, self.assignment_names, self.submissions, aggregates=agg),
+            "habits_table": make_student_habits_table(self.roster, self.submissions, aggregates=agg),
+        }
 
-            ds = entry.get(delta_seconds_key, None)
-            if ds is None:
-                missing += 1
-            elif ds > 0:
-                late += 1
-            else:
-                on_time += 1
-
-            if (entry.get(status_key) or "").upper() != "CLOSED":
-                unchecked += 1
-
-        assignment_summary[a] = (on_time, late, missing, unchecked)
-    
-    return assignment_summary
-
-def _parse_iso_z(ts: str) -> datetime | None:
-    if not ts:
-        return None
-    ts = ts.strip()
-    if ts.endswith("Z"):
-        ts = ts[:-1] + "+00:00"
-    try:
-        return datetime.fromisoformat(ts).astimezone(timezone.utc)
-    except ValueError:
-        return None
-
-def plot_on_time_distributions(
-    submissions: dict,
-    *,
-    delta_seconds_key: str = "delta_seconds",
-    time_key: str = "time",
-    tz_name: str = "Asia/Jerusalem",
-) -> None:
-    """
-    Makes two bar plots using ONLY on-time submissions (delta_seconds <= 0):
-      A) Count by weekday
-      B) Count by hour (0..23)
-    """
-    tz = ZoneInfo(tz_name)
-
-    weekday_counts = Counter()
-    hour_counts = Counter()
 
-    for _student, per_student in submissions.items():
-        for _assignment, entry in per_student.items():
-            if not isinstance(entry, dict):
-                continue
-            if _assignment.startswith("_"):
-                continue
+log = logging.getLogger(__name__)
 
-            ds = entry.get(delta_seconds_key, None)
-            if ds is None or ds > 0:
-                continue  # only on-time
+# Errors of one poll that are worth retrying on the next tick (HTTPError is a URLError)
+WATCH_RETRY_ERRORS = (URLError, socket.timeout, ConnectionError, http.client.HTTPException)
 
-            dt_utc = _parse_iso_z(entry.get(time_key, ""))
-            if dt_utc is None:
-                continue
-            dt_local = dt_utc.astimezone(tz)
-
-            weekday_counts[dt_local.weekday()] += 1  # Mon=0..Sun=6
-            hour_counts[dt_local.hour] += 1
-
-    # ---- Plot A: weekday ----
-    # Want Sunday..Saturday
-    weekday_order = [6, 0, 1, 2, 3, 4, 5]
-    weekday_labels = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
-    weekday_values = [weekday_counts[i] for i in weekday_order]
-
-    plt.figure(figsize=(9, 4))
-    plt.bar(weekday_labels, weekday_values)
-    plt.title("On-time submissions by weekday")
-    plt.ylabel("Count")
-    plt.xticks(rotation=30, ha="right")
-    plt.tight_layout()
-    plt.show()
-
-    # ---- Plot B: hour ----
-    hour_labels = [f"{h:02d}:00-{h:02d}:59" for h in range(24)]
-    hour_values = [hour_counts[h] for h in range(24)]
-
-    plt.figure(figsize=(12, 4))
-    plt.bar(hour_labels, hour_values)
-    plt.title("On-time submissions by hour of day")
-    plt.ylabel("Count")
-    plt.xticks(rotation=90)
-    plt.tight_layout()
-    plt.show()
-
-
-def plot_subject_format_popularity(
-    submissions: dict,
-    assignment_names: list[str],
-    *,
-    format_key: str = "format",
-) -> None:
-    """
-    Grouped bar plot:
-      x-axis: assignments
-      bars per x: subject formats used for that assignment
-      y-axis: counts
-      legend: outside, below plot
-    Counts every issue:
-      - if entry has "_all": counts each item in that list
-      - else counts the single entry
-    """
-    # counts[assignment][format] = count
-    counts = defaultdict(Counter)
-
-    for _student, per_student in submissions.items():
-        for assignment, entry in per_student.items():
-            if assignment not in assignment_names:
-                continue
-            if not isinstance(entry, dict):
-                continue
 
-            entries = entry.get("_all") if isinstance(entry.get("_all"), list) else [entry]
-            for e in entries:
-                fmt = (e.get(format_key) or "Other").strip() or "Other"
-                counts[assignment][fmt] += 1
-
-    # Collect formats that appear anywhere (stable-ish order: most common overall first)
-    overall = Counter()
-    for a in assignment_names:
-        overall.update(counts[a])
-
-    formats = [fmt for fmt, _ in overall.most_common()]
-    if not formats:
-        print("No subject formats found to plot.")
-        return
-
-    # Build matrix format x assignment
-    matrix = [[counts[a].get(fmt, 0) for a in assignment_names] for fmt in formats]
-
-    x = list(range(len(assignment_names)))
-    n_fmt = len(formats)
-    width = 0.8 / n_fmt
-
-    plt.figure(figsize=(max(10, len(assignment_names) * 0.6), 5))
-    ax = plt.gca()
-
-    # Center the grouped bars around each integer x
-    for k, fmt in enumerate(formats):
-        offset = (k - (n_fmt - 1) / 2) * width
-        ax.bar([xi + offset for xi in x], matrix[k], width=width, label=fmt)
-
-    ax.set_title("Subject format popularity by assignment")
-    ax.set_ylabel("Count")
-    ax.set_xticks(x)
-    ax.set_xticklabels(assignment_names, rotation=30, ha="right")
-
-    # Legend outside below
-    ax.legend(
-        loc="upper center",
-        bbox_to_anchor=(0.5, -0.20),
-        ncol=min(n_fmt, 4),
-        frameon=False,
-    )
-
-    plt.tight_layout()
-    plt.show()
-
-def make_student_habits_table(
+def watch_report(
+    github_user: str,
+    github_repo: str,
     roster: List[str],
-    submissions: Dict[str, Dict[str, dict]],
+    deadlines: Dict[str, str],
+    output_dir: str,
     *,
-    delta_seconds_key: str = "delta_seconds",
-    format_key: str = "format",
-) -> Tuple[List[str], List[List[Any]]]:
+    store_path: str,
+    interval: float = 60.0,
+    max_ticks: Optional[int] = None,
+    formats: Iterable[str] = ("csv",),
+    concurrent: bool = True,
+    api_base: str = GITHUB_API,
+    on_tick=None,
+    max_backoff: float = 900.0,
+) -> SubmissionState:
     """
-    Builds a per-student habits table.
+    Long-running report: every interval seconds, polls the issues endpoint (since=<watermark>,
+    with ETag revalidation through the HTTP cache), applies only the new / changed issues to
+    the in-memory SubmissionState and rewrites the tables in output_dir (see export_report).
 
-    Columns:
-      - Student
-      - Mean delta (hours), where delta = deadline - submission = -(submission - deadline)
-      - # unique subject formats used
+    on_tick(tick) is called after each tick with
+      {"tick", "changed_issues", "cells", "compute_s", "paths", "error"};
+    max_ticks=None runs until interrupted.
 
-    Notes:
-      - Uses only entries that have delta_seconds (ignores Missing / None).
-      - If an entry contains "_all" (multiple issues), each one is included.
-      - Std is population std (divide by N). Change to (N-1) if you want sample std.
+    A failed poll (network error, HTTP error status) is logged and reported as the tick's
+    "error"; the next poll waits interval * 2 ** failures (at most max_backoff) seconds.
     """
-    header = ["Student", "Avg. sub. time (hours)", "Unique formats", "Formats"]
-    rows: List[List[Any]] = []
-
-    for student in roster:
-        per_student = submissions.get(student, {})
-
-        deltas_hours: List[float] = []
-        formats = set()
-
-        for _assignment, entry in per_student.items():
-            if not isinstance(entry, dict) or _assignment.startswith("_"):
-                continue
-
-            entries = entry.get("_all") if isinstance(entry.get("_all"), list) else [entry]
-
-            for e in entries:
-                ds = e.get(delta_seconds_key, None)
-                if ds is None:
-                    continue
-
-                # user wants: deadline - submission, but ds is (submission - deadline)
-                delta_deadline_minus_sub = (-ds) / 3600.0
-                deltas_hours.append(delta_deadline_minus_sub)
-
-                fmt = (e.get(format_key) or "").strip()
-                if fmt:
-                    formats.add(fmt)
-
-        if deltas_hours:
-            mean = sum(deltas_hours) / len(deltas_hours)
-            mean_out = round(mean, 2)
-        else:
-            mean_out = None
-
-        rows.append([student, mean_out, len(formats), formats])
-
-    return header, rows
+    formats = list(formats)
+    state = SubmissionState(roster, deadlines)
+    issues = load_issue_store(store_path)
+    pending = [_issue_from_record(r) for r in issues.values()]
+
+    tick = failures = 0
+    while True:
+        error = None
+        try:
+            changed = update_issue_store(issues, github_user, github_repo, store_path, concurrent=concurrent, api_base=api_base)
+            pending += [_issue_from_record(r) for r in changed]
+            failures = 0
+        except WATCH_RETRY_ERRORS as e:
+            failures += 1
+            error = f"{type(e).__name__}: {e}"
+            log.warning("watch tick %d: polling %s/%s failed (%s)", tick, github_user, github_repo, error)
+        HTTP_SESSION.prune()
+
+        start = time.perf_counter()
+        cells = state.apply(pending)
+        paths = []
+        if cells or tick == 0:
+            paths = export_report(output_dir, submissions=None, formats=formats, **state.tables())
+        compute_s = time.perf_counter() - start
+
+        if on_tick is not None:
+            on_tick({
+                "tick": tick, "changed_issues": len(pending), "cells": len(cells), "compute_s": compute_s,
+                "paths": paths, "error": error,
+            })
+        pending = []
+        tick += 1
+        if max_ticks is not None and tick >= max_ticks:
+            return state
+        time.sleep(min(interval * 2 ** failures, max(max_backoff, interval)))